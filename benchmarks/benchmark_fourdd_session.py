@@ -0,0 +1,88 @@
+#! /usr/bin/env python
+
+import time
+import argparse
+
+import numpy as np
+
+import pyart
+
+
+def make_volumes(nvolumes, nsweeps, jitter):
+    """
+    Generate velocity aliased volumes whose ray angles differ by up to jitter
+    degrees from volume to volume.
+    """
+    random = np.random.RandomState(0)
+    for i in range(nvolumes):
+        radar = pyart.testing.make_multi_sweep_velocity_aliased_radar(nsweeps)
+        radar.azimuth['data'] += random.uniform(0, jitter, radar.nrays)
+        vel = radar.fields['velocity']['data']
+        radar.fields['velocity']['data'] = np.roll(vel, i, axis=0)
+        yield radar
+
+
+def report(name, latencies):
+    """ Print statistics of the per-volume latencies. """
+    latencies = np.array(latencies)
+    print('%-28s %10.4f %10.4f %10.4f %10.2f' % (
+        name, np.mean(latencies), np.median(latencies), np.max(latencies),
+        np.sum(latencies)))
+
+
+if __name__ == '__main__':
+
+    # parse the arguments
+    parser = argparse.ArgumentParser(
+        description=('Report the per-volume latency of dealiasing 24 hours '
+                     'of synthetic volumes with chained dealias_fourdd '
+                     'calls and with FourDDSession.'))
+    parser.add_argument('--interval', type=float, default=5.,
+                        help='minutes between volumes, default 5')
+    parser.add_argument('--hours', type=float, default=24.,
+                        help='hours of volumes, default 24')
+    parser.add_argument('--nsweeps', type=int, default=10,
+                        help='sweeps in each volume, default 10')
+    parser.add_argument('--jitter', type=float, default=0.2,
+                        help=('maximum change of the ray azimuths between '
+                              'volumes in degrees, default 0.2'))
+    parser.add_argument('-v', '--version', action='version',
+                        version='Py-ART version %s' % (pyart.__version__))
+    args = parser.parse_args()
+
+    if not pyart.correct.dealias._FOURDD_AVAILABLE:
+        parser.exit(1, 'Py-ART must be built with TRMM RSL to run the 4DD '
+                       'benchmark.\n')
+
+    nvolumes = int(args.hours * 60 / args.interval)
+    height = np.linspace(0, 10000, 100).astype('float32')
+    speed = np.ones((100, ), dtype='float32') * 5.
+    direction = np.ones((100, ), dtype='float32') * 270.
+    profile = pyart.core.HorizontalWindProfile(height, speed, direction)
+
+    print('%d volumes of %d sweeps' % (nvolumes, args.nsweeps))
+    print('%-28s %10s %10s %10s %10s' % (
+        'method', 'mean (s)', 'median (s)', 'max (s)', 'total (s)'))
+
+    # chained dealias_fourdd calls
+    latencies = []
+    last_radar = None
+    for radar in make_volumes(nvolumes, args.nsweeps, args.jitter):
+        start = time.time()
+        corr_vel = pyart.correct.dealias_fourdd(
+            radar, last_radar=last_radar, sonde_profile=profile)
+        latencies.append(time.time() - start)
+        radar.add_field('corrected_velocity', corr_vel)
+        last_radar = radar
+    report('dealias_fourdd', latencies)
+
+    # sessions with exact geometry matching and with sounding volume reuse
+    for angle_tolerance in [0., args.jitter]:
+        session = pyart.correct.FourDDSession(
+            sonde_profile=profile, angle_tolerance=angle_tolerance)
+        latencies = []
+        for radar in make_volumes(nvolumes, args.nsweeps, args.jitter):
+            start = time.time()
+            session.dealias(radar)
+            latencies.append(time.time() - start)
+        report('FourDDSession, tolerance %g' % (angle_tolerance), latencies)
@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import argparse
+import subprocess
+
+import numpy as np
+
+import pyart
+
+STATEMENTS = [
+    ('numpy', 'import numpy'),
+    ('matplotlib.cm', 'import matplotlib.cm'),
+    ('pyart', 'import pyart'),
+    ('pyart, io', 'import pyart; pyart.io.read'),
+    ('pyart, graph', 'import pyart; pyart.graph.RadarDisplay'),
+    ('pyart, all subpackages', '; '.join(
+        ['import pyart'] + ['pyart.%s' % (p, ) for p in pyart._SUBPACKAGES] +
+        ['pyart.graph.RadarDisplay'])),
+]
+
+
+def time_import(statement):
+    """ Return the time taken to run an import statement in a new process. """
+    code = '\n'.join([
+        'import time',
+        'start = time.time()',
+        statement,
+        'print(time.time() - start)'])
+    env = dict(os.environ)
+    env['PYART_QUIET'] = '1'
+    with open(os.devnull, 'w') as devnull:
+        output = subprocess.check_output(
+            [sys.executable, '-c', code], env=env, stderr=devnull)
+    return float(output.decode('utf-8').strip().split('\n')[-1])
+
+
+if __name__ == '__main__':
+
+    # parse the arguments
+    parser = argparse.ArgumentParser(
+        description=('Report the time taken to import Py-ART and its '
+                     'subpackages in a new interpreter.'))
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='number of repeats, default 5')
+    parser.add_argument('-v', '--version', action='version',
+                        version='Py-ART version %s' % (pyart.__version__))
+    args = parser.parse_args()
+
+    time_import('import pyart')     # warm the file system cache
+    print('%-26s %10s %10s' % ('import', 'best (s)', 'median (s)'))
+    for name, statement in STATEMENTS:
+        times = [time_import(statement) for i in range(args.repeat)]
+        print('%-26s %10.3f %10.3f' % (name, min(times), np.median(times)))
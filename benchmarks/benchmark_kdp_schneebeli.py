@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+
+import time
+import argparse
+import multiprocessing as mp
+
+import numpy as np
+
+import pyart
+
+
+def make_radar(nrays, ngates, seed=0):
+    """ Return a radar with noisy increasing differential phase profiles. """
+    radar = pyart.testing.make_empty_ppi_radar(ngates, nrays, 1)
+    radar.range['data'] = np.arange(ngates) * 250.0
+    random = np.random.RandomState(seed)
+    psidp = (np.linspace(0.0, 80.0, ngates) +
+             random.normal(0.0, 3.0, (nrays, ngates)))
+    psidp = np.ma.masked_array(psidp)
+    psidp[:, :5] = np.ma.masked
+    radar.add_field(pyart.config.get_field_name('differential_phase'),
+                    {'data': psidp})
+    return radar
+
+
+def time_call(func, repeat):
+    """ Return the best time of repeat calls to func. """
+    times = []
+    for i in range(repeat):
+        np.random.seed(0)
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+
+    # parse the arguments
+    parser = argparse.ArgumentParser(
+        description=('Report the time taken by kdp_schneebeli in serial and '
+                     'with a pool of worker processes.'))
+    parser.add_argument('--nrays', type=int, default=360,
+                        help='number of rays, default 360')
+    parser.add_argument('--ngates', type=int, default=300,
+                        help='number of gates per ray, default 300')
+    parser.add_argument('--nprocesses', type=int, default=mp.cpu_count(),
+                        help='number of worker processes, default all cores')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of repeats, the best time is reported')
+    parser.add_argument('-v', '--version', action='version',
+                        version='Py-ART version %s' % (pyart.__version__))
+    args = parser.parse_args()
+
+    radar = make_radar(args.nrays, args.ngates)
+    kdp_schneebeli = pyart.retrieve.kdp_schneebeli
+    print('%d rays x %d gates, %d worker processes' % (
+        args.nrays, args.ngates, args.nprocesses))
+    print('%-36s %10s' % ('path', 'best (s)'))
+
+    # one ray per task with a fresh pool which replaces its workers after
+    # every task, the structure of the pool path before batching
+    def per_ray_pool():
+        pool = mp.Pool(args.nprocesses, maxtasksperchild=1)
+        try:
+            kdp_schneebeli(radar, pool=pool, rays_per_batch=1)
+        finally:
+            pool.terminate()
+    print('%-36s %10.3f' % (
+        'per-ray pool, maxtasksperchild=1', time_call(per_ray_pool, 1)))
+
+    # batched profiles in serial, with a pool per call and with a pool which
+    # is reused between calls
+    print('%-36s %10.3f' % ('batched, serial', time_call(
+        lambda: kdp_schneebeli(radar, parallel=False), args.repeat)))
+
+    def batched_pool():
+        pool = mp.Pool(args.nprocesses)
+        try:
+            kdp_schneebeli(radar, pool=pool)
+        finally:
+            pool.terminate()
+    print('%-36s %10.3f' % (
+        'batched, pool per call', time_call(batched_pool, args.repeat)))
+
+    pool = mp.Pool(args.nprocesses)
+    try:
+        kdp_schneebeli(radar, pool=pool)    # start the workers
+        print('%-36s %10.3f' % ('batched, reused pool', time_call(
+            lambda: kdp_schneebeli(radar, pool=pool), args.repeat)))
+    finally:
+        pool.terminate()
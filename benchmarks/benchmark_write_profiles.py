@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import pyart
+
+PROFILES = [None, 'fast', 'archive', 'compact']
+
+if __name__ == '__main__':
+
+    # parse the arguments
+    parser = argparse.ArgumentParser(
+        description=('Report the write time, read-back time and file size '
+                     'of a radar or grid file written with each write '
+                     'profile.'))
+    parser.add_argument('infile', type=str, help='radar or grid file to read')
+    parser.add_argument('--grid', action='store_true',
+                        help='read the file as a Py-ART grid file')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of repeats, the best time is reported')
+    parser.add_argument('-v', '--version', action='version',
+                        version='Py-ART version %s' % (pyart.__version__))
+    args = parser.parse_args()
+
+    # read in the file, fields are loaded so that reading is not timed
+    if args.grid:
+        obj = pyart.io.read_grid(args.infile)
+        read, write = pyart.io.read_grid, pyart.io.write_grid
+    else:
+        obj = pyart.io.read(args.infile)
+        read, write = pyart.io.read_cfradial, pyart.io.write_cfradial
+    for field in obj.fields.values():
+        field['data']
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        print('%-10s %12s %12s %14s' % (
+            'profile', 'write (s)', 'read (s)', 'size (bytes)'))
+        for profile in PROFILES:
+            filename = os.path.join(tmpdir, '%s.nc' % (profile))
+            write_times = []
+            read_times = []
+            for i in range(args.repeat):
+                start = time.time()
+                write(filename, obj, profile=profile)
+                write_times.append(time.time() - start)
+
+                start = time.time()
+                read_obj = read(filename)
+                for field in read_obj.fields.values():
+                    field['data']
+                read_times.append(time.time() - start)
+            print('%-10s %12.3f %12.3f %14d' % (
+                profile, min(write_times), min(read_times),
+                os.path.getsize(filename)))
+    finally:
+        shutil.rmtree(tmpdir)
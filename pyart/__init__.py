@@ -46,19 +46,48 @@ else:
     from .version import git_revision as __git_revision__
     from .version import version as __version__
 
-    # import subpackages
-    from . import core
-    from . import io
-    from . import correct
-    from . import graph
-    from . import map
-    from . import filters
-    from . import util
-    from . import testing
-    from . import config
-    from . import aux_io
-    from . import retrieve
-    from . import bridge
+    # import subpackages, on Python 3.7 and later these are imported when
+    # first accessed (PEP 562) so that matplotlib, scipy, netCDF4 and the
+    # extension modules are only imported by the subpackages which use them.
+    _SUBPACKAGES = ('core', 'io', 'correct', 'graph', 'map', 'filters',
+                    'util', 'testing', 'config', 'aux_io', 'retrieve',
+                    'bridge')
+    import sys as _sys
+    if _sys.version_info >= (3, 7):
+        import importlib as _importlib
+
+        def __getattr__(name):
+            """ Import subpackages on first access. """
+            if name in _SUBPACKAGES:
+                return _importlib.import_module('.' + name, __name__)
+            raise AttributeError(
+                "module '%s' has no attribute '%s'" % (__name__, name))
+
+        def __dir__():
+            """ List module attributes including unimported subpackages. """
+            return sorted(set(globals()) | set(_SUBPACKAGES))
+
+        # register the Py-ART colormaps with matplotlib, as importing all
+        # subpackages did, without importing the rest of pyart.graph.
+        # This import of matplotlib.colors and matplotlib.cm is kept eager,
+        # matplotlib provides no hook to defer registration and scripts
+        # rely on plt.get_cmap('pyart_...') working after 'import pyart'.
+        # pyplot and the mapping toolkits are not imported, see
+        # benchmarks/benchmark_import_time.py for the cost.
+        from .graph import cm as _cm
+    else:
+        from . import core
+        from . import io
+        from . import correct
+        from . import graph
+        from . import map
+        from . import filters
+        from . import util
+        from . import testing
+        from . import config
+        from . import aux_io
+        from . import retrieve
+        from . import bridge
 
     # root level functions
     from .config import load_config
@@ -7,6 +7,7 @@ A general central radial scanning (or dwelling) instrument class.
 .. autosummary::
     :toctree: generated/
 
+    _get_lazy_rays
     _rays_per_sweep_data_factory
     _gate_data_factory
     _gate_lon_lat_data_factory
@@ -408,10 +409,18 @@ class Radar(object):
         data : array
             Array containing data for the requested sweep and field.
 
+        Notes
+        -----
+        If the field data is lazy loaded and has not yet been loaded, only
+        the rays of the sweep are read when supported by the lazy loader.
+        The data returned is then not a view of the full field data.
+
         """
         self.check_field_exists(field_name)
-        s = self.get_slice(sweep)
-        data = self.fields[field_name]['data'][s]
+        start, end = self.get_start_end(sweep)
+        data = _get_lazy_rays(self.fields[field_name], start, end + 1)
+        if data is None:
+            data = self.fields[field_name]['data'][start:end + 1]
         if copy:
             return data.copy()
         else:
@@ -812,7 +821,14 @@ class Radar(object):
 
         fields = {}
         for field_name, dic in self.fields.items():
-            fields[field_name] = mkdic(dic, rays)
+            sweeps_data = [_get_lazy_rays(dic, start, start + count)
+                           for start, count in zip(ssri, ray_count)]
+            if sweeps_data[0] is None:
+                fields[field_name] = mkdic(dic, rays)
+            else:
+                # read only the selected sweeps of lazy loaded data
+                fields[field_name] = dic.copy()
+                fields[field_name]['data'] = np.ma.concatenate(sweeps_data)
         metadata = mkdic(self.metadata, None)
         scan_type = str(self.scan_type)
 
@@ -884,6 +900,20 @@ class Radar(object):
                      radar_calibration=radar_calibration)
 
 
+def _get_lazy_rays(dic, start, end):
+    """
+    Return the rays from start to end - 1 of lazy loaded data without loading
+    the data.  None is returned when the data has been loaded or the lazy
+    loader does not support reading rays.
+    """
+    if not isinstance(dic, LazyLoadDict):
+        return None
+    data_loader = dic.get_lazy('data')
+    if data_loader is None or not hasattr(data_loader, 'get_rays'):
+        return None
+    return data_loader.get_rays(start, end)
+
+
 def _rays_per_sweep_data_factory(radar):
     """ Return a function which returns the number of rays per sweep. """
     def _rays_per_sweep_data():
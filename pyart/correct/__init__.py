@@ -16,6 +16,7 @@ Velocity unfolding
     dealias_fourdd
     dealias_unwrap_phase
     dealias_region_based
+    FourDDSession
 
 Other corrections
 =================
@@ -39,7 +40,7 @@ Helper functions
 
 """
 
-from .dealias import dealias_fourdd
+from .dealias import dealias_fourdd, FourDDSession
 from .attenuation import calculate_attenuation
 from .phase_proc import phase_proc_lp
 # for backwards compatibility GateFilter available in the correct namespace
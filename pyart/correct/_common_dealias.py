@@ -12,6 +12,7 @@ Routines used by multiple dealiasing functions.
     _parse_gatefilter
     _parse_rays_wrap_around
     _set_limits
+    _map_sweeps
 
 """
 
@@ -78,3 +79,32 @@ def _set_limits(data, nyquist_vel, dic):
     dic['valid_min'] = float(-max_valid_velocity)
     dic['valid_max'] = float(max_valid_velocity)
     return
+
+
+def _map_sweeps(func, sweeps, parallel, pool, threads):
+    """
+    Apply func to the data of each sweep, concurrently when parallel is True.
+
+    The sweeps are mapped by pool when provided.  Otherwise a pool with one
+    worker per core is created, using threads when threads is True and
+    processes when False.  Results are returned in the order of the sweeps.
+    """
+    if not parallel:
+        return [func(sweep) for sweep in sweeps]
+    if pool is not None:
+        return list(pool.map(func, sweeps))
+
+    import multiprocessing as mp
+    sweeps = list(sweeps)
+    nworkers = min(mp.cpu_count(), len(sweeps))
+    if nworkers < 2:
+        return [func(sweep) for sweep in sweeps]
+    if threads:
+        from multiprocessing.pool import ThreadPool
+        own_pool = ThreadPool(nworkers)
+    else:
+        own_pool = mp.Pool(nworkers)
+    try:
+        return own_pool.map(func, sweeps)
+    finally:
+        own_pool.terminate()
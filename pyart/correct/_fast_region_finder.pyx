@@ -0,0 +1,126 @@
+"""
+pyart.correct._fast_region_finder
+=================================
+
+Cython routine for quickly finding regions of similar velocities.
+
+.. autosummary::
+    :toctree: generated/
+
+    _fast_region_finder
+
+"""
+
+import numpy as np
+
+cimport numpy as np
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int _find_root(int[::1] parent, int node):
+    """ Find the root of a node, halving the path to the root. """
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _fast_region_finder(double[:, ::1] data, np.uint8_t[:, ::1] gfilter,
+                        double[::1] limits):
+    """
+    Label the connected regions of similar velocity for all intervals.
+
+    Regions are found in a single pass over the gates.  The labels are
+    identical to those found by labeling the gates within each pair of
+    limits separately with scipy.ndimage.label and offsetting the labels by
+    the number of regions in the previous intervals.
+
+    Parameters
+    ----------
+    data : 2D array, float64
+        Velocity data for a single sweep.
+    gfilter : 2D array, uint8
+        Filter indicating if a particular gate should be excluded (non-zero)
+        from the regions.
+    limits : array, float64
+        Velocity limits of the intervals.
+
+    Returns
+    -------
+    labels : 2D array, int32
+        Region labels, 0 indicates a gate which is not in any region.
+    nfeatures : int
+        Number of regions found.
+
+    """
+    cdef int nrays = data.shape[0]
+    cdef int ngates = data.shape[1]
+    cdef int nintervals = limits.shape[0] - 1
+    cdef int x, y, k, gate, root, neighbor_root
+    cdef double vel
+
+    intervals_array = np.empty((nrays, ngates), dtype=np.int32)
+    parent_array = np.empty(nrays * ngates, dtype=np.int32)
+    labels_array = np.zeros((nrays, ngates), dtype=np.int32)
+    region_counts_array = np.zeros(nintervals + 1, dtype=np.int32)
+    cdef int[:, ::1] interval = intervals_array
+    cdef int[::1] parent = parent_array
+    cdef int[:, ::1] labels = labels_array
+    cdef int[::1] region_counts = region_counts_array
+
+    # determine the interval of each gate and join the gates with the
+    # neighboring gates (above and left) in the same interval.
+    for x in range(nrays):
+        for y in range(ngates):
+            gate = x * ngates + y
+            parent[gate] = gate
+            interval[x, y] = -1
+            if gfilter[x, y]:
+                continue
+            vel = data[x, y]
+            for k in range(nintervals):
+                if limits[k] <= vel and vel < limits[k + 1]:
+                    interval[x, y] = k
+                    break
+            else:
+                continue
+            if x > 0 and interval[x - 1, y] == k:
+                parent[gate] = _find_root(parent, gate - ngates)
+            if y > 0 and interval[x, y - 1] == k:
+                root = _find_root(parent, gate)
+                neighbor_root = _find_root(parent, gate - 1)
+                # the earliest gate in the scan is kept as root
+                if root < neighbor_root:
+                    parent[neighbor_root] = root
+                elif neighbor_root < root:
+                    parent[root] = neighbor_root
+
+    # number the regions within each interval in the order of their first
+    # gate, the root of each region
+    for x in range(nrays):
+        for y in range(ngates):
+            k = interval[x, y]
+            if k == -1:
+                continue
+            gate = x * ngates + y
+            root = _find_root(parent, gate)
+            if root == gate:
+                region_counts[k + 1] += 1
+                labels[x, y] = region_counts[k + 1]
+            else:
+                labels[x, y] = labels[root // ngates, root % ngates]
+
+    # offset the labels by the number of regions in the previous intervals
+    for k in range(nintervals):
+        region_counts[k + 1] += region_counts[k]
+    for x in range(nrays):
+        for y in range(ngates):
+            k = interval[x, y]
+            if k != -1:
+                labels[x, y] += region_counts[k]
+
+    return labels_array, int(region_counts[nintervals])
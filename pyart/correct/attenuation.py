@@ -135,29 +135,49 @@ def calculate_attenuation(radar, z_offset, debug=False, doc=15, fzl=4000.0,
         end_gate, start_ray, end_ray = phase_proc.det_process_range(
             radar, sweep, fzl, doc=doc)
 
-        for i in range(start_ray, end_ray):
-            # perform attenuation calculation on a single ray
-
-            # extract the ray's phase shift and init. refl. correction
-            ray_phase_shift = proc_dp_phase_shift[i, 0:end_gate]
-            ray_init_refl = init_refl_correct[i, 0:end_gate]
-
-            # perform calculation
-            last_six_good = np.where(is_good[i, 0:end_gate])[0][-6:]
-            phidp_max = np.median(ray_phase_shift[last_six_good])
-            sm_refl = phase_proc.smooth_and_trim(ray_init_refl, window_len=5)
-            reflectivity_linear = 10.0 ** (0.1 * beta * sm_refl)
-            self_cons_number = 10.0 ** (0.1 * beta * a_coef * phidp_max) - 1.0
-            I_indef = cumtrapz(0.46 * beta * dr * reflectivity_linear[::-1])
-            I_indef = np.append(I_indef, I_indef[-1])[::-1]
-
-            # set the specific attenutation and attenuation
-            specific_atten[i, 0:end_gate] = (
-                reflectivity_linear * self_cons_number /
-                (I_indef[0] + self_cons_number * I_indef))
-
-            atten[i, :-1] = cumtrapz(specific_atten[i, :]) * dr * 2.0
-            atten[i, -1] = atten[i, -2]
+        # perform the attenuation calculation on all rays of the sweep
+        nrays = end_ray - start_ray
+        sweep_phase_shift = proc_dp_phase_shift[start_ray:end_ray, :end_gate]
+        sweep_init_refl = init_refl_correct[start_ray:end_ray, :end_gate]
+        sweep_is_good = np.asarray(is_good[start_ray:end_ray, :end_gate])
+
+        # median of the phase shift at the last six good gates of each ray,
+        # rays with the same number of these gates are processed together
+        good_to_end = np.cumsum(sweep_is_good[:, ::-1], axis=1)[:, ::-1]
+        last_six_good = np.logical_and(sweep_is_good, good_to_end <= 6)
+        n_last_good = last_six_good.sum(axis=1)
+        phidp_max = np.empty(nrays, dtype='float64')
+        phidp_max_masked = np.zeros(nrays, dtype='bool')
+        for n in np.unique(n_last_good):
+            rays = n_last_good == n
+            phase_shifts = sweep_phase_shift[rays][last_six_good[rays]]
+            median = np.median(phase_shifts.reshape(rays.sum(), n), axis=1)
+            phidp_max[rays] = np.ma.getdata(median)
+            phidp_max_masked[rays] = np.ma.getmaskarray(median)
+
+        sm_refl = phase_proc._smooth_and_trim_rows(
+            np.ma.getdata(sweep_init_refl).ravel(), np.repeat(end_gate, nrays),
+            window_len=5).reshape(nrays, end_gate)
+        reflectivity_linear = 10.0 ** (0.1 * beta * sm_refl)
+        self_cons_number = 10.0 ** (0.1 * beta * a_coef * phidp_max) - 1.0
+        self_cons_number = self_cons_number[:, np.newaxis]
+        I_indef = cumtrapz(0.46 * beta * dr * reflectivity_linear[:, ::-1],
+                           axis=1)
+        I_indef = np.append(I_indef, I_indef[:, -1:], axis=1)[:, ::-1]
+
+        # set the specific attenutation and attenuation
+        sweep_specific_atten = (
+            reflectivity_linear * self_cons_number /
+            (I_indef[:, :1] + self_cons_number * I_indef))
+        # masked arithmetic leaves the linear reflectivity in the rays where
+        # the phase shift median is masked
+        sweep_specific_atten[phidp_max_masked] = (
+            reflectivity_linear[phidp_max_masked])
+        specific_atten[start_ray:end_ray, 0:end_gate] = sweep_specific_atten
+
+        atten[start_ray:end_ray, :-1] = cumtrapz(
+            specific_atten[start_ray:end_ray], axis=1) * dr * 2.0
+        atten[start_ray:end_ray, -1] = atten[start_ray:end_ray, -2]
 
     # prepare output field dictionaries
     spec_at = get_metadata(spec_at_field)
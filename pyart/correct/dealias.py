@@ -9,6 +9,16 @@ Front end to the University of Washington 4DD code for Doppler dealiasing.
 
     dealias_fourdd
     _create_rsl_volume
+    _create_sound_volume
+    _create_corr_vel_field
+    _sweep_geometry
+    _same_geometry
+
+.. autosummary::
+    :toctree: generated/
+    :template: dev_template.rst
+
+    FourDDSession
 
 """
 
@@ -190,9 +200,6 @@ def dealias_fourdd(
     if last_vel_field is None:
         last_vel_field = get_field_name('corrected_velocity')
 
-    # get fill value
-    fill_value = get_fillvalue()
-
     # parse radar gate filter
     gatefilter = _parse_gatefilter(gatefilter, radar, **kwargs)
     excluded = gatefilter.gate_excluded
@@ -209,18 +216,8 @@ def dealias_fourdd(
 
     # create an RslVolume containing the sounding data if it available
     if sonde_profile is not None:
-        # convert the sounding data to 1D float32 arrays
-        height = np.ascontiguousarray(sonde_profile.height, dtype=np.float32)
-        speed = np.ascontiguousarray(sonde_profile.speed, dtype=np.float32)
-        wdir = np.ascontiguousarray(sonde_profile.direction, dtype=np.float32)
-
-        if len(height) > 999:
-            raise ValueError("Too many sounding heights, maximum is 999")
-
-        success, sound_volume = _fourdd_interface.create_soundvolume(
-            vel_volume, height, speed, wdir, sign, max_shear)
-        if success == 0:
-            raise ValueError('Error when loading sounding data')
+        sound_volume = _create_sound_volume(
+            vel_volume, sonde_profile, sign, max_shear)
     else:
         sound_volume = None
 
@@ -233,6 +230,246 @@ def dealias_fourdd(
     flag, data = _fourdd_interface.fourdd_dealias(
         vel_volume, last_vel_volume, sound_volume, filt, debug=False, **kwargs)
 
+    return _create_corr_vel_field(
+        data, radar, vel_field, corr_vel_field, rsl_badval, keep_original,
+        set_limits)
+
+
+class FourDDSession(object):
+    """
+    A session for dealiasing a sequence of radar volumes using the 4DD
+    algorithm.
+
+    The session keeps the last dealiased volume and the volume created from
+    the sounding data as RSL volumes between calls to :py:func:`dealias`.
+    Each call only converts the velocities of the new volume, the previous
+    volume is not converted from a Radar object and the sounding volume is
+    only recreated when the sounding or the geometry of the volumes
+    changes.  Parameters which are not described here are the same as
+    those of :py:func:`dealias_fourdd`.
+
+    Parameters
+    ----------
+    sonde_profile : HorizontalWindProfile, optional
+        Profile of horizontal winds from a sonding used for the initial
+        condition of the dealiasing.  Can be changed using
+        :py:func:`set_sonde_profile`.
+    last_radar : Radar, optional
+        Previous radar volume, which has been successfully dealiased, used
+        for the first call to :py:func:`dealias`.  Later calls use the
+        volume dealiased by the previous call.  Either last_radar or
+        sonde_profile must be provided.
+    last_vel_field : str, optional
+        Field in last_radar containing the dealiased Doppler velocities.
+        None will use the default field name from the Py-ART configuration
+        file.
+    angle_tolerance : float, optional
+        Maximum difference in degrees between the azimuth and elevation
+        angles of the rays in a volume and those of the sounding volume for
+        the sounding volume to be reused.  Larger differences recreate the
+        sounding volume.  The default, 0, reuses the sounding volume only
+        when the angles are identical, giving the same results as
+        :py:func:`dealias_fourdd`.  Larger values reuse the sounding volume
+        built from the angles of an earlier volume, which is faster but can
+        change the results.
+    kwargs :
+        Additional arguments passed to
+        :py:func:`_fourdd_interface.fourdd_dealias` which can be used to
+        fine tune the behavior of the 4DD algorithm.
+
+    Attributes
+    ----------
+    last_vel_volume : _RslVolume or None
+        Dealiased Doppler velocities from the last volume.  Gates where the
+        dealiasing failed contain bad values regardless of keep_original.
+    sound_volume : _RslVolume or None
+        Volume containing the sounding data.
+
+    """
+
+    def __init__(self, sonde_profile=None, last_radar=None,
+                 last_vel_field=None, filt=1, rsl_badval=131072.0,
+                 keep_original=False, set_limits=True, vel_field=None,
+                 corr_vel_field=None, max_shear=0.05, sign=1,
+                 angle_tolerance=0., **kwargs):
+        """ initalize the object. """
+        # check that FourDD is available (requires TRMM RSL)
+        if not _FOURDD_AVAILABLE:
+            raise MissingOptionalDependency(
+                "Py-ART must be build with support for TRMM RSL to use" +
+                "the FourDDSession class.")
+
+        # verify that sounding data or last_volume is provided
+        if (sonde_profile is None) and (last_radar is None):
+            raise ValueError('sonde_profile or last_radar must be provided')
+
+        # parse the field parameters
+        if vel_field is None:
+            vel_field = get_field_name('velocity')
+        if corr_vel_field is None:
+            corr_vel_field = get_field_name('corrected_velocity')
+        if last_vel_field is None:
+            last_vel_field = get_field_name('corrected_velocity')
+
+        self.filt = filt
+        self.rsl_badval = rsl_badval
+        self.keep_original = keep_original
+        self.set_limits = set_limits
+        self.vel_field = vel_field
+        self.corr_vel_field = corr_vel_field
+        self.max_shear = max_shear
+        self.sign = sign
+        self.angle_tolerance = angle_tolerance
+        self.kwargs = kwargs
+
+        self.sonde_profile = sonde_profile
+        self.sound_volume = None
+        self._sound_geometry = None
+        if last_radar is not None:
+            self.last_vel_volume = _create_rsl_volume(
+                last_radar, last_vel_field, 1, rsl_badval)
+        else:
+            self.last_vel_volume = None
+
+    def set_sonde_profile(self, sonde_profile):
+        """
+        Set the sounding used by the following volumes.
+
+        Parameters
+        ----------
+        sonde_profile : HorizontalWindProfile or None
+            Profile of horizontal winds from a sounding, None to dealias
+            using only the previous volume.
+
+        """
+        if sonde_profile is None and self.last_vel_volume is None:
+            raise ValueError('sonde_profile or last_radar must be provided')
+        self.sonde_profile = sonde_profile
+        self.sound_volume = None
+        self._sound_geometry = None
+
+    def reset(self):
+        """ Discard the last dealiased volume. """
+        if self.sonde_profile is None:
+            raise ValueError(
+                'sonde_profile must be provided to reset the session')
+        self.last_vel_volume = None
+
+    def dealias(self, radar, gatefilter=False, **kwargs):
+        """
+        Dealias the Doppler velocities in a radar volume.
+
+        The dealiased velocities are used as the previous volume when
+        dealiasing the next volume.  The radar must contain the same number
+        of rays per sweep as the previous volume.
+
+        Parameters
+        ----------
+        radar : Radar
+            Radar object to use for dealiasing.  Must have a Nyquist defined
+            in the instrument_parameters attribute.
+        gatefilter : GateFilter, optional.
+            A GateFilter instance which specifies which gates should be
+            ignored when performing velocity dealiasing.  A value of None
+            will create this filter from the radar moments using any
+            additional arguments by passing them to
+            :py:func:`moment_based_gate_filter`. The default value assumes
+            all gates are valid.
+
+        Returns
+        -------
+        vr_corr : dict
+            Field dictionary containing dealiased Doppler velocities.
+            Dealiased array is stored under the 'data' key.
+
+        """
+        # parse radar gate filter
+        gatefilter = _parse_gatefilter(gatefilter, radar, **kwargs)
+        excluded = gatefilter.gate_excluded
+
+        # create a RSL volume containing the doppler velocity
+        vel_volume = _create_rsl_volume(
+            radar, self.vel_field, 1, self.rsl_badval, excluded)
+
+        # reuse the sounding volume when the volume geometry is unchanged
+        if self.sonde_profile is not None:
+            geometry = _sweep_geometry(radar)
+            if not _same_geometry(geometry, self._sound_geometry,
+                                  self.angle_tolerance):
+                self.sound_volume = _create_sound_volume(
+                    vel_volume, self.sonde_profile, self.sign,
+                    self.max_shear)
+                self._sound_geometry = geometry
+
+        # perform dealiasing, keeping the unfolded volume for the next call
+        flag, _, _, _, unfolded_volume = _fourdd_interface.fourdd_dealias(
+            vel_volume, self.last_vel_volume, self.sound_volume, self.filt,
+            debug=True, **self.kwargs)
+        self.last_vel_volume = unfolded_volume
+
+        return _create_corr_vel_field(
+            unfolded_volume.get_data(), radar, self.vel_field,
+            self.corr_vel_field, self.rsl_badval, self.keep_original,
+            self.set_limits)
+
+
+def _sweep_geometry(radar):
+    """ Return the parameters of a radar which set the sounding volume. """
+    rays_per_sweep = (radar.sweep_end_ray_index['data'] -
+                      radar.sweep_start_ray_index['data'] + 1)
+    return {
+        'rays_per_sweep': np.array(rays_per_sweep),
+        'range': (radar.ngates, int(radar.range['meters_between_gates']),
+                  int(radar.range['meters_to_center_of_first_gate'])),
+        'altitude': np.array(radar.altitude['data']),
+        'azimuth': np.array(radar.azimuth['data']),
+        'elevation': np.array(radar.elevation['data'])}
+
+
+def _same_geometry(geometry, other_geometry, angle_tolerance):
+    """ Return True when two sweep geometries produce the same volume. """
+    if other_geometry is None:
+        return False
+    if not np.array_equal(geometry['rays_per_sweep'],
+                          other_geometry['rays_per_sweep']):
+        return False
+    if geometry['range'] != other_geometry['range']:
+        return False
+    if not np.array_equal(geometry['altitude'], other_geometry['altitude']):
+        return False
+    for angle in ['azimuth', 'elevation']:
+        diff = np.abs(geometry[angle] - other_geometry[angle]) % 360.
+        if np.any(np.minimum(diff, 360. - diff) > angle_tolerance):
+            return False
+    return True
+
+
+def _create_sound_volume(vel_volume, sonde_profile, sign, max_shear):
+    """
+    Create a RSLVolume containing sounding data with the shape of a volume.
+    """
+    # convert the sounding data to 1D float32 arrays
+    height = np.ascontiguousarray(sonde_profile.height, dtype=np.float32)
+    speed = np.ascontiguousarray(sonde_profile.speed, dtype=np.float32)
+    wdir = np.ascontiguousarray(sonde_profile.direction, dtype=np.float32)
+
+    if len(height) > 999:
+        raise ValueError("Too many sounding heights, maximum is 999")
+
+    success, sound_volume = _fourdd_interface.create_soundvolume(
+        vel_volume, height, speed, wdir, sign, max_shear)
+    if success == 0:
+        raise ValueError('Error when loading sounding data')
+    return sound_volume
+
+
+def _create_corr_vel_field(data, radar, vel_field, corr_vel_field,
+                           rsl_badval, keep_original, set_limits):
+    """
+    Create the dealiased Doppler velocity field dictionary from 4DD output.
+    """
+    fill_value = get_fillvalue()
+
     # prepare data for output, set bad values and mask data
     is_bad_data = np.logical_or(np.isnan(data), data == rsl_badval)
     if keep_original:
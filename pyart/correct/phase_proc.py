@@ -20,6 +20,7 @@ Adapted by Scott Collis and Scott Giangrande, refactored by Jonathan Helmus
     unwrap_masked
     smooth_and_trim
     smooth_and_trim_scan
+    _smooth_and_trim_rows
     noise
     get_phidp_unf
     construct_A_matrix
@@ -30,6 +31,10 @@ Adapted by Scott Collis and Scott Giangrande, refactored by Jonathan Helmus
     LP_solver_cylp_mp
     LP_solver_cylp
     phase_proc_lp
+    _solve_lp_problem
+    _solve_lp_chunks
+    _solve_lp_chunk
+    _init_lp_worker
 
 """
 
@@ -41,6 +46,7 @@ from time import time
 import numpy as np
 from numpy import ma
 import scipy.ndimage
+import scipy.sparse
 
 from ..config import get_fillvalue, get_field_name, get_metadata
 
@@ -91,18 +97,21 @@ def det_sys_phase(radar, ncp_lev=0.4, rhohv_lev=0.6,
 def _det_sys_phase(ncp, rhv, phidp, last_ray_idx, ncp_lev=0.4,
                    rhv_lev=0.6):
     """ Determine the system phase, see :py:func:`det_sys_phase`. """
-    good = False
-    phases = []
-    for radial in range(last_ray_idx + 1):
-        meteo = np.logical_and(ncp[radial, :] > ncp_lev,
-                               rhv[radial, :] > rhv_lev)
-        mpts = np.where(meteo)
-        if len(mpts[0]) > 25:
-            good = True
-            msmth_phidp = smooth_and_trim(phidp[radial, mpts[0]], 9)
-            phases.append(msmth_phidp[0:25].min())
-    if not(good):
+    nrays = last_ray_idx + 1
+    meteo = ma.getdata(np.logical_and(ncp[:nrays] > ncp_lev,
+                                      rhv[:nrays] > rhv_lev))
+    npts = meteo.sum(axis=1)
+    good = npts > 25
+    if not good.any():
         return None
+
+    # smooth the phase of the meteorological gates of the good radials
+    msmth_phidp = _smooth_and_trim_rows(
+        ma.getdata(phidp[:nrays])[meteo & good[:, np.newaxis]],
+        npts[good], 9)
+    starts = np.cumsum(npts[good]) - npts[good]
+    first_gates = msmth_phidp[starts[:, np.newaxis] + np.arange(25)]
+    phases = list(first_gates.min(axis=1))
     return np.median(phases)
 
 
@@ -345,6 +354,70 @@ def smooth_and_trim_scan(x, window_len=11, window='hanning'):
     return y
 
 
+def _smooth_and_trim_rows(x, lengths, window_len=11, window='hanning'):
+    """
+    Smooth a number of signals at once, see :py:func:`smooth_and_trim`.
+
+    The results are identical to calling smooth_and_trim on each signal.
+
+    Parameters
+    ----------
+    x : array
+        The input signals concatenated into a 1D array.
+    lengths : array
+        Length of each signal.
+    window_len: int
+        The dimension of the smoothing window; should be an odd integer.
+    window : str
+        The type of window from 'flat', 'hanning', 'hamming', 'bartlett',
+        'blackman' or 'sg_smooth'. A flat window will produce a moving
+        average smoothing.
+
+    Returns
+    -------
+    y : array
+        The smoothed signals concatenated into a 1D array.
+
+    """
+    lengths = np.asarray(lengths, dtype=np.intp)
+    if np.any(lengths < window_len):
+        raise ValueError("Input vector needs to be bigger than window size.")
+    if window_len < 3 or len(x) == 0:
+        return x
+    valid_windows = ['flat', 'hanning', 'hamming', 'bartlett', 'blackman',
+                     'sg_smooth']
+    if not window in valid_windows:
+        raise ValueError("Window is on of " + ' '.join(valid_windows))
+
+    if window == 'flat':  # moving average
+        w = np.ones(int(window_len), 'd')
+    elif window == 'sg_smooth':
+        w = np.array([0.1, .25, .3, .25, .1])
+    else:
+        w = eval('np.' + window + '(window_len)')
+
+    # reflected copies of each signal are added at both ends as in
+    # smooth_and_trim and the padded signals are convolved together, the
+    # windows spanning two signals are discarded
+    pad = window_len - 1
+    starts = np.cumsum(lengths) - lengths
+    padded_lengths = lengths + 2 * pad
+    padded_starts = np.cumsum(padded_lengths) - padded_lengths
+    signal = np.repeat(np.arange(len(lengths)), padded_lengths)
+    length = lengths[signal]
+    idx = np.arange(padded_lengths.sum()) - padded_starts[signal] - pad
+    idx = np.abs(idx)
+    idx = np.where(idx >= length, 2 * length - 1 - idx, idx)
+    s = x[starts[signal] + idx]
+
+    y = np.convolve(w / w.sum(), s, mode='valid')
+
+    signal = np.repeat(np.arange(len(lengths)), lengths)
+    trim = (padded_starts[signal] + int(window_len / 2) +
+            np.arange(lengths.sum()) - starts[signal])
+    return y[trim]
+
+
 def noise(line, wl=11):
     """ Return the noise after smoothing. """
     signal = smooth_and_trim(line, window_len=wl)
@@ -427,71 +500,123 @@ def get_phidp_unf(radar, ncp_lev=0.4, rhohv_lev=0.6, debug=False, ncpts=20,
             phidp_field=phidp_field)
         if system_zero is None:
             system_zero = sys_phase
-    cordata = np.zeros(my_rhv.shape, dtype=float)
-    for radial in range(my_rhv.shape[0]):
-        my_snr = snr(my_z[radial, :])
-        notmeteo = np.logical_or(np.logical_or(
-            my_ncp[radial, :] < ncp_lev,
-            my_rhv[radial, :] < rhohv_lev), my_snr < 10.0)
-        x_ma = ma.masked_where(notmeteo, my_phidp[radial, :])
-        try:
-            ma.notmasked_contiguous(x_ma)
-            for slc in ma.notmasked_contiguous(x_ma):
-                # so trying to get rid of clutter and small things that
-                # should not add to phidp anyway
-                if slc.stop - slc.start < ncpts or slc.start < ncpts:
-                    x_ma.mask[slc.start - 1:slc.stop + 1] = True
-            c = 0
-        except TypeError:  # non sequence, no valid regions
-            c = 1  # ie do nothing
-            x_ma.mask[:] = True
-        except AttributeError:
-            # sys.stderr.write('No Valid Regions, ATTERR \n ')
-            # sys.stderr.write(myfile.times['time_end'].isoformat() + '\n')
-            # print x_ma
-            # print x_ma.mask
-            c = 1  # also do nothing
-            x_ma.mask = True
-        if 'nowrap' is not None:
-            # Start the unfolding a bit later in order to avoid false
-            # jumps based on clutter
-            unwrapped = copy.deepcopy(x_ma)
-            end_unwrap = unwrap_masked(x_ma[nowrap::], centered=False)
-            unwrapped[nowrap::] = end_unwrap
-        else:
-            unwrapped = unwrap_masked(x_ma, centered=False)
-        #end so no clutter expected
-        system_max = unwrapped[np.where(np.logical_not(
-            notmeteo))][-10:-1].mean() - system_zero
-        unwrapped_fixed = np.zeros(len(x_ma), dtype=float)
-        based = unwrapped-system_zero
-        based[0] = 0.0
-        notmeteo[0] = False
-        based[-1] = system_max
-        notmeteo[-1] = False
-        unwrapped_fixed[np.where(np.logical_not(based.mask))[0]] = \
-            based[np.where(np.logical_not(based.mask))[0]]
-        if len(based[np.where(np.logical_not(based.mask))[0]]) > 11:
-            unwrapped_fixed[np.where(based.mask)[0]] = \
-                np.interp(np.where(based.mask)[0],
-                          np.where(np.logical_not(based.mask))[0],
-                          smooth_and_trim(based[np.where(
-                              np.logical_not(based.mask))[0]]))
-        else:
-            unwrapped_fixed[np.where(based.mask)[0]] = \
-                np.interp(np.where(based.mask)[0],
-                          np.where(np.logical_not(based.mask))[0],
-                          based[np.where(np.logical_not(based.mask))[0]])
-        if c != 1:
-            cordata[radial, :] = unwrapped_fixed
-        else:
-            cordata[radial, :] = np.zeros(my_rhv.shape[1])
+    nrays, ngates = my_rhv.shape
+    rays = np.arange(nrays)[:, np.newaxis]
+    gates = np.arange(ngates)
+
+    # signal to noise ratio of every radial, see snr
+    lengths = np.repeat(ngates, nrays)
+    signal = _smooth_and_trim_rows(
+        ma.getdata(my_z).ravel(), lengths).reshape(nrays, ngates)
+    noise = _smooth_and_trim_rows(
+        ma.getdata(np.sqrt((my_z - signal) ** 2)).ravel(),
+        lengths).reshape(nrays, ngates)
+    my_snr = abs(signal) / noise
+
+    notmeteo = np.logical_or(np.logical_or(
+        my_ncp < ncp_lev, my_rhv < rhohv_lev), my_snr < 10.0)
+    x_ma = ma.masked_where(notmeteo, my_phidp)
+    mask = ma.getmaskarray(x_ma).copy()
+
+    # so trying to get rid of clutter and small things that should not add
+    # to phidp anyway, remove contiguous regions shorter than ncpts gates or
+    # beginning before gate ncpts.  A region beginning at the first gate is
+    # kept apart from the last gate when it spans the whole radial.
+    valid = np.logical_not(mask)
+    region_start = valid & np.logical_not(
+        np.concatenate([np.zeros((nrays, 1), bool), valid[:, :-1]], axis=1))
+    region = np.cumsum(region_start, axis=1)
+    region_first = np.maximum.accumulate(
+        np.where(region_start, gates, 0), axis=1)
+    region_length = np.zeros((nrays, ngates + 1), dtype=np.intp)
+    np.add.at(region_length, (np.broadcast_to(rays, mask.shape)[valid],
+                              region[valid]), 1)
+    length = region_length[rays, region]
+    remove = valid & ((length < ncpts) | (region_first < ncpts))
+    from_first = valid & (region_first == 0)
+    mask[remove & np.logical_not(from_first)] = True
+    mask[from_first[:, -1] & remove[:, -1], -1] = True
+
+    # Start the unfolding a bit later in order to avoid false jumps based on
+    # clutter, see unwrap_masked
+    start = slice(nowrap, None).indices(ngates)[0]
+    lon = ma.getdata(x_ma)[:, start:].astype(float)
+    lon_valid = np.logical_not(mask[:, start:]) & np.isfinite(lon)
+    lon_gates = np.arange(ngates - start)
+    previous = np.maximum.accumulate(
+        np.where(lon_valid, lon_gates, -1), axis=1)
+    previous = np.concatenate(
+        [np.full((nrays, 1), -1, dtype=previous.dtype), previous[:, :-1]],
+        axis=1)
+    jump = lon_valid & (previous >= 0)
+    ld = lon[jump] - lon[np.nonzero(jump)[0], previous[jump]]
+    w = np.zeros(lon.shape, dtype=int)
+    w[jump] = np.where(ld > 180, -1, np.where(ld < -180, 1, 0))
+    lon[jump] += (np.cumsum(w, axis=1)[jump] * 360.0)
+    unwrapped = ma.getdata(x_ma).copy()
+    unwrapped[:, start:][lon_valid] = lon[lon_valid]
+    unwrapped_mask = mask.copy()
+    unwrapped_mask[:, start:] = np.logical_not(lon_valid)
+
+    # end so no clutter expected, system_max is the mean of the unwrapped
+    # phase of the last meteorological gates
+    meteo = ma.getdata(np.logical_not(notmeteo))
+    nmeteo = meteo.sum(axis=1)
+    nlast = np.clip(nmeteo - 1, 0, 9)
+    meteo_rank = np.cumsum(meteo, axis=1)
+    last = (meteo & (meteo_rank >= nmeteo[:, np.newaxis] - 9) &
+            (meteo_rank < nmeteo[:, np.newaxis]))
+    last_values = np.where(unwrapped_mask, 0, unwrapped)[last]
+    last_count = np.logical_not(unwrapped_mask)[last]
+    system_max = ma.masked_all(nrays)
+    starts = np.cumsum(nlast) - nlast
+    for n in np.unique(nlast):
+        if n == 0:
+            continue
+        group = np.nonzero(nlast == n)[0]
+        idx = starts[group][:, np.newaxis] + np.arange(n)
+        dsum = last_values[idx].sum(axis=1)
+        cnt = last_count[idx].sum(axis=1)
+        system_max[group[cnt > 0]] = (
+            dsum[cnt > 0] * 1. / cnt[cnt > 0] - system_zero)
+
+    based = unwrapped - system_zero
+    based_mask = unwrapped_mask
+    based[:, 0] = 0.0
+    based_mask[:, 0] = False
+    based[:, -1] = np.where(ma.getmaskarray(system_max), based[:, -1],
+                            ma.getdata(system_max))
+    based_mask[:, -1] = ma.getmaskarray(system_max)
+
+    # fill the masked gates by interpolating the valid gates, these are
+    # smoothed for radials with more than 11 valid gates
+    based_valid = np.logical_not(based_mask)
+    nvalid = based_valid.sum(axis=1)
+    fp = based[based_valid].astype(float)
+    smooth = np.repeat(nvalid > 11, nvalid)
+    fp[smooth] = _smooth_and_trim_rows(
+        based[based_valid][smooth], nvalid[nvalid > 11])
+
+    unwrapped_fixed = np.zeros(my_rhv.shape, dtype=float)
+    unwrapped_fixed[based_valid] = based[based_valid]
+    # all radials are interpolated at once by offsetting the gates
+    offset = rays * 2 * ngates
+    xp = (offset + gates)[based_valid]
+    x = (offset + gates)[based_mask]
+    unwrapped_fixed[based_mask] = np.interp(x, xp, fp)
+    # masked gates after the last valid gate take its value
+    last_valid = ngates - 1 - np.argmax(based_valid[:, ::-1], axis=1)
+    after = based_mask & (gates > last_valid[:, np.newaxis])
+    last_fp = fp[np.cumsum(nvalid) - 1]
+    unwrapped_fixed[after] = np.broadcast_to(
+        last_fp[:, np.newaxis], after.shape)[after]
+    cordata = unwrapped_fixed
     if debug:
         print("Exec time: ", time() - t)
     return cordata
 
 
-def construct_A_matrix(n_gates, filt):
+def construct_A_matrix(n_gates, filt, sparse=False):
     """
     Construct a row-augmented A matrix. Equation 5 in Giangrande et al, 2012.
 
@@ -520,30 +645,45 @@ def construct_A_matrix(n_gates, filt):
         Number of gates, determines size of identity matrix
     filt : array
         Input filter.
+    sparse : bool, optional
+        True to return the matrix in the scipy.sparse CSR format which
+        contains only the non-zero elements, False to return a dense matrix.
 
     Returns
     -------
-    a : matrix
+    a : matrix or csr_matrix
         Row-augmented A matrix.
 
     """
-    Identity = np.eye(n_gates)
     filter_length = len(filt)
-    M_matrix_middle = np.diag(np.ones(n_gates - filter_length + 1), k=0) * 0.0
-    posn = np.linspace(-1.0 * (filter_length - 1) / 2, (filter_length - 1)/2,
-                       filter_length)
-    for diag in range(filter_length):
-        M_matrix_middle = M_matrix_middle + np.diag(np.ones(
-            int(n_gates - filter_length + 1 - np.abs(posn[diag]))),
-            k=int(posn[diag])) * filt[diag]
     side_pad = (filter_length - 1) // 2
-    M_matrix = np.bmat(
-        [np.zeros([n_gates-filter_length + 1, side_pad], dtype=float),
-         M_matrix_middle, np.zeros(
-             [n_gates-filter_length+1, side_pad], dtype=float)])
-    Z_matrix = np.zeros([n_gates - filter_length + 1, n_gates])
-    return np.bmat([[Identity, -1.0 * Identity], [Identity, Identity],
-                   [Z_matrix, M_matrix]])
+    n_rows = n_gates - filter_length + 1
+
+    # identity blocks
+    idx = np.arange(n_gates)
+    row_idx = [idx, idx, n_gates + idx, n_gates + idx]
+    col_idx = [idx, n_gates + idx, idx, n_gates + idx]
+    values = [np.ones(n_gates), -np.ones(n_gates), np.ones(n_gates),
+              np.ones(n_gates)]
+
+    # differential constraints, the filter is truncated at the edges of M
+    rows = np.arange(n_rows)
+    for k in range(filter_length):
+        cols = rows + k
+        valid = (cols >= side_pad) & (cols < n_rows + side_pad)
+        row_idx.append(2 * n_gates + rows[valid])
+        col_idx.append(n_gates + cols[valid])
+        values.append(np.repeat(float(filt[k]), valid.sum()))
+
+    a = scipy.sparse.coo_matrix(
+        (np.concatenate(values),
+         (np.concatenate(row_idx), np.concatenate(col_idx))),
+        shape=(2 * n_gates + n_rows, 2 * n_gates))
+    if sparse:
+        a = a.tocsr()
+        a.eliminate_zeros()
+        return a
+    return np.matrix(a.toarray())
 
 
 def construct_B_vectors(phidp_mod, z_mod, filt, coef=0.914, dweight=60000.0):
@@ -579,16 +719,19 @@ def construct_B_vectors(phidp_mod, z_mod, filt, coef=0.914, dweight=60000.0):
                          phidp_mod[:, -side_pad:]])
     ii = filter_length - 1
     jj = data_edges.shape[1] - 1
-    list_corrl = np.zeros([n_rays, jj - ii + 1])
-    for count in range(list_corrl.shape[1]):
-        list_corrl[:, count] = -1.0 * (
-            np.array(filt) * (np.asarray(
-                data_edges))[:, count:count+ii+1]).sum(axis=1)
+    n_corrl = jj - ii + 1
+
+    # the filter applied to the data edges, only the corrections of the
+    # first and last side_pad positions are non-zero
+    def corrl(count):
+        return -1.0 * (np.array(filt) * (np.asarray(
+            data_edges))[:, count:count+ii+1]).sum(axis=1)
 
     sct = (((10.0 ** (0.1 * z_mod)) ** coef / dweight))[:, side_pad: -side_pad]
     sct[np.where(sct < 0.0)] = 0.0
-    sct[:, 0:side_pad] = list_corrl[:, 0:side_pad]
-    sct[:, -side_pad:] = list_corrl[:, -side_pad:]
+    for count in range(side_pad):
+        sct[:, count] = corrl(count)
+        sct[:, count - side_pad] = corrl(n_corrl - side_pad + count)
     B_vectors = np.bmat([[top_of_B_vectors, sct]])
     return B_vectors
 
@@ -600,7 +743,7 @@ def LP_solver_cvxopt(A_Matrix, B_vectors, weights, solver='glpk'):
 
     Parameters
     ----------
-    A_Matrix : matrix
+    A_Matrix : matrix or sparse matrix
         Row augmented A matrix, see :py:func:`construct_A_matrix`
     B_vectors : matrix
         Matrix containing B vectors, see :py:func:`construct_B_vectors`
@@ -624,12 +767,16 @@ def LP_solver_cvxopt(A_Matrix, B_vectors, weights, solver='glpk'):
                         using multi processes.
 
     """
-    from cvxopt import matrix, solvers
+    from cvxopt import matrix, spmatrix, solvers
     n_gates = weights.shape[1] // 2
     n_rays = B_vectors.shape[0]
     mysoln = np.zeros([n_rays, n_gates])
 
-    G = matrix(np.bmat([[-A_Matrix], [-np.eye(2 * n_gates)]]))
+    # the constraints are passed to the solver as a sparse matrix
+    G = scipy.sparse.vstack([
+        -scipy.sparse.csr_matrix(A_Matrix),
+        -scipy.sparse.identity(2 * n_gates, format='csr')]).tocoo()
+    G = spmatrix(G.data.tolist(), G.row.tolist(), G.col.tolist(), G.shape)
     h_array = np.zeros(5 * n_gates - 4)
     for raynum in range(n_rays):
         c = matrix(weights[raynum]).T
@@ -640,9 +787,7 @@ def LP_solver_cvxopt(A_Matrix, B_vectors, weights, solver='glpk'):
         # deal with this...
 
         # extract the solution
-        this_soln = np.zeros(n_gates)
-        for i in range(n_gates):
-            this_soln[i] = sol['x'][i + n_gates]
+        this_soln = np.array(sol['x'])[n_gates:2 * n_gates, 0]
 
         # apply smoothing filter and record in output array
         mysoln[raynum, :] = smooth_and_trim(this_soln, window_len=5,
@@ -658,7 +803,7 @@ def LP_solver_pyglpk(A_Matrix, B_vectors, weights, it_lim=7000, presolve=True,
 
     Parameters
     ----------
-    A_Matrix : matrix
+    A_Matrix : matrix or sparse matrix
         Row augmented A matrix, see :py:func:`construct_A_matrix`
     B_vectors : matrix
         Matrix containing B vectors, see :py:func:`construct_B_vectors`
@@ -699,21 +844,25 @@ def LP_solver_pyglpk(A_Matrix, B_vectors, weights, it_lim=7000, presolve=True,
     lp.rows.add(2 * n_gates + n_gates - 4)  # Append rows
     lp.cols.add(2 * n_gates)
     glpk.env.term_on = True
-    for cur_row in range(2 * n_gates + n_gates - 4):
-        lp.rows[cur_row].matrix = list(np.squeeze(np.asarray(
-            A_Matrix[cur_row, :])))
-    for i in range(2 * n_gates):
-        lp.cols[i].bounds = 0.0, None
+
+    # the constraint matrix is set once from its non-zero elements, only
+    # the bounds and the objective change from ray to ray
+    sparse_A = scipy.sparse.csr_matrix(A_Matrix)
+    sparse_A.eliminate_zeros()
+    sparse_A = sparse_A.tocoo()
+    lp.matrix = list(zip(sparse_A.row.tolist(), sparse_A.col.tolist(),
+                         sparse_A.data.tolist()))
+    for col in lp.cols:
+        col.bounds = 0.0, None
     for raynum in range(n_rays):
-        this_soln = np.zeros(n_gates)
-        for i in range(2 * n_gates + n_gates - 4):
-            lp.rows[i].bounds = B_vectors[raynum, i], None
-        for i in range(2 * n_gates):
-            lp.obj[i] = weights[raynum, i]
+        B_vector = np.asarray(B_vectors[raynum]).ravel().tolist()
+        for row, bound in zip(lp.rows, B_vector):
+            row.bounds = bound, None
+        lp.obj[:] = np.asarray(weights[raynum]).ravel().tolist()
         lp.simplex(msg_lev=message_state, meth=glpk.LPX.PRIMAL,
                    it_lim=it_lim, presolve=presolve)
-        for i in range(n_gates):
-            this_soln[i] = lp.cols[i+n_gates].primal
+        this_soln = np.array(
+            [lp.cols[i].primal for i in range(n_gates, 2 * n_gates)])
         mysoln[raynum, :] = smooth_and_trim(this_soln, window_len=5,
                                             window='sg_smooth')
     return mysoln
@@ -884,7 +1033,7 @@ def LP_solver_cylp(A_Matrix, B_vectors, weights, really_verbose=False):
 
     Parameters
     ----------
-    A_Matrix : matrix
+    A_Matrix : matrix or sparse matrix
         Row augmented A matrix, see :py:func:`construct_A_matrix`
     B_vectors : matrix
         Matrix containing B vectors, see :py:func:`construct_B_vectors`
@@ -906,6 +1055,7 @@ def LP_solver_cylp(A_Matrix, B_vectors, weights, really_verbose=False):
     """
     from cylp.cy.CyClpSimplex import CyClpSimplex
     from cylp.py.modeling.CyLPModel import CyLPModel, CyLPArray
+    from cylp.py.utils.sparseUtil import csc_matrixPlus
 
     n_gates = weights.shape[1] // 2
     n_rays = B_vectors.shape[0]
@@ -913,7 +1063,7 @@ def LP_solver_cylp(A_Matrix, B_vectors, weights, really_verbose=False):
 
     # Create CyLPModel and initialize it
     model = CyLPModel()
-    G = np.matrix(A_Matrix)
+    G = csc_matrixPlus(A_Matrix)
     h = CyLPArray(np.empty(B_vectors.shape[1]))
     x = model.addVariable('x', G.shape[1])
     model.addConstraint(G * x >= h)
@@ -949,7 +1099,8 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
                   overide_sys_phase=False, nowrap=None, really_verbose=False,
                   LP_solver='cylp', refl_field=None, ncp_field=None,
                   rhv_field=None, phidp_field=None, kdp_field=None,
-                  unf_field=None, window_len=35, proc=1, coef=0.914):
+                  unf_field=None, window_len=35, proc=1, coef=0.914,
+                  rays_per_chunk=90):
     """
     Phase process using a LP method [1].
 
@@ -987,7 +1138,9 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
     really_verbose : bool
         True to print LPX messaging. False to suppress.
     LP_solver : 'pyglpk' or 'cvxopt', 'cylp', or 'cylp_mp'
-        Module to use to solve LP problem.
+        Module to use to solve LP problem.  'cylp_mp' solves the problems
+        using the cylp module in `proc` worker processes and is equivalent
+        to 'cylp'.
     refl_field, ncp_field, rhv_field, phidp_field, kdp_field: str
         Name of field in radar which contains the horizonal reflectivity,
         normal coherent power, copolar coefficient, differential phase shift,
@@ -1003,9 +1156,17 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
         Length of Sobel window applied to PhiDP field when prior to
         calculating KDP.
     proc : int
-        Number of worker processes, only used when `LP_solver` is 'cylp_mp'.
+        Number of worker processes used to solve the LP problems.  When
+        larger than 1 the chunks of rays from all sweeps are solved
+        concurrently in a pool of processes using any of the LP solvers.
     coef : float
         Exponent linking Z to KDP in self consistency. kdp=(10**(0.1z))*coef
+    rays_per_chunk : int or None
+        Maximum number of rays of a sweep in each independently solved LP
+        chunk, None uses a single chunk for each sweep.  Some solvers start
+        from the solution of the previous ray in the chunk so the results
+        depend on the chunks, which do not depend on `proc`, the results are
+        the same for any number of processes.
 
     Returns
     -------
@@ -1065,6 +1226,15 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
     proc_ph = copy.deepcopy(radar.fields[phidp_field])
     proc_ph['data'] = phidp_mod
     St_Gorlv_differential_5pts = [-.2, -.1, 0, .1, .2]
+    if LP_solver not in ['pyglpk', 'cvxopt', 'cylp', 'cylp_mp']:
+        raise ValueError('unknown LP_solver:' + LP_solver)
+
+    # construct the LP problems, the rays of each sweep are divided into
+    # chunks, A matrices depend only on the number of gates and are shared.
+    # The sparse A matrices are set once in the LP model of each chunk, only
+    # the B vectors and weights change from ray to ray.
+    A_matrices = {}
+    chunks = []
     for sweep in range(len(radar.sweep_start_ray_index['data'])):
         if debug:
             print("Doing ", sweep)
@@ -1072,9 +1242,10 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
             radar, sweep, fzl, doc=15)
         start_gate = 0
 
-        A_Matrix = construct_A_matrix(
-            len(radar.range['data'][start_gate:end_gate]),
-            St_Gorlv_differential_5pts)
+        n_gates = len(radar.range['data'][start_gate:end_gate])
+        if n_gates not in A_matrices:
+            A_matrices[n_gates] = construct_A_matrix(
+                n_gates, St_Gorlv_differential_5pts, sparse=True)
 
         B_vectors = construct_B_vectors(
             phidp_mod[start_ray:end_ray, start_gate:end_gate],
@@ -1087,22 +1258,22 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
 
         nw = np.bmat([weights, np.zeros(weights.shape)])
 
-        if LP_solver == 'pyglpk':
-            mysoln = LP_solver_pyglpk(A_Matrix, B_vectors, nw,
-                                      really_verbose=really_verbose)
-        elif LP_solver == 'cvxopt':
-            mysoln = LP_solver_cvxopt(A_Matrix, B_vectors, nw)
-        elif LP_solver == 'cylp':
-            mysoln = LP_solver_cylp(A_Matrix, B_vectors, nw,
-                                    really_verbose=really_verbose)
-        elif LP_solver == 'cylp_mp':
-            mysoln = LP_solver_cylp_mp(A_Matrix, B_vectors, nw,
-                                       really_verbose=really_verbose,
-                                       proc=proc)
+        nrays = end_ray - start_ray
+        if rays_per_chunk is None:
+            step = max(nrays, 1)
         else:
-            raise ValueError('unknown LP_solver:' + LP_solver)
+            step = rays_per_chunk
+        for ray in range(0, nrays, step):
+            chunks.append((n_gates, B_vectors[ray:ray + step],
+                           nw[ray:ray + step], start_ray + ray))
 
-        proc_ph['data'][start_ray:end_ray, start_gate:end_gate] = mysoln
+    # solve the LP problems
+    tasks = [(LP_solver, n_gates, B_chunk, nw_chunk, really_verbose)
+             for n_gates, B_chunk, nw_chunk, _ in chunks]
+    solutions = _solve_lp_chunks(tasks, A_matrices, proc)
+
+    for (n_gates, _, _, ray), mysoln in zip(chunks, solutions):
+        proc_ph['data'][ray:ray + len(mysoln), start_gate:n_gates] = mysoln
 
     last_gates = proc_ph['data'][start_ray:end_ray, -16]
     proc_ph['data'][start_ray:end_ray, -16:] = \
@@ -1128,3 +1299,52 @@ def phase_proc_lp(radar, offset, debug=False, self_const=60000.0,
     sob_kdp['_FillValue'] = get_fillvalue()
 
     return proc_ph, sob_kdp
+
+
+def _solve_lp_problem(LP_solver, A_Matrix, B_vectors, weights,
+                      really_verbose=False):
+    """ Solve a LP problem for phase_proc_lp using the requested solver. """
+    if LP_solver == 'pyglpk':
+        return LP_solver_pyglpk(A_Matrix, B_vectors, weights,
+                                really_verbose=really_verbose)
+    elif LP_solver == 'cvxopt':
+        return LP_solver_cvxopt(A_Matrix, B_vectors, weights)
+    elif LP_solver in ['cylp', 'cylp_mp']:
+        return LP_solver_cylp(A_Matrix, B_vectors, weights,
+                              really_verbose=really_verbose)
+    else:
+        raise ValueError('unknown LP_solver:' + LP_solver)
+
+
+def _solve_lp_chunks(tasks, A_matrices, proc):
+    """
+    Solve chunks of LP problems, in a pool of proc processes when proc is
+    larger than 1.
+    """
+    if proc > 1:
+        import multiprocessing as mp
+        pool = mp.Pool(proc, _init_lp_worker, (A_matrices, ))
+        try:
+            return pool.map(_solve_lp_chunk, tasks, chunksize=1)
+        finally:
+            pool.terminate()
+    return [_solve_lp_problem(solver, A_matrices[n_gates], B_chunk,
+                              nw_chunk, really_verbose)
+            for solver, n_gates, B_chunk, nw_chunk, really_verbose in tasks]
+
+
+# A matrices used by the worker processes of phase_proc_lp
+_worker_A_matrices = {}
+
+
+def _init_lp_worker(A_matrices):
+    """ Initialize a phase_proc_lp worker process with the A matrices. """
+    global _worker_A_matrices
+    _worker_A_matrices = A_matrices
+
+
+def _solve_lp_chunk(task):
+    """ Solve a chunk of LP problems in a phase_proc_lp worker process. """
+    LP_solver, n_gates, B_vectors, weights, really_verbose = task
+    return _solve_lp_problem(LP_solver, _worker_A_matrices[n_gates],
+                             B_vectors, weights, really_verbose)
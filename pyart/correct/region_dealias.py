@@ -8,6 +8,7 @@ Region based dealiasing using a dynamic network reduction for region joining.
     :toctree: generated/
 
     dealias_region_based
+    _dealias_sweep
     _find_regions
     _find_sweep_interval_splits
     _combine_regions
@@ -22,17 +23,20 @@ Region based dealiasing using a dynamic network reduction for region joining.
 
 """
 
+import heapq
 import warnings
+from functools import partial
 
 import numpy as np
-import scipy.ndimage as ndimage
 
 from scipy.optimize import fmin_l_bfgs_b
 
 from ..config import get_metadata, get_fillvalue
 from ._common_dealias import _parse_fields, _parse_gatefilter, _set_limits
 from ._common_dealias import _parse_rays_wrap_around, _parse_nyquist_vel
+from ._common_dealias import _map_sweeps
 from ._fast_edge_finder import _fast_edge_finder
+from ._fast_region_finder import _fast_region_finder
 
 
 # Possible future improvements to the region based dealiasing algorithm:
@@ -48,8 +52,6 @@ from ._fast_edge_finder import _fast_edge_finder
 #   excluded by the filter are unfolded using a more elemenary approach.  In
 #   this manner the filter could define only "good" gates which establish the
 #   folding pattern which is then applied to all gates.
-# * Improve perfornace by implementing a priority queue in the _EdgeTracker
-#   object. See comments in the class for details.
 
 
 def dealias_region_based(
@@ -57,7 +59,8 @@ def dealias_region_based(
         skip_between_rays=100, skip_along_ray=100, centered=True,
         nyquist_vel=None, check_nyquist_uniform=True, gatefilter=False,
         rays_wrap_around=None, keep_original=False, set_limits=True,
-        vel_field=None, corr_vel_field=None, **kwargs):
+        vel_field=None, corr_vel_field=None, parallel=False, pool=None,
+        **kwargs):
     """
     Dealias Doppler velocities using a region based algorithm.
 
@@ -134,6 +137,15 @@ def dealias_region_based(
     corr_vel_field : str, optional
         Name to use for the dealiased Doppler velocity field metadata.  None
         will use the default field name from the Py-ART configuration file.
+    parallel : bool, optional
+        True to dealias the sweeps concurrently in a pool of workers, the
+        sweeps are dealiased independently so the results do not depend on
+        this parameter.  False dealiases the sweeps sequentially.
+    pool : multiprocessing.Pool or concurrent.futures.Executor, optional
+        Pool of workers used to dealias the sweeps when parallel is True.
+        Providing a pool allows it to be reused between calls, if None a
+        pool with one process per core is created for each call when more
+        than one core is available.
 
     Returns
     -------
@@ -163,93 +175,34 @@ def dealias_region_based(
     vdata = radar.fields[vel_field]['data'].view(np.ndarray)
     data = vdata.copy()     # dealiased velocities
 
-    # loop over sweeps
-    for nsweep, sweep_slice in enumerate(radar.iter_slice()):
-
-        # extract sweep data
-        sdata = vdata[sweep_slice].copy()   # is a copy needed here?
-        scorr = data[sweep_slice]
-        sfilter = gfilter[sweep_slice]
-
-        # find nyquist velocity and interval segmentation limits
-        nyquist_interval = nyquist_vel[nsweep] * 2.
-        if interval_limits is None:
-            nvel = nyquist_vel[nsweep]
-            valid_sdata = sdata[~sfilter]
-            s_interval_limits = _find_sweep_interval_splits(
-                nvel, interval_splits, valid_sdata, nsweep)
-        else:
-            s_interval_limits = interval_limits
-
-        # find regions in original data
-        labels, nfeatures = _find_regions(sdata, sfilter, s_interval_limits)
-        # skip sweep if all gates are masked or only a single region
-        if nfeatures < 2:
-            continue
-        bincount = np.bincount(labels.ravel())
-        num_masked_gates = bincount[0]
-        region_sizes = bincount[1:]
-
-        # find all edges between regions
-        indices, edge_count, velos = _edge_sum_and_count(
-            labels, num_masked_gates, sdata, rays_wrap_around,
-            skip_between_rays, skip_along_ray)
-
-        # no unfolding required if no edges exist between regions
-        if len(edge_count) == 0:
-            continue
-
-        # find the number of folds in the regions
-        region_tracker = _RegionTracker(region_sizes)
-        edge_tracker = _EdgeTracker(indices, edge_count, velos,
-                                    nyquist_interval, nfeatures+1)
-        while True:
-            if _combine_regions(region_tracker, edge_tracker):
-                break
+    def sweeps():
+        """ Generate the data and parameters for dealiasing each sweep. """
+        for nsweep, sweep_slice in enumerate(radar.iter_slice()):
+            sdata = vdata[sweep_slice]
+            sfilter = gfilter[sweep_slice]
+            if ref_vdata is None:
+                sref = None
+            else:
+                sref = ref_vdata[sweep_slice]
 
-        # center sweep if requested, determine a global sweep unfold number
-        # so that the average number of gate folds is zero.
-        if centered:
-            gates_dealiased = region_sizes.sum()
-            total_folds = np.sum(
-                region_sizes * region_tracker.unwrap_number[1:])
-            sweep_offset = int(round(float(total_folds) / gates_dealiased))
-            if sweep_offset != 0:
-                region_tracker.unwrap_number -= sweep_offset
-
-        # dealias the data using the fold numbers
-        nwrap = np.take(region_tracker.unwrap_number, labels)
-        scorr += nwrap * nyquist_interval
-
-        # anchor unfolded velocities against reference velocity
-        if ref_vdata is not None:
-            sref = ref_vdata[sweep_slice]
-            mean_diff = (sref - scorr).mean()
-            global_fold = round(mean_diff / nyquist_interval)
-            if global_fold != 0:
-                scorr += global_fold * nyquist_interval
-
-            # Anchor specific regions against reference velocity
-            bounds_list = [(x, y) for (x, y) in zip(-5*np.ones(nfeatures+1),
-                           5*np.ones(nfeatures+1))]
-
-            def cost_function(x):
-                return _cost_function(x, labels, scorr, sref,
-                                      nyquist_vel[nsweep], nfeatures)
-
-            def gradient(x):
-                return _gradient(x, labels, scorr, sref,
-                                 nyquist_vel[nsweep], nfeatures)
-
-            nyq_adjustments = fmin_l_bfgs_b(
-                cost_function, np.ones((nfeatures+1)), disp=True,
-                fprime=gradient, bounds=bounds_list, maxiter=40)
-
-            i = 0
-            for reg in np.unique(labels):
-                scorr[labels == reg] += (nyquist_vel[nsweep] *
-                                         np.round(nyq_adjustments[0][i]))
-                i = i + 1
+            # find interval segmentation limits
+            if interval_limits is None:
+                valid_sdata = sdata[~sfilter]
+                s_interval_limits = _find_sweep_interval_splits(
+                    nyquist_vel[nsweep], interval_splits, valid_sdata, nsweep)
+            else:
+                s_interval_limits = interval_limits
+            yield (sdata, sfilter, sref, nyquist_vel[nsweep],
+                   s_interval_limits)
+
+    # dealias the sweeps, which are independent, and store the results
+    func = partial(
+        _dealias_sweep, skip_between_rays=skip_between_rays,
+        skip_along_ray=skip_along_ray, centered=centered,
+        rays_wrap_around=rays_wrap_around)
+    scorrs = _map_sweeps(func, sweeps(), parallel, pool, threads=False)
+    for sweep_slice, scorr in zip(radar.iter_slice(), scorrs):
+        data[sweep_slice] = scorr
 
     # fill_value from the velocity dictionary if present
     fill_value = radar.fields[vel_field].get('_FillValue', get_fillvalue())
@@ -274,6 +227,103 @@ def dealias_region_based(
     return corr_vel
 
 
+def _dealias_sweep(sweep, skip_between_rays, skip_along_ray, centered,
+                   rays_wrap_around):
+    """
+    Dealias the velocities of a single sweep.
+
+    Parameters
+    ----------
+    sweep : tuple
+        Velocities, gate filter, reference velocities (or None), Nyquist
+        velocity and interval limits of the sweep.
+    skip_between_rays, skip_along_ray, centered, rays_wrap_around :
+        Parameters of :py:func:`dealias_region_based`.
+
+    Returns
+    -------
+    scorr : 2D ndarray
+        Dealiased velocities of the sweep.
+
+    """
+    sdata, sfilter, sref, nyquist_vel, interval_limits = sweep
+    scorr = sdata.copy()
+
+    # find nyquist interval
+    nyquist_interval = nyquist_vel * 2.
+
+    # find regions in original data
+    labels, nfeatures = _find_regions(sdata, sfilter, interval_limits)
+    # skip sweep if all gates are masked or only a single region
+    if nfeatures < 2:
+        return scorr
+    bincount = np.bincount(labels.ravel())
+    num_masked_gates = bincount[0]
+    region_sizes = bincount[1:]
+
+    # find all edges between regions
+    indices, edge_count, velos = _edge_sum_and_count(
+        labels, num_masked_gates, sdata, rays_wrap_around,
+        skip_between_rays, skip_along_ray)
+
+    # no unfolding required if no edges exist between regions
+    if len(edge_count) == 0:
+        return scorr
+
+    # find the number of folds in the regions
+    region_tracker = _RegionTracker(region_sizes)
+    edge_tracker = _EdgeTracker(indices, edge_count, velos,
+                                nyquist_interval, nfeatures+1)
+    while True:
+        if _combine_regions(region_tracker, edge_tracker):
+            break
+    unwrap_number = region_tracker.get_unwrap_number()
+
+    # center sweep if requested, determine a global sweep unfold number
+    # so that the average number of gate folds is zero.
+    if centered:
+        gates_dealiased = region_sizes.sum()
+        total_folds = np.sum(region_sizes * unwrap_number[1:])
+        sweep_offset = int(round(float(total_folds) / gates_dealiased))
+        if sweep_offset != 0:
+            unwrap_number -= sweep_offset
+
+    # dealias the data using the fold numbers
+    nwrap = np.take(unwrap_number, labels)
+    scorr += nwrap * nyquist_interval
+
+    # anchor unfolded velocities against reference velocity
+    if sref is not None:
+        mean_diff = (sref - scorr).mean()
+        global_fold = round(mean_diff / nyquist_interval)
+        if global_fold != 0:
+            scorr += global_fold * nyquist_interval
+
+        # Anchor specific regions against reference velocity
+        bounds_list = [(x, y) for (x, y) in zip(-5*np.ones(nfeatures+1),
+                       5*np.ones(nfeatures+1))]
+
+        def cost_function(x):
+            return _cost_function(x, labels, scorr, sref,
+                                  nyquist_vel, nfeatures)
+
+        def gradient(x):
+            return _gradient(x, labels, scorr, sref,
+                             nyquist_vel, nfeatures)
+
+        nyq_adjustments = fmin_l_bfgs_b(
+            cost_function, np.ones((nfeatures+1)), disp=True,
+            fprime=gradient, bounds=bounds_list, maxiter=40)
+
+        i = 0
+        for reg in np.unique(labels):
+            scorr[labels == reg] += (nyquist_vel *
+                                     np.round(nyq_adjustments[0][i]))
+            i = i + 1
+
+    return scorr
+
+
 def _find_sweep_interval_splits(nyquist, interval_splits, velocities, nsweep):
     """ Return the interval limits for a given sweep. """
     # The Nyquist interval is split into interval_splits  equal sized areas.
@@ -330,21 +380,14 @@ def _find_regions(vel, gfilter, limits):
         Number of regions found.
 
     """
-    mask = ~gfilter
-    label = np.zeros(vel.shape, dtype=np.int32)
-    nfeatures = 0
-    for lmin, lmax in zip(limits[:-1], limits[1:]):
-
-        # find connected regions within the limits
-        inp = (lmin <= vel) & (vel < lmax) & mask
-        limit_label, limit_nfeatures = ndimage.label(inp)
-
-        # add these regions to the global regions
-        limit_label[np.nonzero(limit_label)] += nfeatures
-        label += limit_label
-        nfeatures += limit_nfeatures
-
-    return label, nfeatures
+    # the regions within all the limits are found in a single pass, the
+    # limits are rounded to the precision in which they are compared with
+    # the velocities.
+    limits = np.array([np.result_type(vel, limit).type(limit)
+                       for limit in limits], dtype=np.float64)
+    return _fast_region_finder(
+        np.ascontiguousarray(vel, dtype=np.float64),
+        np.ascontiguousarray(gfilter, dtype=np.uint8), limits)
 
 
 def _edge_sum_and_count(labels, num_masked_gates, data,
@@ -363,32 +406,24 @@ def _edge_sum_and_count(labels, num_masked_gates, data,
         rays_wrap_around, max_gap_x, max_gap_y, total_nodes)
     index1, index2 = indices
     vel1, vel2 = velocities
-    count = np.ones_like(vel1, dtype=np.int32)
 
     # return early if not edges were found
     if len(vel1) == 0:
         return ([], []), [], ([], [])
 
-    # find the unique edges, procedure based on method in
-    # scipy.sparse.coo_matrix.sum_duplicates
-    # except we have three data arrays, vel1, vel2, and count
-    order = np.lexsort((index1, index2))
-    index1 = index1[order]
-    index2 = index2[order]
-    vel1 = vel1[order]
-    vel2 = vel2[order]
-    count = count[order]
-
-    unique_mask = ((index1[1:] != index1[:-1]) |
-                   (index2[1:] != index2[:-1]))
-    unique_mask = np.append(True, unique_mask)
-    index1 = index1[unique_mask]
-    index2 = index2[unique_mask]
-
-    unique_inds, = np.nonzero(unique_mask)
-    vel1 = np.add.reduceat(vel1, unique_inds, dtype=vel1.dtype)
-    vel2 = np.add.reduceat(vel2, unique_inds, dtype=vel2.dtype)
-    count = np.add.reduceat(count, unique_inds, dtype=count.dtype)
+    # find the unique edges, each pair of regions is packed into a single
+    # integer which orders the edges by the second and then the first region.
+    # The count and velocities of the edges are summed using bincount.
+    nlabels = np.int64(labels.max()) + 1
+    packed_indices = index2.astype(np.int64) * nlabels + index1
+    unique_indices, edge_number = np.unique(
+        packed_indices, return_inverse=True)
+    index1 = (unique_indices % nlabels).astype(np.int32)
+    index2 = (unique_indices // nlabels).astype(np.int32)
+
+    count = np.bincount(edge_number).astype(np.int32)
+    vel1 = np.bincount(edge_number, weights=vel1)
+    vel2 = np.bincount(edge_number, weights=vel2)
 
     return (index1, index2), count, (vel1, vel2)
 
@@ -477,21 +512,19 @@ class _RegionTracker(object):
         self.node_size = np.zeros(nregions, dtype='int32')
         self.node_size[1:] = region_sizes[:]
 
-        # array of lists containing the regions in each node
-        self.regions_in_node = np.zeros(nregions, dtype='object')
-        for i in range(nregions):
-            self.regions_in_node[i] = [i]
-
-        # number of unwrappings to apply to dealias each region
-        self.unwrap_number = np.zeros(nregions, dtype='int32')
+        # the regions in each node form a tree (union-find forest) with the
+        # node as root.  The number of unwrappings to apply to dealias a
+        # region is the sum of the unwrap offsets along the path from the
+        # region to the root.
+        self.parent = np.arange(nregions, dtype='int32')
+        self.unwrap_offset = np.zeros(nregions, dtype='int32')
 
     def merge_nodes(self, node_a, node_b):
         """ Merge node b into node a. """
 
-        # move all regions from node_b to node_a
-        regions_to_merge = self.regions_in_node[node_b]
-        self.regions_in_node[node_a].extend(regions_to_merge)
-        self.regions_in_node[node_b] = []
+        # attach the tree of node_b to node_a
+        self.parent[node_b] = node_a
+        self.unwrap_offset[node_b] -= self.unwrap_offset[node_a]
 
         # update node sizes
         self.node_size[node_a] += self.node_size[node_b]
@@ -502,15 +535,26 @@ class _RegionTracker(object):
         """ Unwrap all gates contained a node. """
         if nwrap == 0:
             return
-        # for each region in node add nwrap
-        regions_to_unwrap = self.regions_in_node[node]
-        self.unwrap_number[regions_to_unwrap] += nwrap
+        self.unwrap_offset[node] += nwrap
         return
 
     def get_node_size(self, node):
         """ Return the number of gates in a node. """
         return self.node_size[node]
 
+    def get_unwrap_number(self):
+        """ Return the number of unwrappings to apply to each region. """
+        # sum the unwrap offsets along the paths to the roots by pointer
+        # jumping, the roots point to an additional entry with no offset.
+        nregions = len(self.parent)
+        parent = np.append(self.parent, nregions)
+        parent[np.nonzero(parent[:-1] == np.arange(nregions))] = nregions
+        unwrap_number = np.append(self.unwrap_offset, 0).astype('int32')
+        while np.any(parent[:-1] != nregions):
+            unwrap_number += unwrap_number[parent]
+            parent = parent[parent]
+        return unwrap_number[:-1]
+
 
 class _EdgeTracker(object):
     """ A class for tracking edges in a dynamic network. """
@@ -519,105 +563,82 @@ class _EdgeTracker(object):
                  nnodes):
         """ initialize """
 
-        nedges = int(len(indices[0]) / 2)
+        # each edge is included once, from the region with the larger label
+        idx1, idx2 = indices
+        vel1, vel2 = velocities
+        forward = np.nonzero(idx1 > idx2)
 
         # node number and different in sum for each edge
-        self.node_alpha = np.zeros(nedges, dtype=np.int32)
-        self.node_beta = np.zeros(nedges, dtype=np.int32)
-        self.sum_diff = np.zeros(nedges, dtype=np.float32)
+        self.node_alpha = idx1[forward].astype(np.int32)
+        self.node_beta = idx2[forward].astype(np.int32)
+        self.sum_diff = ((vel1[forward] - vel2[forward]) /
+                         nyquist_interval).astype(np.float32)
 
         # number of connections between the regions
-        self.weight = np.zeros(nedges, dtype=np.int32)
-
-        # fast finding
-        self._common_finder = np.zeros(nnodes, dtype=np.bool)
-        self._common_index = np.zeros(nnodes, dtype=np.int32)
-        self._last_base_node = -1
-
-        # array of linked lists pointing to each node
-        self.edges_in_node = np.zeros(nnodes, dtype='object')
-        for i in range(nnodes):
-            self.edges_in_node[i] = []
-
-        # fill out data from the provides indicies, edge counts and velocities
-        edge = 0
-        idx1, idx2 = indices
-        vel1, vel2 = velocities
-        for i, j, count, vel, nvel in zip(idx1, idx2, edge_count, vel1, vel2):
-            if i < j:
-                continue
-            self.node_alpha[edge] = i
-            self.node_beta[edge] = j
-            self.sum_diff[edge] = ((vel - nvel) / nyquist_interval)
-            self.weight[edge] = count
-            self.edges_in_node[i].append(edge)
-            self.edges_in_node[j].append(edge)
-
-            edge += 1
-
-        # list which orders edges according to their weight, highest first
-        # TODO
-        self.priority_queue = []
+        self.weight = np.asarray(edge_count)[forward].astype(np.int32)
+
+        # the edges are directed from the last base node in a merge, the
+        # direction is updated when the edge is popped.  The merge number
+        # when each node was last a base node and when each edge was last
+        # directed are recorded.
+        self._merge_number = 0
+        self._node_merge_number = [0] * nnodes
+        self._edge_merge_number = [0] * len(self.weight)
+
+        # dictionaries mapping the neighbors of each node to the edges
+        self.edges_in_node = [{} for i in range(nnodes)]
+        for edge, (i, j) in enumerate(zip(self.node_alpha.tolist(),
+                                          self.node_beta.tolist())):
+            self.edges_in_node[i][j] = edge
+            self.edges_in_node[j][i] = edge
+
+        # priority queue which orders edges according to their weight,
+        # highest first, and edge number.  Entries of edges which are
+        # combined or merged are left in the queue and skipped when popped.
+        self.priority_queue = [
+            (-weight, edge) for edge, weight in enumerate(self.weight)]
+        heapq.heapify(self.priority_queue)
 
     def merge_nodes(self, base_node, merge_node, foo_edge):
         """ Merge nodes. """
+        self._merge_number += 1
+        self._node_merge_number[base_node] = self._merge_number
 
         # remove edge between base and merge nodes
         self.weight[foo_edge] = -999
-        self.edges_in_node[merge_node].remove(foo_edge)
-        self.edges_in_node[base_node].remove(foo_edge)
-        self._common_finder[merge_node] = False
-
-        # find all the edges in the two nodes
-        edges_in_merge = list(self.edges_in_node[merge_node])
-
-        # loop over base_node edges if last base_node was different
-        if self._last_base_node != base_node:
-            self._common_finder[:] = False
-            edges_in_base = list(self.edges_in_node[base_node])
-            for edge_num in edges_in_base:
-
-                # reverse edge if needed so node_alpha is base_node
-                if self.node_beta[edge_num] == base_node:
-                    self._reverse_edge_direction(edge_num)
-                assert self.node_alpha[edge_num] == base_node
-
-                # find all neighboring nodes to base_node
-                neighbor = self.node_beta[edge_num]
-                self._common_finder[neighbor] = True
-                self._common_index[neighbor] = edge_num
+        edges_in_base = self.edges_in_node[base_node]
+        edges_in_merge = self.edges_in_node[merge_node]
+        del edges_in_base[merge_node]
+        del edges_in_merge[base_node]
 
         # loop over edge nodes
-        for edge_num in edges_in_merge:
+        for neighbor, edge_num in edges_in_merge.items():
 
             # reverse edge so that node alpha is the merge_node
             if self.node_beta[edge_num] == merge_node:
                 self._reverse_edge_direction(edge_num)
-            assert self.node_alpha[edge_num] == merge_node
 
             # update all the edges to point to the base node
             self.node_alpha[edge_num] = base_node
+            self._edge_merge_number[edge_num] = self._merge_number
+            edges_in_neighbor = self.edges_in_node[neighbor]
+            del edges_in_neighbor[merge_node]
 
             # if base_node also has an edge with the neighbor combine them
-            neighbor = self.node_beta[edge_num]
-            if self._common_finder[neighbor]:
-                base_edge_num = self._common_index[neighbor]
-                self._combine_edges(base_edge_num, edge_num,
-                                    merge_node, neighbor)
-            # if not fill in _common_ arrays.
+            if neighbor in edges_in_base:
+                base_edge_num = edges_in_base[neighbor]
+                if self.node_beta[base_edge_num] == base_node:
+                    self._reverse_edge_direction(base_edge_num)
+                self._combine_edges(base_edge_num, edge_num)
+            # if not move the edge to base_node
             else:
-                self._common_finder[neighbor] = True
-                self._common_index[neighbor] = edge_num
-
-        # move all edges from merge_node to base_node
-        edges = self.edges_in_node[merge_node]
-        self.edges_in_node[base_node].extend(edges)
-        self.edges_in_node[merge_node] = []
-        self._last_base_node = int(base_node)
+                edges_in_base[neighbor] = edge_num
+                edges_in_neighbor[base_node] = edge_num
+
+        self.edges_in_node[merge_node] = {}
         return
 
-    def _combine_edges(self, base_edge, merge_edge,
-                       merge_node, neighbor_node):
+    def _combine_edges(self, base_edge, merge_edge):
         """ Combine edges into a single edge.  """
         # Merging nodes MUST be set to alpha prior to calling this function
 
@@ -628,16 +649,9 @@ class _EdgeTracker(object):
         # combine sums
         self.sum_diff[base_edge] += self.sum_diff[merge_edge]
 
-        # remove merge_edge from both node lists
-        self.edges_in_node[merge_node].remove(merge_edge)
-        self.edges_in_node[neighbor_node].remove(merge_edge)
-
-        # TODO priority queue
-        # remove merge_edge from edge priority queue
-        # self.priority_queue.remove(merge_edge)
-
         # relocate base_edge in priority queue
-        # self.priority_queue.sort()
+        heapq.heappush(
+            self.priority_queue, (-self.weight[base_edge], base_edge))
 
     def _reverse_edge_direction(self, edge):
         """ Reverse an edges direction, change alpha and beta. """
@@ -655,7 +669,7 @@ class _EdgeTracker(object):
         if nwrap == 0:
             return
         # add weight * nwrap to each edge in node
-        for edge in self.edges_in_node[node]:
+        for edge in self.edges_in_node[node].values():
             weight = self.weight[edge]
             if node == self.node_alpha[edge]:
                 self.sum_diff[edge] += weight * nwrap
@@ -667,16 +681,23 @@ class _EdgeTracker(object):
     def pop_edge(self):
         """ Pop edge with largest weight.  Return node numbers and diff """
 
-        # if len(priority_queue) == 0:
-        #     return True, None
+        # skip queue entries of removed edges and outdated weights
+        while len(self.priority_queue) != 0:
+            neg_weight, edge_num = heapq.heappop(self.priority_queue)
+            if self.weight[edge_num] == -neg_weight:
+                break
+        else:
+            return True, None
 
-        # edge_num = self.priority_queue[0]
-        edge_num = np.argmax(self.weight)
+        # direct the edge from the node which was last a base node
         node1 = self.node_alpha[edge_num]
         node2 = self.node_beta[edge_num]
+        node2_merge_number = self._node_merge_number[node2]
+        if (node2_merge_number > self._node_merge_number[node1] and
+                node2_merge_number > self._edge_merge_number[edge_num]):
+            self._reverse_edge_direction(edge_num)
+            node1, node2 = node2, node1
+
         weight = self.weight[edge_num]
         diff = self.sum_diff[edge_num] / (float(weight))
-
-        if weight < 0:
-            return True, None
         return False, (node1, node2, weight, diff, edge_num)
@@ -65,6 +65,11 @@ def configuration(parent_package='', top_path=None):
     # _fast_edge_finder extension
     config.add_extension('_fast_edge_finder', sources=['_fast_edge_finder.c'],
                          include_dirs=[get_include()])
+
+    # _fast_region_finder extension
+    config.add_extension('_fast_region_finder',
+                         sources=['_fast_region_finder.c'],
+                         include_dirs=[get_include()])
     return config
 
 
@@ -20,6 +20,30 @@ def test_attenuation():
     assert_allclose(ref['cor_z'], cor_z['data'].data)
 
 
+def test_attenuation_multiple_rays():
+    # each ray is corrected independently of the other rays
+    single_ray_radar = pyart.testing.make_single_ray_radar()
+    radar = pyart.testing.make_empty_ppi_radar(983, 3, 2)
+    radar.range['data'] = single_ray_radar.range['data']
+    radar.fixed_angle['data'] = np.array([0.75, 0.75])
+    for field_name, field in single_ray_radar.fields.items():
+        data = np.ma.array(np.tile(field['data'], (6, 1)))
+        data[1] = data[1] * 0.9
+        data[4] = data[4] + 1.0
+        radar.add_field(field_name, {'data': data})
+    radar.fields['normalized_coherent_power']['data'][2, 500:] = 0.1
+
+    spec_at, cor_z = pyart.correct.calculate_attenuation(radar, 0.0)
+    assert spec_at['data'].shape == (6, 983)
+    for i in range(6):
+        for field_name, field in single_ray_radar.fields.items():
+            field['data'] = radar.fields[field_name]['data'][i:i + 1]
+        ray_spec_at, ray_cor_z = pyart.correct.calculate_attenuation(
+            single_ray_radar, 0.0)
+        assert np.array_equal(spec_at['data'][i], ray_spec_at['data'][0])
+        assert np.array_equal(cor_z['data'][i], ray_cor_z['data'][0])
+
+
 def perform_attenuation():
     """ Perform attenuation correction on a single ray radar. """
     radar = pyart.testing.make_single_ray_radar()
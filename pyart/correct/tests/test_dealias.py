@@ -127,6 +127,70 @@ def test_segmentation_fault_error():
     return
 
 
+def _make_profile():
+    """ Return the sounding used by the tests. """
+    height = np.linspace(150, 250, 10).astype('float32')
+    speed = np.ones((10), dtype='float32') * 0.5
+    direction = np.ones((10), dtype='float32') * 5.
+    return pyart.core.HorizontalWindProfile(height, speed, direction)
+
+
+@skipif(not pyart.correct.dealias._FOURDD_AVAILABLE)
+def test_fourdd_session():
+    # each volume is dealiased as dealias_fourdd does using the previous
+    # dealiased volume and the sounding
+    profile = _make_profile()
+    session = pyart.correct.FourDDSession(sonde_profile=profile)
+    last_radar = None
+    for i in range(3):
+        radar = pyart.testing.make_velocity_aliased_radar()
+        radar.fields['velocity']['data'][13, -4:] = [-7.5, 8.5, 0, 0]
+        # the rays of each volume point in slightly different directions
+        radar.azimuth['data'] += 0.1 * i
+        dealias_vel = session.dealias(radar)
+        ref_dealias_vel = pyart.correct.dealias_fourdd(
+            radar, last_radar=last_radar, sonde_profile=profile)
+        assert np.ma.allequal(dealias_vel['data'], ref_dealias_vel['data'])
+        assert np.array_equal(dealias_vel['data'].mask,
+                              ref_dealias_vel['data'].mask)
+        radar.add_field('corrected_velocity', ref_dealias_vel,
+                        replace_existing=True)
+        last_radar = radar
+    assert session.last_vel_volume is not None
+    assert session.sound_volume is not None
+
+    session.reset()
+    assert session.last_vel_volume is None
+    assert_raises(ValueError, session.set_sonde_profile, None)
+
+
+@skipif(not pyart.correct.dealias._FOURDD_AVAILABLE)
+def test_fourdd_session_raises():
+    assert_raises(ValueError, pyart.correct.FourDDSession)
+    radar = pyart.testing.make_velocity_aliased_radar()
+    session = pyart.correct.FourDDSession(
+        last_radar=radar, last_vel_field='velocity')
+    assert_raises(ValueError, session.reset)
+
+
+def test_same_geometry():
+    radar = pyart.testing.make_velocity_aliased_radar()
+    geometry = pyart.correct.dealias._sweep_geometry(radar)
+    same_geometry = pyart.correct.dealias._same_geometry
+    assert not same_geometry(geometry, None, 0.5)
+    assert same_geometry(geometry, geometry, 0.)
+
+    radar.azimuth['data'][0] += 359.8
+    radar.azimuth['data'][1] += 0.2
+    other_geometry = pyart.correct.dealias._sweep_geometry(radar)
+    assert same_geometry(geometry, other_geometry, 0.5)
+    assert not same_geometry(geometry, other_geometry, 0.1)
+
+    radar.range['meters_between_gates'] += 1.
+    other_geometry = pyart.correct.dealias._sweep_geometry(radar)
+    assert not same_geometry(geometry, other_geometry, 0.5)
+
+
 if __name__ == "__main__":
 
     radar, dealias_vel = perform_dealias()
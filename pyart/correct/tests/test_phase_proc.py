@@ -87,6 +87,150 @@ def test_phase_proc_lp_cylp_mp():
                   radar.fields['unfolded_differential_phase']['data']) <= 0.01
 
 
+@skipif(not cvxopt_available)
+def test_phase_proc_lp_parallel():
+    from cvxopt import solvers
+    solvers.options['LPX_K_MSGLEV'] = 0     # supress screen output
+    radar = pyart.testing.make_single_ray_radar()
+    multi_sweep_radar = pyart.testing.make_empty_ppi_radar(983, 1, 2)
+    multi_sweep_radar.range['data'] = radar.range['data']
+    for field_name, field in radar.fields.items():
+        multi_sweep_radar.fields[field_name] = {
+            'data': np.tile(field['data'], (2, 1))}
+
+    # default chunks do not depend on the number of processes
+    phidp, kdp = pyart.correct.phase_proc_lp(
+        multi_sweep_radar, 0.0, LP_solver='cvxopt')
+    phidp_mp, kdp_mp = pyart.correct.phase_proc_lp(
+        multi_sweep_radar, 0.0, LP_solver='cvxopt', proc=2)
+    assert np.array_equal(phidp['data'], phidp_mp['data'])
+    assert np.array_equal(kdp['data'], kdp_mp['data'])
+
+    phidp_mp, kdp_mp = pyart.correct.phase_proc_lp(
+        multi_sweep_radar, 0.0, LP_solver='cvxopt', proc=2,
+        rays_per_chunk=1)
+    assert np.array_equal(phidp['data'], phidp_mp['data'])
+    assert np.array_equal(kdp['data'], kdp_mp['data'])
+
+
+@skipif(not cvxopt_available)
+def test_phase_proc_lp_parallel_single_sweep():
+    from cvxopt import solvers
+    solvers.options['LPX_K_MSGLEV'] = 0     # supress screen output
+    radar = pyart.testing.make_single_ray_radar()
+    single_sweep_radar = pyart.testing.make_empty_ppi_radar(983, 3, 1)
+    single_sweep_radar.range['data'] = radar.range['data']
+    for field_name, field in radar.fields.items():
+        single_sweep_radar.fields[field_name] = {
+            'data': np.tile(field['data'], (3, 1))}
+
+    phidp, kdp = pyart.correct.phase_proc_lp(
+        single_sweep_radar, 0.0, LP_solver='cvxopt')
+    phidp_mp, kdp_mp = pyart.correct.phase_proc_lp(
+        single_sweep_radar, 0.0, LP_solver='cvxopt', proc=2,
+        rays_per_chunk=2)
+    assert np.array_equal(phidp['data'], phidp_mp['data'])
+    assert np.array_equal(kdp['data'], kdp_mp['data'])
+
+
+def test_construct_A_matrix():
+    filt = [-.2, -.1, 0, .1, .2]
+    a = pyart.correct.phase_proc.construct_A_matrix(7, filt)
+    assert a.shape == (17, 14)
+    identity = np.eye(7)
+    assert np.array_equal(a[:7, :7], identity)
+    assert np.array_equal(a[:7, 7:], -identity)
+    assert np.array_equal(a[7:14, :7], identity)
+    assert np.array_equal(a[7:14, 7:], identity)
+    assert np.array_equal(a[14:, :7], np.zeros((3, 7)))
+    assert np.allclose(a[14:, 7:], [
+        [0, 0, 0, .1, .2, 0, 0],
+        [0, 0, -.1, 0, .1, 0, 0],
+        [0, 0, -.2, -.1, 0, 0, 0]])
+
+    sparse_a = pyart.correct.phase_proc.construct_A_matrix(
+        7, filt, sparse=True)
+    assert sparse_a.format == 'csr'
+    assert sparse_a.nnz == np.count_nonzero(a)
+    assert np.array_equal(sparse_a.toarray(), a)
+
+
+def test_construct_B_vectors():
+    phidp = np.arange(20.).reshape(2, 10)
+    z = np.zeros((2, 10))
+    filt = [-.2, -.1, 0, .1, .2]
+    b = pyart.correct.phase_proc.construct_B_vectors(
+        phidp, z, filt, dweight=1.0)
+    assert b.shape == (2, 26)
+    assert np.array_equal(b[:, :10], -phidp)
+    assert np.array_equal(b[:, 10:20], phidp)
+    assert np.allclose(b[0, 20:], [0.1, 0.2, 1, 1, -1.6, -2.6])
+    assert np.allclose(b[1, 20:], [3.1, 2.2, 1, 1, -3.6, -5.6])
+
+
+def test_smooth_and_trim_rows():
+    lengths = [11, 30, 200]
+    x = np.random.RandomState(0).randn(sum(lengths))
+    for window_len, window in [(11, 'hanning'), (9, 'hanning'),
+                               (5, 'sg_smooth'), (11, 'flat')]:
+        y = pyart.correct.phase_proc._smooth_and_trim_rows(
+            x, lengths, window_len, window)
+        start = 0
+        for length in lengths:
+            ref = pyart.correct.phase_proc.smooth_and_trim(
+                x[start:start + length], window_len, window)
+            assert np.array_equal(y[start:start + length], ref)
+            start += length
+
+
+def _make_multi_ray_radar(nrays):
+    """ Return a radar with nrays rolled copies of the single ray radar. """
+    single_ray_radar = pyart.testing.make_single_ray_radar()
+    radar = pyart.testing.make_empty_ppi_radar(983, nrays, 1)
+    radar.range['data'] = single_ray_radar.range['data']
+    radar.fixed_angle['data'] = np.array([0.5])
+    for name, field in single_ray_radar.fields.items():
+        data = np.concatenate(
+            [np.roll(field['data'], 10 * i, axis=1) for i in range(nrays)])
+        radar.add_field(name, {'data': data})
+    return radar
+
+
+def test_get_phidp_unf_rays():
+    # with a fixed system phase each ray is unfolded independently
+    radar = _make_multi_ray_radar(3)
+    radar.fields['normalized_coherent_power']['data'][1, 400:] = 0.1
+    radar.fields['differential_phase']['data'][2, 100:200] = np.nan
+    cordata = pyart.correct.phase_proc.get_phidp_unf(
+        radar, overide_sys_phase=True)
+    assert len(cordata) == 3
+    for i in range(3):
+        single_ray_radar = pyart.testing.make_single_ray_radar()
+        for name, field in single_ray_radar.fields.items():
+            field['data'] = radar.fields[name]['data'][i:i + 1]
+        ray_cordata = pyart.correct.phase_proc.get_phidp_unf(
+            single_ray_radar, overide_sys_phase=True)
+        assert np.array_equal(cordata[i], ray_cordata[0])
+
+
+def test_det_sys_phase():
+    radar = pyart.testing.make_single_ray_radar()
+    sys_phase = pyart.correct.phase_proc.det_sys_phase(radar)
+    assert np.allclose(sys_phase, -140.18, atol=0.01)
+
+    # radials without meteorological gates are excluded
+    radar = _make_multi_ray_radar(3)
+    ncp = radar.fields['normalized_coherent_power']['data']
+    ncp[1] = 0.1
+    rhv = radar.fields['cross_correlation_ratio']['data']
+    phidp = radar.fields['differential_phase']['data']
+    sys_phases = [pyart.correct.phase_proc._det_sys_phase(
+        ncp[:, 30:], rhv[:, 30:], phidp[:, 30:], i) for i in range(3)]
+    assert sys_phases[0] == sys_phases[1] == sys_phase
+    assert sys_phases[2] != sys_phase
+    assert pyart.correct.phase_proc.det_sys_phase(radar, ncp_lev=1.1) is None
+
+
 def _ratio(a1, a2):
     """ Ratio the sum of the abs difference vs sum abs of two vectors. """
     abs_residues = np.abs(a1 - a2).sum()
@@ -7,9 +7,11 @@
 from __future__ import print_function
 
 import warnings
+from multiprocessing.pool import ThreadPool
 
 import pyart
 import numpy as np
+import scipy.ndimage as ndimage
 from numpy.testing import assert_allclose, assert_almost_equal
 
 REF_DATA = [0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5, 11.5,
@@ -176,6 +178,60 @@ def test_fillvalue(**kwargs):
     assert dealias_vel['data'].fill_value == 8888.0
 
 
+def test_find_regions():
+    # regions are labeled as when each interval is labeled separately
+    random_state = np.random.RandomState(0)
+    vel = random_state.uniform(-10, 10, (40, 50)).astype('float32')
+    vel = ndimage.uniform_filter(vel, 5)
+    gfilter = random_state.rand(40, 50) < 0.1
+    limits = np.linspace(-5, 5, 6)
+    labels, nfeatures = pyart.correct.region_dealias._find_regions(
+        vel, gfilter, limits)
+
+    ref_labels = np.zeros(vel.shape, dtype=np.int32)
+    ref_nfeatures = 0
+    for lmin, lmax in zip(limits[:-1], limits[1:]):
+        inp = (lmin <= vel) & (vel < lmax) & ~gfilter
+        limit_label, limit_nfeatures = ndimage.label(inp)
+        limit_label[np.nonzero(limit_label)] += ref_nfeatures
+        ref_labels += limit_label
+        ref_nfeatures += limit_nfeatures
+    assert nfeatures == ref_nfeatures
+    assert np.array_equal(labels, ref_labels)
+
+
+def test_region_tracker():
+    region_tracker = pyart.correct.region_dealias._RegionTracker(
+        np.array([1, 2, 3, 4]))
+    region_tracker.unwrap_node(2, 1)
+    region_tracker.merge_nodes(3, 2)
+    region_tracker.unwrap_node(3, -2)
+    region_tracker.unwrap_node(4, 1)
+    region_tracker.merge_nodes(4, 3)
+    region_tracker.unwrap_node(4, 3)
+    assert region_tracker.get_node_size(4) == 9
+    assert region_tracker.get_node_size(2) == 0
+    assert np.array_equal(region_tracker.get_unwrap_number(),
+                          [0, 0, 2, 1, 4])
+
+
+def test_dealias_region_based_parallel():
+    # sweeps are dealiased independently of how they are dispatched
+    radar = pyart.testing.make_multi_sweep_velocity_aliased_radar()
+    dealias_vel = pyart.correct.dealias_region_based(radar)
+    pool = ThreadPool(2)
+    try:
+        dealias_vel_par = pyart.correct.dealias_region_based(
+            radar, parallel=True, pool=pool)
+    finally:
+        pool.terminate()
+    assert np.array_equal(dealias_vel['data'], dealias_vel_par['data'])
+    assert np.array_equal(dealias_vel['data'].mask,
+                          dealias_vel_par['data'].mask)
+    dealias_vel_par = pyart.correct.dealias_region_based(radar, parallel=True)
+    assert np.array_equal(dealias_vel['data'], dealias_vel_par['data'])
+
+
 def main():
 
     radar, dealias_vel = perform_dealias()
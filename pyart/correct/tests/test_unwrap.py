@@ -6,6 +6,8 @@
 
 from __future__ import print_function
 
+from multiprocessing.pool import ThreadPool
+
 import pyart
 import numpy as np
 from numpy.testing import assert_allclose, assert_raises, assert_almost_equal
@@ -228,6 +230,23 @@ def test_fillvalue(**kwargs):
     assert dealias_vel['data'].fill_value == 8888.0
 
 
+def test_dealias_unwrap_phase_sweep_parallel():
+    # sweeps are dealiased independently of how they are dispatched
+    radar = pyart.testing.make_multi_sweep_velocity_aliased_radar()
+    dealias_vel = pyart.correct.dealias_unwrap_phase(radar)
+    pool = ThreadPool(2)
+    try:
+        dealias_vel_par = pyart.correct.dealias_unwrap_phase(
+            radar, parallel=True, pool=pool)
+    finally:
+        pool.terminate()
+    assert np.array_equal(dealias_vel['data'], dealias_vel_par['data'])
+    assert np.array_equal(dealias_vel['data'].mask,
+                          dealias_vel_par['data'].mask)
+    dealias_vel_par = pyart.correct.dealias_unwrap_phase(radar, parallel=True)
+    assert np.array_equal(dealias_vel['data'], dealias_vel_par['data'])
+
+
 if __name__ == "__main__":
 
     radar, dealias_vel = perform_dealias()
@@ -10,6 +10,7 @@ Dealias using multidimensional phase unwrapping algorithms.
     dealias_unwrap_phase
     _dealias_unwrap_3d
     _dealias_unwrap_2d
+    _unwrap_sweep
     _dealias_unwrap_1d
     _verify_unwrap_unit
     _is_radar_cubic
@@ -21,11 +22,14 @@ Dealias using multidimensional phase unwrapping algorithms.
 
 from __future__ import print_function
 
+from functools import partial
+
 import numpy as np
 
 from ..config import get_metadata, get_fillvalue
 from ._common_dealias import _parse_fields, _parse_gatefilter, _set_limits
 from ._common_dealias import _parse_rays_wrap_around, _parse_nyquist_vel
+from ._common_dealias import _map_sweeps
 
 from ._unwrap_1d import unwrap_1d
 from ._unwrap_2d import unwrap_2d
@@ -36,7 +40,8 @@ def dealias_unwrap_phase(
         radar, unwrap_unit='sweep', nyquist_vel=None,
         check_nyquist_uniform=True, gatefilter=False,
         rays_wrap_around=None, keep_original=False, set_limits=True,
-        vel_field=None, corr_vel_field=None, skip_checks=False, **kwargs):
+        vel_field=None, corr_vel_field=None, skip_checks=False,
+        parallel=False, pool=None, **kwargs):
     """
     Dealias Doppler velocities using multi-dimensional phase unwrapping.
 
@@ -93,6 +98,17 @@ def dealias_unwrap_phase(
         True to skip checks verifing that an appropiate unwrap_unit is
         selected, False retains these checked. Setting this parameter to True
         is not recommended and is only offered as an option for extreme cases.
+    parallel : bool, optional
+        True to unwrap the sweeps concurrently in a pool of workers when
+        unwrap_unit is 'sweep', the sweeps are unwrapped independently so
+        the results do not depend on this parameter.  False unwraps the
+        sweeps sequentially.  Ignored for the other unwrap units.
+    pool : multiprocessing.Pool or concurrent.futures.Executor, optional
+        Pool of workers used to unwrap the sweeps when parallel is True.
+        Providing a pool allows it to be reused between calls, if None a
+        pool with one thread per core is created for each call when more
+        than one core is available.  The unwrapping routine releases the
+        GIL so the sweeps are unwrapped concurrently by threads.
 
     Returns
     -------
@@ -137,7 +153,8 @@ def dealias_unwrap_phase(
         data = _dealias_unwrap_1d(vdata, nyquist_vel)
     elif unwrap_unit == 'sweep':
         data = _dealias_unwrap_2d(
-            radar, vdata, nyquist_vel, gfilter, rays_wrap_around)
+            radar, vdata, nyquist_vel, gfilter, rays_wrap_around, parallel,
+            pool)
     elif unwrap_unit == 'volume':
         data = _dealias_unwrap_3d(
             radar, vdata, nyquist_vel, gfilter, rays_wrap_around)
@@ -211,24 +228,34 @@ def _dealias_unwrap_1d(vdata, nyquist_vel):
     return data
 
 
-def _dealias_unwrap_2d(radar, vdata, nyquist_vel, gfilter, rays_wrap_around):
+def _dealias_unwrap_2d(radar, vdata, nyquist_vel, gfilter, rays_wrap_around,
+                       parallel=False, pool=None):
     """ Dealias using 2D phase unwrapping (sweep-by-sweep). """
     data = np.zeros_like(vdata)
-    for nsweep, sweep_slice in enumerate(radar.iter_slice()):
-        # extract sweep and scale to phase units
-        sweep_nyquist_vel = nyquist_vel[nsweep]
-        scaled_sweep = vdata[sweep_slice] * np.pi / sweep_nyquist_vel
-        sweep_mask = gfilter[sweep_slice]
+    sweeps = ((vdata[sweep_slice], gfilter[sweep_slice], nyquist_vel[nsweep])
+              for nsweep, sweep_slice in enumerate(radar.iter_slice()))
+    func = partial(_unwrap_sweep, rays_wrap_around=rays_wrap_around)
+    unwrapped_sweeps = _map_sweeps(func, sweeps, parallel, pool, threads=True)
+    for sweep_slice, unwrapped in zip(radar.iter_slice(), unwrapped_sweeps):
+        data[sweep_slice, :] = unwrapped
+    return data
 
-        # perform unwrapping
-        wrapped = np.require(scaled_sweep, np.float64, ['C'])
-        mask = np.require(sweep_mask, np.uint8, ['C'])
-        unwrapped = np.empty_like(wrapped, dtype=np.float64, order='C')
-        unwrap_2d(wrapped, mask, unwrapped, [rays_wrap_around, False])
 
-        # scale back into velocity units and store
-        data[sweep_slice, :] = unwrapped * sweep_nyquist_vel / np.pi
-    return data
+def _unwrap_sweep(sweep, rays_wrap_around):
+    """ Unwrap the velocities, gate filter and Nyquist velocity of a sweep. """
+    sweep_vdata, sweep_mask, sweep_nyquist_vel = sweep
+
+    # scale to phase units
+    scaled_sweep = sweep_vdata * np.pi / sweep_nyquist_vel
+
+    # perform unwrapping
+    wrapped = np.require(scaled_sweep, np.float64, ['C'])
+    mask = np.require(sweep_mask, np.uint8, ['C'])
+    unwrapped = np.empty_like(wrapped, dtype=np.float64, order='C')
+    unwrap_2d(wrapped, mask, unwrapped, [rays_wrap_around, False])
+
+    # scale back into velocity units
+    return unwrapped * sweep_nyquist_vel / np.pi
 
 
 def _verify_unwrap_unit(radar, unwrap_unit):
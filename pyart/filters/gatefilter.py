@@ -269,6 +269,16 @@ class GateFilter(object):
         included and then use the exclude methods to exclude gates based on
         conditions.  False will begin with all gates excluded from which
         a set of gates to include should be set using the include methods.
+    packed : bool, optional
+        True to store the gates marked by each condition set by the exclude
+        and include methods as packed bits, one bit per gate, and merge them
+        with the excluded gates when the excluded or included gates are
+        accessed.  Each condition is evaluated one sweep at a time when the
+        method is called so later changes to the field data do not affect
+        the filter and the temporary arrays are the size of a sweep.  This
+        lowers the peak memory used by long chains of conditions on large
+        volumes, the speed is similar.  False, the default, merges each
+        condition with the excluded gates immediately.
 
     Attributes
     ----------
@@ -297,9 +307,11 @@ class GateFilter(object):
 
     """
 
-    def __init__(self, radar, exclude_based=True):
+    def __init__(self, radar, exclude_based=True, packed=False):
         """ initialize """
         self._radar = radar
+        self._packed = packed
+        self._markers = []
         shape = (radar.nrays, radar.ngates)
         if exclude_based:
             # start with all gates included, exclude gates based on a set
@@ -312,20 +324,28 @@ class GateFilter(object):
 
     # Implemetation is based on marking excluded gates stored in the private
     # _gate_excluded attribute. The gate_included attribute can be found
-    # by taking the ones complement of gates_included.
+    # by taking the ones complement of gates_included.  The exclude and
+    # include methods create markers, functions which return the gates
+    # marked in a slice of rays, these are merged with the excluded gates
+    # immediately or, when packed, evaluated sweep by sweep into arrays of
+    # packed bits which are recorded in the _markers attribute and merged
+    # when the excluded gates are accessed.
 
     def copy(self):
         """ Return a copy of the gatefilter. """
-        a = GateFilter(self._radar)
+        a = GateFilter(self._radar, packed=self._packed)
         a._gate_excluded = self._gate_excluded.copy()
+        a._markers = list(self._markers)
         return a
 
     @property
     def gate_included(self):
+        self._evaluate()
         return ~self._gate_excluded.copy()
 
     @property
     def gate_excluded(self):
+        self._evaluate()
         return self._gate_excluded.copy()
 
     def _get_fdata(self, field):
@@ -333,6 +353,76 @@ class GateFilter(object):
         self._radar.check_field_exists(field)
         return self._radar.fields[field]['data']
 
+    def _field_marker(self, field, func):
+        """ Return a marker which applies func to the data in a field. """
+        fdata = self._get_fdata(field)
+        return lambda rays: func(fdata[rays])
+
+    def _ray_marker(self, rays_marked):
+        """ Return a marker which marks all gates in the marked rays. """
+        ngates = self._gate_excluded.shape[1]
+        return lambda rays: np.repeat(
+            rays_marked[rays, np.newaxis], ngates, axis=1)
+
+    def _transition_rays(self, trans_value):
+        """ Return the rays with a given antenna transition value. """
+        if self._radar.antenna_transition is None:
+            return None
+        transition_data = self._radar.antenna_transition['data']
+        return np.asarray(transition_data == trans_value, dtype=np.bool)
+
+    def _add_marker(self, marker, op, exclude_masked):
+        """ Merge or record the gates marked by a marker. """
+        if exclude_masked not in [True, False]:
+            raise ValueError("exclude_masked must be 'True' or 'False'")
+        if op not in ['or', 'and', 'new']:
+            raise ValueError("invalid 'op' parameter: ", op)
+        if not self._packed:
+            return self._merge(marker(slice(None)), op, exclude_masked)
+
+        # evaluate the marker now so that the recorded condition does not
+        # depend on the field data at the time the filter is accessed.
+        nrays, ngates = self._gate_excluded.shape
+        packed = np.empty((nrays, (ngates + 7) // 8), dtype=np.uint8)
+        for rays in self._iter_rays():
+            marked = np.ma.filled(marker(rays), exclude_masked)
+            packed[rays] = np.packbits(marked, axis=1)
+        if op == 'new':
+            # the previous conditions no longer affect the excluded gates
+            self._markers = []
+        self._markers.append((packed, op))
+        return
+
+    def _evaluate(self):
+        """ Merge all recorded markers with the excluded gates. """
+        if len(self._markers) == 0:
+            return
+        ngates = self._gate_excluded.shape[1]
+        gate_excluded = self._gate_excluded.copy()
+        for rays in self._iter_rays():
+            excluded = gate_excluded[rays]
+            for packed, op in self._markers:
+                marked = np.unpackbits(
+                    packed[rays], axis=1)[:, :ngates].view(np.bool_)
+                if op == 'or':
+                    excluded = np.logical_or(excluded, marked)
+                elif op == 'and':
+                    excluded = np.logical_and(excluded, marked)
+                else:
+                    excluded = marked
+            gate_excluded[rays] = excluded
+        self._gate_excluded = gate_excluded
+        self._markers = []
+        return
+
+    def _iter_rays(self):
+        """ Return slices of rays, one for each sweep, covering all rays. """
+        nrays = self._gate_excluded.shape[0]
+        starts = self._radar.sweep_start_ray_index['data']
+        bounds = np.union1d([0, nrays], starts[starts < nrays])
+        return [slice(start, end) for start, end in
+                zip(bounds[:-1], bounds[1:])]
+
     def _merge(self, marked, op, exclude_masked):
         """ Merge an array of marked gates with the exclude array. """
         # exclude masked elements in marked by replacing them with the value
@@ -393,12 +483,11 @@ class GateFilter(object):
             or invalid.
 
         """
-        marked = np.zeros_like(self._gate_excluded)
-        if self._radar.antenna_transition is not None:
-            transition_data = self._radar.antenna_transition['data']
-            in_transition = transition_data == trans_value
-            marked[in_transition] = True
-        return self._merge(marked, op, exclude_masked)
+        in_transition = self._transition_rays(trans_value)
+        if in_transition is None:
+            in_transition = np.zeros(self._gate_excluded.shape[0], np.bool)
+        marker = self._ray_marker(in_transition)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_below(self, field, value, exclude_masked=True, op='or',
                       inclusive=False):
@@ -434,75 +523,79 @@ class GateFilter(object):
 
         """
         if inclusive:
-            marked = self._get_fdata(field) <= value
+            marker = self._field_marker(field, lambda fdata: fdata <= value)
         else:
-            marked = self._get_fdata(field) < value
-        return self._merge(marked, op, exclude_masked)
+            marker = self._field_marker(field, lambda fdata: fdata < value)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_above(self, field, value, exclude_masked=True, op='or',
                       inclusive=False):
         """ Exclude gates where a given field is above a given value. """
         if inclusive:
-            marked = self._get_fdata(field) >= value
+            marker = self._field_marker(field, lambda fdata: fdata >= value)
         else:
-            marked = self._get_fdata(field) > value
-        return self._merge(marked, op, exclude_masked)
+            marker = self._field_marker(field, lambda fdata: fdata > value)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_inside(self, field, v1, v2, exclude_masked=True, op='or',
                        inclusive=True):
         """ Exclude gates where a given field is inside a given interval. """
         if v2 < v1:
             (v1, v2) = (v2, v1)
-        fdata = self._get_fdata(field)
         if inclusive:
-            marked = (fdata >= v1) & (fdata <= v2)
+            marker = self._field_marker(
+                field, lambda fdata: (fdata >= v1) & (fdata <= v2))
         else:
-            marked = (fdata > v1) & (fdata < v2)
-        return self._merge(marked, op, exclude_masked)
+            marker = self._field_marker(
+                field, lambda fdata: (fdata > v1) & (fdata < v2))
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_outside(self, field, v1, v2, exclude_masked=True, op='or',
                         inclusive=False):
         """ Exclude gates where a given field is outside a given interval. """
         if v2 < v1:
             (v1, v2) = (v2, v1)
-        fdata = self._get_fdata(field)
         if inclusive:
-            marked = (fdata <= v1) | (fdata >= v2)
+            marker = self._field_marker(
+                field, lambda fdata: (fdata <= v1) | (fdata >= v2))
         else:
-            marked = (fdata < v1) | (fdata > v2)
-        return self._merge(marked, op, exclude_masked)
+            marker = self._field_marker(
+                field, lambda fdata: (fdata < v1) | (fdata > v2))
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_equal(self, field, value, exclude_masked=True, op='or'):
         """ Exclude gates where a given field is equal to a value. """
-        marked = (self._get_fdata(field) == value)
-        return self._merge(marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: fdata == value)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_not_equal(self, field, value, exclude_masked=True, op='or'):
         """ Exclude gates where a given field is not equal to a value. """
-        marked = (self._get_fdata(field) != value)
-        return self._merge(marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: fdata != value)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_all(self):
         """ Exclude all gates. """
+        self._markers = []
         self._gate_excluded = np.ones_like(self._gate_excluded)
         return
 
     def exclude_none(self):
         """ Exclude no gates, include all gates. """
+        self._markers = []
         self._gate_excluded = np.zeros_like(self._gate_excluded)
         return
 
     def exclude_masked(self, field, exclude_masked=True, op='or'):
         """ Exclude gates where a given field is masked. """
-        marked = np.ma.getmaskarray(self._get_fdata(field))
-        return self._merge(marked, op, exclude_masked)
+        marker = self._field_marker(field, np.ma.getmaskarray)
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_invalid(self, field, exclude_masked=True, op='or'):
         """
         Exclude gates where an invalid value occurs in a field (NaNs or infs).
         """
-        marked = ~np.isfinite(self._get_fdata(field))
-        return self._merge(marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: ~np.isfinite(fdata))
+        return self._add_marker(marker, op, exclude_masked)
 
     def exclude_gates(self, mask, exclude_masked=True, op='or'):
         """
@@ -535,7 +628,7 @@ class GateFilter(object):
         if mask.shape != fdata.shape:
             raise ValueError("mask array must be the same size as a field.")
         marked = np.array(mask, dtype='bool')
-        return self._merge(marked, op, exclude_masked)
+        return self._add_marker(lambda rays: marked[rays], op, exclude_masked)
 
     ####################
     # include_ methods #
@@ -576,86 +669,88 @@ class GateFilter(object):
             gates which have previously been included.
 
         """
-        if self._radar.antenna_transition is None:
-            include = np.ones_like(self._gate_excluded)  # include all gates
-        else:
-            include = np.zeros_like(self._gate_excluded)
-            transition_data = self._radar.antenna_transition['data']
-            not_in_transition = (transition_data == trans_value)
-            include[not_in_transition] = True
-        return self._merge(~include, op, exclude_masked)
+        not_in_transition = self._transition_rays(trans_value)
+        if not_in_transition is None:
+            # include all gates
+            not_in_transition = np.ones(self._gate_excluded.shape[0], np.bool)
+        marker = self._ray_marker(~not_in_transition)
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_below(self, field, value, exclude_masked=True, op='and',
                       inclusive=False):
         """ Include gates where a given field is below a given value. """
         if inclusive:
-            marked = self._get_fdata(field) <= value
+            marker = self._field_marker(field, lambda fdata: ~(fdata <= value))
         else:
-            marked = self._get_fdata(field) < value
-        self._merge(~marked, op, exclude_masked)
+            marker = self._field_marker(field, lambda fdata: ~(fdata < value))
+        self._add_marker(marker, op, exclude_masked)
 
     def include_above(self, field, value, exclude_masked=True, op='and',
                       inclusive=False):
         """ Include gates where a given field is above a given value. """
         if inclusive:
-            marked = self._get_fdata(field) >= value
+            marker = self._field_marker(field, lambda fdata: ~(fdata >= value))
         else:
-            marked = self._get_fdata(field) > value
-        self._merge(~marked, op, exclude_masked)
+            marker = self._field_marker(field, lambda fdata: ~(fdata > value))
+        self._add_marker(marker, op, exclude_masked)
 
     def include_inside(self, field, v1, v2, exclude_masked=True, op='and',
                        inclusive=True):
         """ Include gates where a given field is inside a given interval. """
         if v2 < v1:
             (v1, v2) = (v2, v1)
-        fdata = self._get_fdata(field)
         if inclusive:
-            marked = (fdata >= v1) & (fdata <= v2)
+            marker = self._field_marker(
+                field, lambda fdata: ~((fdata >= v1) & (fdata <= v2)))
         else:
-            marked = (fdata > v1) & (fdata < v2)
-        return self._merge(~marked, op, exclude_masked)
+            marker = self._field_marker(
+                field, lambda fdata: ~((fdata > v1) & (fdata < v2)))
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_outside(self, field, v1, v2, exclude_masked=True, op='and',
                         inclusive=False):
         """ Include gates where a given field is outside a given interval. """
         if v2 < v1:
             (v1, v2) = (v2, v1)
-        fdata = self._get_fdata(field)
         if inclusive:
-            marked = (fdata <= v1) | (fdata >= v2)
+            marker = self._field_marker(
+                field, lambda fdata: ~((fdata <= v1) | (fdata >= v2)))
         else:
-            marked = (fdata < v1) | (fdata > v2)
-        return self._merge(~marked, op, exclude_masked)
+            marker = self._field_marker(
+                field, lambda fdata: ~((fdata < v1) | (fdata > v2)))
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_equal(self, field, value, exclude_masked=True, op='and'):
         """ Include gates where a given field is equal to a value. """
-        marked = (self._get_fdata(field) == value)
-        return self._merge(~marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: ~(fdata == value))
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_not_equal(self, field, value, exclude_masked=True, op='and'):
         """ Include gates where a given field is not equal to a value. """
-        marked = (self._get_fdata(field) != value)
-        return self._merge(~marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: ~(fdata != value))
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_all(self):
         """ Include all gates. """
+        self._markers = []
         self._gate_excluded = np.zeros_like(self._gate_excluded)
 
     def include_none(self):
         """ Include no gates, exclude all gates. """
+        self._markers = []
         self._gate_excluded = np.ones_like(self._gate_excluded)
 
     def include_not_masked(self, field, exclude_masked=True, op='and'):
         """ Include gates where a given field in not masked. """
-        marked = np.ma.getmaskarray(self._get_fdata(field))
-        return self._merge(marked, op, exclude_masked)
+        marker = self._field_marker(field, np.ma.getmaskarray)
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_valid(self, field, exclude_masked=True, op='and'):
         """
         Include gates where a valid value occurs in a field (not NaN or inf).
         """
-        marked = np.isfinite(self._get_fdata(field))
-        return self._merge(~marked, op, exclude_masked)
+        marker = self._field_marker(field, lambda fdata: ~np.isfinite(fdata))
+        return self._add_marker(marker, op, exclude_masked)
 
     def include_gates(self, mask, exclude_masked=True, op='and'):
         """
@@ -687,4 +782,4 @@ class GateFilter(object):
         if mask.shape != fdata.shape:
             raise ValueError("Mask array must be the same size as a field.")
         marked = ~np.array(mask, dtype='bool')
-        return self._merge(marked, op, exclude_masked)
+        return self._add_marker(lambda rays: marked[rays], op, exclude_masked)
@@ -1,5 +1,7 @@
 """ Unit tests for Py-ART's correct/filters.py module. """
 
+import pickle
+
 import numpy as np
 from numpy.testing import assert_raises
 
@@ -396,3 +398,81 @@ def test_gatefilter_include_gates():
     assert gfilter.gate_included[2, 0] is np.False_
     assert gfilter.gate_included[0, 2] is np.False_
     assert gfilter.gate_included[2, 2] is np.True_
+
+
+################
+# packed tests #
+################
+
+
+def _build_filter(gfilter):
+    """ Apply a chain of conditions to a gate filter. """
+    gfilter.exclude_transition()
+    gfilter.exclude_below('test_field2', 2)
+    gfilter.exclude_above('test_field', 8, inclusive=True)
+    gfilter.exclude_masked('test_field2')
+    gfilter.exclude_invalid('test_field2')
+    gfilter.include_inside('test_field2', 3, 5, op='or')
+    gfilter.exclude_equal('test_field', 4, op='and')
+    return gfilter
+
+
+def test_gatefilter_packed():
+    multi_sweep_radar = pyart.testing.make_empty_ppi_radar(10, 12, 3)
+    multi_sweep_radar.fields = radar.fields
+    multi_sweep_radar.antenna_transition = {
+        'data': np.zeros(36, dtype='int32')}
+    multi_sweep_radar.antenna_transition['data'][[0, 12, 13]] = 1
+
+    gfilter = _build_filter(pyart.correct.GateFilter(multi_sweep_radar))
+    packed_gfilter = _build_filter(
+        pyart.correct.GateFilter(multi_sweep_radar, packed=True))
+    assert len(packed_gfilter._markers) == 7
+    packed_gfilter2 = packed_gfilter.copy()
+    assert np.array_equal(packed_gfilter.gate_excluded, gfilter.gate_excluded)
+    assert np.array_equal(packed_gfilter.gate_included, gfilter.gate_included)
+    assert len(packed_gfilter._markers) == 0
+    assert np.array_equal(packed_gfilter2.gate_excluded, gfilter.gate_excluded)
+
+    # conditions added after evaluation
+    gfilter.exclude_below('test_field', 2, op='new')
+    packed_gfilter.exclude_below('test_field', 2, op='new')
+    assert len(packed_gfilter._markers) == 1
+    assert np.array_equal(packed_gfilter.gate_excluded, gfilter.gate_excluded)
+    packed_gfilter.exclude_below('test_field', 5)
+    packed_gfilter.exclude_all()
+    assert len(packed_gfilter._markers) == 0
+    assert np.all(packed_gfilter.gate_excluded)
+
+
+def test_gatefilter_packed_raises():
+    gfilter = pyart.correct.GateFilter(radar, packed=True)
+    assert_raises(ValueError, gfilter.exclude_below, 'test_field', 0.5,
+                  op='fuzz')
+    assert_raises(ValueError, gfilter.exclude_below, 'test_field', 0.5,
+                  exclude_masked='fuzz')
+    assert_raises(KeyError, gfilter.exclude_below, 'missing_field', 0.5)
+    assert len(gfilter._markers) == 0
+
+
+def test_gatefilter_packed_field_changed():
+    packed_radar = pyart.testing.make_empty_ppi_radar(10, 12, 3)
+    packed_radar.add_field('test_field', {'data': fdata.copy()})
+    gfilter = pyart.correct.GateFilter(packed_radar)
+    packed_gfilter = pyart.correct.GateFilter(packed_radar, packed=True)
+    for gf in (gfilter, packed_gfilter):
+        gf.exclude_below('test_field', 5)
+        gf.exclude_above('test_field', 8)
+
+    # changes made after the conditions are set do not affect the filter
+    packed_radar.fields['test_field']['data'][:] = 0.
+    assert np.array_equal(packed_gfilter.gate_excluded, gfilter.gate_excluded)
+    assert np.sum(packed_gfilter.gate_excluded) == 36 * 6
+
+
+def test_gatefilter_packed_pickle():
+    gfilter = _build_filter(pyart.correct.GateFilter(radar))
+    packed_gfilter = _build_filter(pyart.correct.GateFilter(radar, packed=True))
+    packed_gfilter2 = pickle.loads(pickle.dumps(packed_gfilter))
+    assert len(packed_gfilter2._markers) == 7
+    assert np.array_equal(packed_gfilter2.gate_excluded, gfilter.gate_excluded)
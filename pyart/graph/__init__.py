@@ -28,12 +28,43 @@ Plotting grid data
 
 """
 
-from .radardisplay import RadarDisplay
+import sys as _sys
+
 from . import cm
 from . import cm_colorblind
-from .radardisplay_airborne import AirborneRadarDisplay
-from .gridmapdisplay import GridMapDisplay
-from .radarmapdisplay import RadarMapDisplay
-from .radarmapdisplay_cartopy import RadarMapDisplayCartopy
 
-__all__ = [s for s in dir() if not s.startswith('_')]
+# import the display classes, on Python 3.7 and later these are imported when
+# first accessed (PEP 562) so that the colormaps can be registered with
+# matplotlib without importing matplotlib.pyplot, basemap or cartopy.
+_DISPLAYS = {
+    'RadarDisplay': 'radardisplay',
+    'AirborneRadarDisplay': 'radardisplay_airborne',
+    'GridMapDisplay': 'gridmapdisplay',
+    'RadarMapDisplay': 'radarmapdisplay',
+    'RadarMapDisplayCartopy': 'radarmapdisplay_cartopy'}
+_SUBMODULES = ('common', ) + tuple(_DISPLAYS.values())
+
+if _sys.version_info >= (3, 7):
+    import importlib as _importlib
+
+    def __getattr__(name):
+        """ Import display classes and modules on first access. """
+        if name in _DISPLAYS:
+            module = _importlib.import_module('.' + _DISPLAYS[name], __name__)
+            return getattr(module, name)
+        if name in _SUBMODULES:
+            return _importlib.import_module('.' + name, __name__)
+        raise AttributeError(
+            "module '%s' has no attribute '%s'" % (__name__, name))
+
+    def __dir__():
+        """ List module attributes including unimported displays. """
+        return sorted(set(globals()) | set(_DISPLAYS) | set(_SUBMODULES))
+else:
+    from .radardisplay import RadarDisplay
+    from .radardisplay_airborne import AirborneRadarDisplay
+    from .gridmapdisplay import GridMapDisplay
+    from .radarmapdisplay import RadarMapDisplay
+    from .radarmapdisplay_cartopy import RadarMapDisplayCartopy
+
+__all__ = ['cm', 'cm_colorblind'] + sorted(_DISPLAYS)
@@ -63,6 +63,7 @@ colormaps are available within matplotlib with names 'pyart_COLORMAP':
 from __future__ import print_function, division
 
 import matplotlib as mpl
+import matplotlib.cm
 import matplotlib.colors as colors
 from ._cm import datad
 
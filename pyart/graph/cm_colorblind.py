@@ -16,6 +16,7 @@ colormaps are available within matplotlib with names pyart_COLORMAP':
 """
 
 import matplotlib as mpl
+import matplotlib.cm
 import matplotlib.colors as colors
 
 from .cm import _reverser, revcmap, _reverse_cmap_spec
@@ -19,12 +19,14 @@ for the format in question should be used.
     :toctree: generated/
 
     read
+    read_batch
     read_rsl
     read_mdv
     read_sigmet
     read_cfradial
     read_chl
     read_nexrad_archive
+    NEXRADArchiveChunkReader
     read_nexrad_cdm
     read_nexrad_level3
     read_uf
@@ -81,14 +83,14 @@ from .mdv_radar import read_mdv
 from .sigmet import read_sigmet
 from .chl import read_chl
 from .cfradial import read_cfradial, write_cfradial
-from .nexrad_archive import read_nexrad_archive
+from .nexrad_archive import read_nexrad_archive, NEXRADArchiveChunkReader
 from .nexrad_cdm import read_nexrad_cdm
 from .nexradl3_read import read_nexrad_level3
 from .uf import read_uf
 from .uf_write import write_uf
 from .grid_io import read_grid, write_grid
 from .output_to_geotiff import write_grid_geotiff
-from .auto_read import read
+from .auto_read import read, read_batch
 from .mdv_grid import write_grid_mdv, read_grid_mdv
 from .common import prepare_for_read
 from .arm_sonde import read_arm_sonde_vap, read_arm_sonde
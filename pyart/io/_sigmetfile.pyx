@@ -67,11 +67,14 @@ cdef class SigmetFile:
     _raw_product_bhdrs : list
         List of raw_product_bhdr structure dictionaries seperated by sweep.
         None when data has not yet been read.
+    _lead_bhdr : bytes
+        The raw_prod_bhdr of the next sweep's first record when it has been
+        read while skipping a sweep, otherwise an empty string.
 
     """
     cdef public debug, product_hdr, ingest_header, ingest_data_headers, \
         data_types, data_type_names, ndata_types,
-    cdef public _fh, _raw_product_bhdrs
+    cdef public _fh, _raw_product_bhdrs, _lead_bhdr
 
     cdef np.ndarray _rbuf
     cdef np.int16_t * _rbuf_p   # hack for fast indexing of _rbuf
@@ -102,6 +105,7 @@ cdef class SigmetFile:
         self._fh = fh
         self._record_number = 2
         self._raw_product_bhdrs = []
+        self._lead_bhdr = b''
 
     def _determine_data_types(self):
         """ Determine the available data types in the file. """
@@ -118,9 +122,9 @@ cdef class SigmetFile:
         """ Close the file. """
         self._fh.close()
 
-    def read_data(self, full_xhdr=False):
+    def read_data(self, full_xhdr=False, sweeps=None, data_type_names=None):
         """
-        Read all data from the file.
+        Read data from the file.
 
         Parameters
         ----------
@@ -129,32 +133,58 @@ cdef class SigmetFile:
             ones.  False will return a length 1 extended header converted to
             int32.  This is useful when the file contains a customer specified
             extended header (for example aircraft radar).
+        sweeps : list of int or None
+            Sweeps (0-based) to read.  The records of other sweeps are skipped
+            without being decoded.  None reads all sweeps.
+        data_type_names : list of str or None
+            Names of the data types to read.  The data of other data types is
+            not decompressed or converted.  None reads all data types.
 
         Returns
         -------
         data : dict of ndarrays
-            Data arrays of shape=(nsweeps, nrays, nbins) for each data type.
-            Indexed by data type name (str).
+            Data arrays of shape=(nsweeps, nrays, nbins) for each data type
+            read, nsweeps is the number of sweeps read.  Indexed by data type
+            name (str).
         metadata : dict of dicts
             Arrays of 'azimuth_0', 'azimuth_1', 'elevation_0', 'elevation_1',
-            'nbins', and 'time' for each data type.  Indexed by data type name
-            (str).  Rays which were not collected are marked with a value of
-            -1 in the 'nbins' array.
+            'nbins', and 'time' for each data type in the file, including
+            data types which are not read.  Indexed by data type name (str).
+            Rays which were not collected are marked with a value of -1 in
+            the 'nbins' array.
 
         """
 
         # determine size of data
-        nsweeps = self.ingest_header['task_configuration'][
+        nsweeps_file = self.ingest_header['task_configuration'][
             'task_scan_info']['number_sweeps']
         nbins = self.product_hdr['product_end']['number_bins']
         nrays = self.ingest_header['ingest_configuration'][
             'number_rays_sweep']
 
+        # determine the sweeps and data types to read
+        if sweeps is None:
+            sweeps = list(range(nsweeps_file))
+        else:
+            sweeps = sorted(set(sweeps))
+            if len(sweeps) == 0:
+                raise ValueError('No sweeps selected')
+            if sweeps[0] < 0 or sweeps[-1] >= nsweeps_file:
+                raise ValueError(
+                    'Invalid sweeps, file contains %i sweeps' % nsweeps_file)
+        nsweeps = len(sweeps)
+        if data_type_names is None:
+            read_names = list(self.data_type_names)
+        else:
+            read_names = [name for name in self.data_type_names
+                          if name in data_type_names]
+        selected = [name in read_names for name in self.data_type_names]
+
         # create empty outputs
         shape = (nsweeps, nrays, nbins)
         data = dict([(name, np.ma.empty(shape, dtype='float32'))
-                    for name in self.data_type_names])
-        if 'XHDR' in self.data_type_names:
+                    for name in read_names])
+        if 'XHDR' in read_names:
             if full_xhdr:
                 data['XHDR'] = np.ones(shape, dtype='int16')
             else:
@@ -177,10 +207,17 @@ cdef class SigmetFile:
 
         self._raw_product_bhdrs = []
 
-        # read in data sweep by sweep
-        for i in xrange(nsweeps):
-            ingest_data_hdrs, sweep_data, sweep_metadata = self._get_sweep(
-                full_xhdr=full_xhdr)
+        # read in data sweep by sweep, skipping the unselected sweeps
+        i = 0
+        for file_sweep in xrange(sweeps[-1] + 1):
+            if file_sweep != sweeps[i]:
+                if self._skip_sweep():
+                    ingest_data_hdrs = None
+                else:
+                    continue
+            else:
+                ingest_data_hdrs, sweep_data, sweep_metadata = (
+                    self._get_sweep(full_xhdr=full_xhdr, selected=selected))
 
             # check for a truncated file, return sweep(s) read up until error
             if ingest_data_hdrs is None:
@@ -189,8 +226,9 @@ cdef class SigmetFile:
                         (i, nsweeps))
                 warnings.warn(mess)
 
-                for name in self.data_type_names:
+                for name in read_names:
                     data[name] = data[name][:i]
+                for name in self.data_type_names:
                     for k in metadata[name]:
                         metadata[name][k] = metadata[name][k][:i]
                 return data, metadata
@@ -199,7 +237,8 @@ cdef class SigmetFile:
                 temp = sweep_metadata[j]
                 (az0, el0, az1, el1, ray_nbins, ray_time, prf_flag) = temp
 
-                data[name][i] = sweep_data[j]
+                if selected[j]:
+                    data[name][i] = sweep_data[j]
                 metadata[name]['azimuth_0'][i] = az0
                 metadata[name]['azimuth_1'][i] = az1
                 metadata[name]['elevation_0'][i] = el0
@@ -208,12 +247,13 @@ cdef class SigmetFile:
                 metadata[name]['time'][i] = ray_time
                 metadata[name]['prf_flag'][i] = prf_flag
                 self.ingest_data_headers[name].append(ingest_data_hdrs[j])
+            i += 1
 
         # scale 1-byte velocity by the Nyquist (section 4.3.29)
         # this conversion is kept in this method so that the
         # product_hdr does not need to be accessed at lower abstraction
         # layers.
-        if 'VEL' in self.data_type_names:
+        if 'VEL' in data:
             wavelength_cm = self.product_hdr['product_end']['wavelength']
             prt_value = 1. / self.product_hdr['product_end']['prf']
             task_config = self.ingest_header['task_configuration']
@@ -225,7 +265,7 @@ cdef class SigmetFile:
             nyquist = wavelength_cm / (10000.0 * 4.0 * prt_value) * multiplier
             data['VEL'] *= nyquist
         # scale 1-byte width by the Nyquist
-        if 'WIDTH' in self.data_type_names:
+        if 'WIDTH' in data:
             # The IRIS Programmer's Manual indicates 1-byte width format data
             # should be scaled by the unambiguous velocity, twice the nyquist,
             # (section 4.3.35) but both RSL and RadX scale this data by the
@@ -238,7 +278,31 @@ cdef class SigmetFile:
 
         return data, metadata
 
-    def _get_sweep(self, full_xhdr=False, raw_data=False):
+    def _skip_sweep(self):
+        """
+        Skip over the records of the next sweep without decoding them.
+
+        Only the raw_prod_bhdr at the start of each record is read.  Returns
+        -1 if the file ends before the next sweep, 0 on success.
+        """
+        bhdr = self._lead_bhdr + self._fh.read(12 - len(self._lead_bhdr))
+        self._lead_bhdr = b''
+        if len(bhdr) != 12:
+            return -1
+        sweep_number = _unpack_raw_prod_bhdr(bhdr)['sweep_number']
+
+        # the first record with a different sweep number starts the next
+        # sweep, keep its raw_prod_bhdr for the next read.
+        while _unpack_raw_prod_bhdr(bhdr)['sweep_number'] == sweep_number:
+            self._fh.seek(RECORD_SIZE - 12, 1)
+            self._record_number += 1
+            bhdr = self._fh.read(12)
+            if len(bhdr) != 12:
+                return -1
+        self._lead_bhdr = bhdr
+        return 0
+
+    def _get_sweep(self, full_xhdr=False, raw_data=False, selected=None):
         """
         Get the data and metadata from the next sweep.
 
@@ -254,6 +318,10 @@ cdef class SigmetFile:
         raw_data : bool, optional
             True to return the raw_data for the given sweep, False to
             convert the data to floating point representation.
+        selected : list of bool or None, optional
+            Flags indicating which data types, in the order they appear in the
+            file, should be read.  Only the ray headers of the other data
+            types are decompressed.  None reads all data types.
 
         Returns
         -------
@@ -261,14 +329,18 @@ cdef class SigmetFile:
             List of ingest_data_header structures for each data type.
         sweep_data : list of arrays
             Sweep data for each data types in the order they appear in the
-            file.
+            file.  None for the data types which are not read.
         sweep_metadata : list of tuples
             Sweep metadata for each data type in the same order as sweep_data.
 
         """
+        if selected is None or raw_data:
+            selected = [True] * self.ndata_types
 
         # get the next record
-        lead_record = self._fh.read(RECORD_SIZE)
+        lead_record = self._lead_bhdr + self._fh.read(
+            RECORD_SIZE - len(self._lead_bhdr))
+        self._lead_bhdr = b''
         self._record_number += 1
 
         # check if the file ended early, if so return Nones
@@ -293,34 +365,49 @@ cdef class SigmetFile:
         self._rbuf = np.frombuffer(lead_record, dtype='int16')
         self._rbuf_p = <np.int16_t*>self._rbuf.data
         self._rbuf_pos = int((12 + 76 * self.ndata_types) / 2) - 1
-        # set data initially to ones so that missing data can be better
-        # seen when debugging
-        raw_sweep_data = np.ones((nrays, nbins + 6), dtype='int16')
+        # rays of the data types are interleaved, only the ray headers are
+        # stored for data types which are not read.  Set data initially to
+        # ones so that missing data can be better seen when debugging
+        raw_type_data = []
+        for i in range(self.ndata_types):
+            nrays_type = len(range(i, nrays, self.ndata_types))
+            if selected[i]:
+                ray_words = nbins + 6
+            else:
+                ray_words = 6
+            raw_type_data.append(
+                np.ones((nrays_type, ray_words), dtype='int16'))
 
         # get the raw data ray-by-ray
         for ray_i in xrange(nrays):
             if self.debug:
                 print("Reading ray: %i of %i" % (ray_i, nrays), end='')
                 print("self._rbuf_pos is", self._rbuf_pos)
-            if self._get_ray(nbins, raw_sweep_data[ray_i]):
+            out = raw_type_data[ray_i % self.ndata_types][
+                ray_i // self.ndata_types]
+            if self._get_ray(nbins, out):
                 return None, None, None
 
         # return raw data if requested
         if raw_data:
+            raw_sweep_data = np.empty((nrays, nbins + 6), dtype='int16')
+            for i in range(self.ndata_types):
+                raw_sweep_data[i::self.ndata_types] = raw_type_data[i]
             return ingest_data_headers, raw_sweep_data
 
         # convert the data and parse the metadata
         sweep_data = []
         sweep_metadata = []
         for i, data_type in enumerate(self.data_types):
-            if data_type == 0 and full_xhdr:
-                sweep_data.append(raw_sweep_data[i::self.ndata_types, 6:])
+            raw_data_type = raw_type_data[i]
+            if not selected[i]:
+                sweep_data.append(None)
+            elif data_type == 0 and full_xhdr:
+                sweep_data.append(raw_data_type[:, 6:])
             else:
                 sweep_data.append(convert_sigmet_data(
-                    data_type, raw_sweep_data[i::self.ndata_types, 6:],
-                    raw_sweep_data[i::self.ndata_types, 4]))
-            sweep_metadata.append(_parse_ray_headers(
-                raw_sweep_data[i::self.ndata_types, :6]))
+                    data_type, raw_data_type[:, 6:], raw_data_type[:, 4]))
+            sweep_metadata.append(_parse_ray_headers(raw_data_type[:, :6]))
         return ingest_data_headers, sweep_data, sweep_metadata
 
     @cython.wraparound(False)
@@ -333,7 +420,9 @@ cdef class SigmetFile:
         nbins : int
             Number of bins in the ray.
         out : ndarray
-            Array to load ray data into.
+            Array to load ray data into.  Words of the ray beyond the length
+            of this array are decompressed but not stored, allowing only the
+            ray header to be read.
 
         Returns
         -------
@@ -343,6 +432,7 @@ cdef class SigmetFile:
         """
         cdef short compression_code
         cdef int words, remain, out_pos, first_end, i
+        cdef int nout = out.shape[0]
 
         if self._incr_rbuf_pos():
             return -1   # failed read
@@ -362,7 +452,7 @@ cdef class SigmetFile:
                 words = compression_code + 32768    # last 7 bits give size
                 if self._rbuf_pos + words <= 3072:
                     # all compressed data is in the current record
-                    for i in range(words):
+                    for i in range(min(words, nout - out_pos)):
                         out[out_pos + i] = self._rbuf_p[self._rbuf_pos + i]
                     if self._incr_rbuf_pos(words):
                         return -1   # failed read
@@ -372,12 +462,12 @@ cdef class SigmetFile:
                     # store data from current record
                     remain = words - (3072 - self._rbuf_pos)
                     first_end = out_pos + words - remain
-                    for i in range(first_end - out_pos):
+                    for i in range(min(first_end, nout) - out_pos):
                         out[out_pos + i] = self._rbuf_p[self._rbuf_pos + i]
 
                     # read data from next record and store
                     self._load_record()
-                    for i in range(out_pos + words - first_end):
+                    for i in range(min(out_pos + words, nout) - first_end):
                         out[first_end + i] = self._rbuf_p[self._rbuf_pos + i]
 
                     if self._incr_rbuf_pos(remain):
@@ -387,7 +477,7 @@ cdef class SigmetFile:
                 # add zeros to out
                 if compression_code + out_pos > nbins + 6:
                     return -1   # file is corrupt
-                for i in range(compression_code):
+                for i in range(min(compression_code, nout - out_pos)):
                     out[out_pos + i] = 0
                 out_pos += compression_code
             compression_code = self._rbuf_p[self._rbuf_pos]
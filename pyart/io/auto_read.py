@@ -8,12 +8,18 @@ Automatic reading of radar files by detecting format.
     :toctree: generated/
 
     read
+    read_batch
     determine_filetype
+    _read_batch_results
+    _read_batch_file
 
 """
 
 import bz2
+import glob
 import gzip
+import multiprocessing
+import threading
 
 import netCDF4
 
@@ -26,6 +32,7 @@ from .nexrad_cdm import read_nexrad_cdm
 from .nexradl3_read import read_nexrad_level3
 from .uf import read_uf
 from .chl import read_chl
+from ..lazydict import LazyLoadDict
 
 
 def read(filename, use_rsl=False, **kwargs):
@@ -146,6 +153,106 @@ def read(filename, use_rsl=False, **kwargs):
     raise TypeError('Unknown or unsupported file format: ' + filetype)
 
 
+def read_batch(filenames, use_rsl=False, nprocesses=None, ordered=True,
+               max_in_flight=None, **kwargs):
+    """
+    Read a number of radar files using a pool of processes.
+
+    Each file is read by :py:func:`read` in a worker process, the radar
+    objects are returned to this process as they are read.  Additional
+    parameters are passed to the underlying read_* function.
+
+    Parameters
+    ----------
+    filenames : list or str
+        Names of the radar files to read.  A string is treated as a glob
+        pattern, the matching files are read in sorted order.
+    use_rsl : bool
+        True will use the TRMM RSL library to read files which are supported
+        both natively and by RSL.  See :py:func:`read`.
+    nprocesses : int or None
+        Number of worker processes, None will use the number of CPUs.
+    ordered : bool
+        True to return the radars in the order the files are given, False to
+        return them as soon as each file is read.
+    max_in_flight : int or None
+        Maximum number of files which are being read or have been read but
+        not yet returned.  This bounds the memory used when reading is faster
+        than the radars are consumed.  None will use twice the number of
+        processes.
+
+    Other Parameters
+    ----------------
+    field_names, additional_metadata, file_field_names, exclude_fields :
+        See :py:func:`read`.
+    delay_field_loading : bool
+        Passed to the reader, field data which is not loaded when the file is
+        read is loaded in the worker process before the radar is returned.
+
+    Returns
+    -------
+    results : generator
+        Generator of (filename, radar) tuples.  When a file could not be read
+        the exception raised by the reader takes the place of the radar.
+
+    """
+    if isinstance(filenames, str):
+        filenames = sorted(glob.glob(filenames))
+    if nprocesses is None:
+        nprocesses = multiprocessing.cpu_count()
+    if max_in_flight is None:
+        max_in_flight = 2 * nprocesses
+    if nprocesses < 1 or max_in_flight < 1:
+        raise ValueError('nprocesses and max_in_flight must be positive')
+    return _read_batch_results(
+        filenames, use_rsl, nprocesses, ordered, max_in_flight, kwargs)
+
+
+def _read_batch_results(filenames, use_rsl, nprocesses, ordered,
+                        max_in_flight, kwargs):
+    """ Generator which reads files in a pool of processes for read_batch. """
+    # the pool requests tasks from this generator, which blocks once
+    # max_in_flight files are being read or waiting to be returned
+    in_flight = threading.Semaphore(max_in_flight)
+    stopped = threading.Event()
+
+    def tasks():
+        for filename in filenames:
+            in_flight.acquire()
+            if stopped.is_set():
+                return
+            yield filename, use_rsl, kwargs
+
+    pool = multiprocessing.Pool(nprocesses)
+    try:
+        if ordered:
+            results = pool.imap(_read_batch_file, tasks())
+        else:
+            results = pool.imap_unordered(_read_batch_file, tasks())
+        for result in results:
+            in_flight.release()
+            yield result
+    finally:
+        # unblock the task generator so that the pool can be terminated
+        stopped.set()
+        in_flight.release()
+        pool.terminate()
+
+
+def _read_batch_file(task):
+    """ Read a single file for read_batch in a worker process. """
+    filename, use_rsl, kwargs = task
+    try:
+        radar = read(filename, use_rsl, **kwargs)
+    except Exception as error:
+        return filename, error
+    # lazy loaded fields cannot be returned from the worker
+    for field_name, field_dic in radar.fields.items():
+        if isinstance(field_dic, LazyLoadDict):
+            radar.fields[field_name] = dict(field_dic)
+    return filename, radar
+
+
 def determine_filetype(filename):
     """
     Return the filetype of a given file by examining the first few bytes.
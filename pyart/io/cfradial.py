@@ -9,6 +9,7 @@ Utilities for reading CF/Radial files.
     :template: dev_template.rst
 
     _NetCDFVariableDataExtractor
+    _NetCDFVariableGateDataExtractor
 
 .. autosummary::
     :toctree: generated/
@@ -18,12 +19,17 @@ Utilities for reading CF/Radial files.
     _find_all_meta_group_vars
     _ncvar_to_dict
     _unpack_variable_gate_field_dic
+    _unpack_variable_gate_data
+    _pack_variable_gate_data
+    _calculate_ray_n_gates
+    _apply_write_profile
     _create_ncvar
 
 """
 
 import getpass
 import datetime
+import collections
 import platform
 import warnings
 
@@ -68,6 +74,22 @@ _INSTRUMENT_PARAMS_DIMS = {
 }
 
 
+# Write profiles which control how field variables are created by
+# write_cfradial and write_grid.  Floating point fields are packed into the
+# integer type given by _Write_as_dtype.  Keys set in a field dictionary
+# take precedence over the keys in the profile.
+_WRITE_PROFILES = {
+    # no compression, fastest writing and reading
+    'fast': {'_Zlib': False},
+    # 16-bit packed integers, moderate compression
+    'archive': {'_Write_as_dtype': 'int16', '_Zlib': True,
+                '_DeflateLevel': 4, '_Shuffle': True},
+    # 8-bit packed integers, maximum compression
+    'compact': {'_Write_as_dtype': 'int8', '_Zlib': True,
+                '_DeflateLevel': 9, '_Shuffle': True},
+}
+
+
 def read_cfradial(filename, field_names=None, additional_metadata=None,
                   file_field_names=False, exclude_fields=None,
                   delay_field_loading=False, **kwargs):
@@ -97,9 +119,10 @@ def read_cfradial(filename, field_names=None, additional_metadata=None,
         True to delay loading of field data from the file until the 'data'
         key in a particular field dictionary is accessed.  In this case
         the field attribute of the returned Radar object will contain
-        LazyLoadDict objects not dict objects.  Delayed field loading will not
-        provide any speedup in file where the number of gates vary between
-        rays (ngates_vary=True) and is not recommended.
+        LazyLoadDict objects not dict objects.  While the data of a field
+        has not been loaded, :py:func:`Radar.get_field` and
+        :py:func:`Radar.extract_sweeps` read only the rays of the requested
+        sweeps from the file, the most recently read sweeps are cached.
 
     Returns
     -------
@@ -282,6 +305,11 @@ def read_cfradial(filename, field_names=None, additional_metadata=None,
         keys = [k for k, v in ncvars.items()
                 if v.dimensions == ('time', 'range')]
 
+    if 'ray_n_gates' in ncvars:
+        shape = (len(ncvars['time']), len(ncvars['range']))
+        ray_n_gates = ncvars['ray_n_gates'][:]
+        ray_start_index = ncvars['ray_start_index'][:]
+
     fields = {}
     for key in keys:
         field_name = filemetadata.get_field_name(key)
@@ -289,15 +317,13 @@ def read_cfradial(filename, field_names=None, additional_metadata=None,
             if exclude_fields is not None and key in exclude_fields:
                 continue
             field_name = key
-        fields[field_name] = _ncvar_to_dict(ncvars[key], delay_field_loading)
-
-    if 'ray_n_gates' in ncvars:
-        shape = (len(ncvars['time']), len(ncvars['range']))
-        ray_n_gates = ncvars['ray_n_gates'][:]
-        ray_start_index = ncvars['ray_start_index'][:]
-        for dic in fields.values():
-            _unpack_variable_gate_field_dic(
-                dic, shape, ray_n_gates, ray_start_index)
+        if 'ray_n_gates' in ncvars:
+            data_extractor = _NetCDFVariableGateDataExtractor(
+                ncvars[key], shape, ray_n_gates, ray_start_index)
+        else:
+            data_extractor = None
+        fields[field_name] = _ncvar_to_dict(
+            ncvars[key], delay_field_loading, data_extractor)
 
     # 4.5 instrument_parameters sub-convention -> instrument_parameters dict
     # 4.6 radar_parameters sub-convention -> instrument_parameters dict
@@ -342,12 +368,13 @@ def _find_all_meta_group_vars(ncvars, meta_group_name):
             v.meta_group == meta_group_name]
 
 
-def _ncvar_to_dict(ncvar, lazydict=False):
+def _ncvar_to_dict(ncvar, lazydict=False, data_extractor=None):
     """ Convert a NetCDF Dataset variable to a dictionary. """
     # copy all attribute except for scaling parameters
     d = dict((k, getattr(ncvar, k)) for k in ncvar.ncattrs()
              if k not in ['scale_factor', 'add_offset'])
-    data_extractor = _NetCDFVariableDataExtractor(ncvar)
+    if data_extractor is None:
+        data_extractor = _NetCDFVariableDataExtractor(ncvar)
     if lazydict:
         d = LazyLoadDict(d)
         d.set_lazy('data', data_extractor)
@@ -364,12 +391,17 @@ class _NetCDFVariableDataExtractor(object):
     ----------
     ncvar : netCDF4.Variable
         NetCDF Variable from which data will be extracted.
+    cache_size : int, optional
+        Maximum number of ray ranges read by the get_rays method which are
+        cached.  The least recently used ray range is discarded first.
 
     """
 
-    def __init__(self, ncvar):
+    def __init__(self, ncvar, cache_size=4):
         """ initialize the object. """
         self.ncvar = ncvar
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
 
     def __call__(self):
         """ Return an array containing data from the stored variable. """
@@ -388,20 +420,118 @@ class _NetCDFVariableDataExtractor(object):
         # NetCDF variables.
         return np.atleast_1d(data)
 
+    def get_rays(self, start, end):
+        """
+        Return an array containing the rays from start to end - 1.
+
+        Only these rays are read from the variable. The array is cached and
+        returned by subsequent calls with the same start and end, changes to
+        the array will be seen by these calls.
+        """
+        key = (start, end)
+        if key in self._cache:
+            data = self._cache.pop(key)
+        else:
+            data = self._read_rays(start, end)
+        # the most recently used ray range is kept at the end of the cache
+        self._cache[key] = data
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return data
+
+    def _read_rays(self, start, end):
+        """ Read the rays from start to end - 1 from the variable. """
+        return self.ncvar[start:end]
+
+
+class _NetCDFVariableGateDataExtractor(_NetCDFVariableDataExtractor):
+    """
+    Class facilitating on demand extraction of data from a NetCDF variable
+    with a variable number of gates per ray (n_points dimension).
+
+    Parameters
+    ----------
+    ncvar : netCDF4.Variable
+        NetCDF Variable from which data will be extracted.
+    shape : tuple
+        Shape of the unpacked data, (nrays, ngates).
+    ray_n_gates : array
+        Number of gates in each ray.
+    ray_start_index : array
+        Index of the first gate of each ray in the variable.
+    cache_size : int, optional
+        Maximum number of ray ranges read by the get_rays method which are
+        cached.
+
+    """
+
+    def __init__(self, ncvar, shape, ray_n_gates, ray_start_index,
+                 cache_size=4):
+        """ initialize the object. """
+        super(_NetCDFVariableGateDataExtractor, self).__init__(
+            ncvar, cache_size)
+        self.shape = shape
+        self.ray_n_gates = ray_n_gates
+        self.ray_start_index = ray_start_index
+
+    def __call__(self):
+        """ Return a 2D array containing data from the stored variable. """
+        return _unpack_variable_gate_data(
+            self.ncvar[:], self.shape, self.ray_n_gates, self.ray_start_index)
+
+    def _read_rays(self, start, end):
+        """ Read the gates of the rays from start to end - 1. """
+        ray_n_gates = self.ray_n_gates[start:end]
+        ray_start_index = self.ray_start_index[start:end]
+        first = ray_start_index[0]
+        last = ray_start_index[-1] + ray_n_gates[-1]
+        return _unpack_variable_gate_data(
+            self.ncvar[first:last], (end - start, self.shape[1]),
+            ray_n_gates, ray_start_index - first)
+
 
 def _unpack_variable_gate_field_dic(
         dic, shape, ray_n_gates, ray_start_index):
     """ Create a 2D array from a 1D field data, dic update in place """
-    fdata = dic['data']
-    data = np.ma.masked_all(shape, dtype=fdata.dtype)
-    for i, (gates, idx) in enumerate(zip(ray_n_gates, ray_start_index)):
-        data[i, :gates] = fdata[idx:idx+gates]
-    dic['data'] = data
+    dic['data'] = _unpack_variable_gate_data(
+        dic['data'], shape, ray_n_gates, ray_start_index)
     return
 
 
+def _unpack_variable_gate_data(fdata, shape, ray_n_gates, ray_start_index):
+    """ Return a 2D masked array created from 1D field data. """
+    ray_n_gates = np.asarray(ray_n_gates)
+    ray_start_index = np.asarray(ray_start_index)
+    gates = np.arange(shape[1])
+    valid = gates < ray_n_gates[:, np.newaxis]
+    data = np.ma.masked_all(shape, dtype=fdata.dtype)
+    data[valid] = fdata[(ray_start_index[:, np.newaxis] + gates)[valid]]
+    return data
+
+
+def _pack_variable_gate_data(data, ray_n_gates):
+    """ Return 1D field data containing the first ray_n_gates of each ray. """
+    valid = np.arange(data.shape[1]) < ray_n_gates[:, np.newaxis]
+    return data[valid]
+
+
+def _calculate_ray_n_gates(radar):
+    """
+    Return the number of gates in each ray up to and including the last
+    gate which is not masked in any of the radar fields.
+    """
+    ray_n_gates = np.zeros((radar.nrays, ), dtype='int32')
+    for dic in radar.fields.values():
+        valid = ~np.ma.getmaskarray(dic['data'])
+        n_gates = radar.ngates - np.argmax(valid[:, ::-1], axis=1)
+        n_gates[~valid.any(axis=1)] = 0
+        np.maximum(ray_n_gates, n_gates, out=ray_n_gates)
+    return ray_n_gates
+
+
 def write_cfradial(filename, radar, format='NETCDF4', time_reference=None,
-                   arm_time_variables=False):
+                   arm_time_variables=False, n_gates_vary=False,
+                   profile=None):
     """
     Write a Radar object to a CF/Radial compliant netCDF file.
 
@@ -444,8 +574,26 @@ def write_cfradial(filename, radar, format='NETCDF4', time_reference=None,
     arm_time_variables : bool
         True to create the ARM standard time variables base_time and
         time_offset, False will not create these variables.
+    n_gates_vary : bool
+        True to write the fields using the ragged n_points dimension, in
+        which case the gates of each ray after the last gate which is not
+        masked in any field are not written.  This can produce smaller files
+        for radars with variable range coverage.  False, the default, writes
+        all gates of the fields using the time and range dimensions.
+    profile : str or None
+        Write profile used to create the field variables, one of 'fast',
+        'archive' or 'compact'.  'fast' disables compression.  'archive' and
+        'compact' pack floating point fields into 16 and 8-bit integers
+        using a scale_factor and add_offset calculated from the data and
+        enable compression with shuffling at deflate levels 4 and 9.  All
+        profiles chunk the fields by sweep.  Keys set in the field
+        dictionaries take precedence over the profile.  None, the default,
+        uses the netCDF defaults and the keys in the field dictionaries.
 
     """
+    if profile is not None and profile not in _WRITE_PROFILES:
+        raise ValueError('Unknown profile: %s, available profiles: %s' % (
+            profile, ', '.join(sorted(_WRITE_PROFILES))))
     dataset = netCDF4.Dataset(filename, 'w', format=format)
 
     # determine the maximum string length
@@ -484,6 +632,10 @@ def write_cfradial(filename, radar, format='NETCDF4', time_reference=None,
         t = (user, node, time_str)
         history = 'created by %s on %s at %s using Py-ART' % (t)
 
+    if n_gates_vary:
+        metadata_copy['n_gates_vary'] = 'true'
+    elif 'n_gates_vary' in metadata_copy:
+        metadata_copy['n_gates_vary'] = 'false'
     dataset.setncatts(metadata_copy)
 
     if 'Conventions' not in dataset.ncattrs():
@@ -531,8 +683,41 @@ def write_cfradial(filename, radar, format='NETCDF4', time_reference=None,
                       'antenna_transition', ('time', ))
 
     # fields
-    for field, dic in radar.fields.items():
-        _create_ncvar(dic, dataset, field, ('time', 'range'))
+    if n_gates_vary:
+        ray_n_gates = _calculate_ray_n_gates(radar)
+        if ray_n_gates.sum() == 0 and len(ray_n_gates) != 0:
+            # all gates are masked, write a single point as netCDF creates
+            # an unlimited dimension when the size is 0.
+            ray_n_gates[0] = 1
+        ray_start_index = np.zeros_like(ray_n_gates)
+        np.cumsum(ray_n_gates[:-1], out=ray_start_index[1:])
+        dataset.createDimension('n_points', ray_n_gates.sum())
+        _create_ncvar({'data': ray_n_gates, 'long_name': 'number_of_gates',
+                       'units': 'unitless'},
+                      dataset, 'ray_n_gates', ('time', ))
+        _create_ncvar({'data': ray_start_index,
+                       'long_name': 'array_index_to_start_of_ray',
+                       'units': 'unitless'},
+                      dataset, 'ray_start_index', ('time', ))
+        sweep_n_points = [
+            ray_n_gates[start:end + 1].sum() for start, end in zip(
+                radar.sweep_start_ray_index['data'],
+                radar.sweep_end_ray_index['data'])]
+        chunksizes = (max([1] + sweep_n_points), )
+        for field, dic in radar.fields.items():
+            packed_dic = dict(dic)
+            packed_dic['data'] = _pack_variable_gate_data(
+                dic['data'], ray_n_gates)
+            if profile is not None:
+                packed_dic = _apply_write_profile(
+                    packed_dic, profile, chunksizes)
+            _create_ncvar(packed_dic, dataset, field, ('n_points', ))
+    else:
+        chunksizes = (radar.rays_per_sweep['data'].max(), radar.ngates)
+        for field, dic in radar.fields.items():
+            if profile is not None:
+                dic = _apply_write_profile(dic, profile, chunksizes)
+            _create_ncvar(dic, dataset, field, ('time', 'range'))
 
     # sweep parameters
     _create_ncvar(radar.sweep_number, dataset, 'sweep_number', ('sweep', ))
@@ -689,6 +874,43 @@ def write_cfradial(filename, radar, format='NETCDF4', time_reference=None,
     dataset.close()
 
 
+def _apply_write_profile(dic, profile, chunksizes):
+    """
+    Return a copy of a field dictionary with the keys of a write profile.
+
+    Parameters
+    ----------
+    dic : dict
+        Field dictionary.
+    profile : str
+        Name of the write profile in _WRITE_PROFILES.
+    chunksizes : tuple
+        Chunk sizes of the variable.
+
+    Returns
+    -------
+    profile_dic : dict
+        Copy of dic with the keys of the write profile which are not set in
+        dic added.  The data is not packed if it is not floating point or has
+        no valid values.
+
+    """
+    profile_dic = dict(_WRITE_PROFILES[profile])
+    profile_dic['_ChunkSizes'] = chunksizes
+    profile_dic.update(dic)
+    if '_Write_as_dtype' not in dic and '_Write_as_dtype' in profile_dic:
+        data = dic['data']
+        if np.issubdtype(data.dtype, np.floating):
+            data = np.ma.masked_invalid(data, copy=False)
+        if (not np.issubdtype(data.dtype, np.floating) or
+                data.count() == 0):
+            del profile_dic['_Write_as_dtype']
+        else:
+            # non-finite values are written as the fill value
+            profile_dic['data'] = data
+    return profile_dic
+
+
 def _create_ncvar(dic, dataset, name, dimensions):
     """
     Create and fill a Variable in a netCDF Dataset object.
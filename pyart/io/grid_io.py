@@ -19,6 +19,7 @@ import datetime
 
 from ..core.grid import Grid
 from .cfradial import _ncvar_to_dict, _create_ncvar
+from .cfradial import _apply_write_profile, _WRITE_PROFILES
 from .common import _test_arguments
 
 
@@ -143,7 +144,8 @@ def read_grid(filename, exclude_fields=None, **kwargs):
 def write_grid(filename, grid, format='NETCDF4',
                write_proj_coord_sys=True, proj_coord_sys=None,
                arm_time_variables=False,
-               write_point_x_y_z=False, write_point_lon_lat_alt=False):
+               write_point_x_y_z=False, write_point_lon_lat_alt=False,
+               profile=None):
     """
     Write a Grid object to a CF-1.5 and ARM standard netCDF file
 
@@ -193,8 +195,16 @@ def write_grid(filename, grid, format='NETCDF4',
     write_point_lon_lat_alt : bool, optional
         True to include the point_longitude, point_latitude and point_altitude
         variables in the written file, False will not write these variables.
+    profile : str or None, optional
+        Write profile used to create the field variables, one of 'fast',
+        'archive' or 'compact'.  See :py:func:`write_cfradial` for details.
+        All profiles chunk the fields by vertical level.  None, the default,
+        uses the netCDF defaults and the keys in the field dictionaries.
 
     """
+    if profile is not None and profile not in _WRITE_PROFILES:
+        raise ValueError('Unknown profile: %s, available profiles: %s' % (
+            profile, ', '.join(sorted(_WRITE_PROFILES))))
     dset = netCDF4.Dataset(filename, mode='w', format=format)
 
     # create dimensions
@@ -299,6 +309,9 @@ def write_grid(filename, grid, format='NETCDF4',
 
     # field variables
     for field, field_dic in grid.fields.items():
+        if profile is not None:
+            field_dic = _apply_write_profile(
+                field_dic, profile, (1, 1, grid.ny, grid.nx))
         # append 1, to the shape of all data to indicate the time var.
         field_dic['data'].shape = (1, ) + field_dic['data'].shape
         _create_ncvar(field_dic, dset, field, ('time', 'z', 'y', 'x'))
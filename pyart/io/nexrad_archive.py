@@ -8,12 +8,14 @@ Functions for reading NEXRAD Level II Archive files.
     :toctree: generated/
     :template: dev_template.rst
 
+    NEXRADArchiveChunkReader
     _NEXRADLevel2StagedField
 
 .. autosummary::
     :toctree: generated/
 
     read_nexrad_archive
+    _radar_from_level2_file
     _find_range_params
     _find_scans_to_interp
     _interpolate_scan
@@ -27,7 +29,7 @@ import numpy as np
 from ..config import FileMetadata, get_fillvalue
 from ..core.radar import Radar
 from .common import make_time_unit_str, _test_arguments, prepare_for_read
-from .nexrad_level2 import NEXRADLevel2File
+from .nexrad_level2 import NEXRADLevel2File, NEXRADLevel2ChunkFile
 from ..lazydict import LazyLoadDict
 from .nexrad_common import get_nexrad_location
 from .nexrad_interpolate import _fast_interpolate_scan
@@ -36,7 +38,7 @@ from .nexrad_interpolate import _fast_interpolate_scan
 def read_nexrad_archive(filename, field_names=None, additional_metadata=None,
                         file_field_names=False, exclude_fields=None,
                         delay_field_loading=False, station=None, scans=None,
-                        linear_interp=True, **kwargs):
+                        linear_interp=True, nthreads=1, **kwargs):
     """
     Read a NEXRAD Level 2 Archive file.
 
@@ -80,13 +82,20 @@ def read_nexrad_archive(filename, field_names=None, additional_metadata=None,
         in older NEXRAD message 1 files.
     scans : list or None, optional
         Read only specified scans from the file.  None (the default) will read
-        all scans.
+        all scans.  Only the radial records of the specified scans are
+        decoded and compressed records following the last specified scan
+        are not decompressed.
     linear_interp : bool, optional
         True (the default) to perform linear interpolation between valid pairs
         of gates in low resolution rays in files mixed resolution rays.
         False will perform a nearest neighbor interpolation.  This parameter is
         not used if the resolution of all rays in the file or requested sweeps
         is constant.
+    nthreads : int, optional
+        Number of threads used to decompress the bzip2 compressed blocks in
+        the file.  Values larger than 1 decompress the blocks concurrently
+        which can reduce the time needed to read large compressed files on
+        multicore machines.
 
     Returns
     -------
@@ -108,8 +117,120 @@ def read_nexrad_archive(filename, field_names=None, additional_metadata=None,
                                 additional_metadata, file_field_names,
                                 exclude_fields)
 
-    # open the file and retrieve scan information
-    nfile = NEXRADLevel2File(prepare_for_read(filename))
+    # open the file and create the radar
+    nfile = NEXRADLevel2File(
+        prepare_for_read(filename), scans=scans, nthreads=nthreads)
+    radar = _radar_from_level2_file(
+        nfile, scans, filemetadata, delay_field_loading, station,
+        linear_interp)
+    nfile.close()
+    return radar
+
+
+class NEXRADArchiveChunkReader(object):
+    """
+    A class for incrementally reading NEXRAD Level II chunks into a Radar.
+
+    Real-time NEXRAD Level II volumes are distributed as a number of chunk
+    files which are available as the volume is collected.  Chunks added
+    to this reader, in order, are decoded immediately and the sweeps they
+    complete can be retrieved without waiting for the remainder of the
+    volume.
+
+    Parameters
+    ----------
+    field_names, additional_metadata, file_field_names, exclude_fields,
+    station, linear_interp :
+        See :py:func:`read_nexrad_archive`.
+
+    Attributes
+    ----------
+    nsweeps : int
+        Number of completed sweeps.
+    nfile : NEXRADLevel2ChunkFile
+        Object containing the records from all chunks added.
+
+    """
+
+    def __init__(self, field_names=None, additional_metadata=None,
+                 file_field_names=False, exclude_fields=None, station=None,
+                 linear_interp=True, **kwargs):
+        """ initialize. """
+        # test for non empty kwargs
+        _test_arguments(kwargs)
+
+        self._filemetadata = FileMetadata(
+            'nexrad_archive', field_names, additional_metadata,
+            file_field_names, exclude_fields)
+        self._station = station
+        self._linear_interp = linear_interp
+        self._radar = None
+        self.nfile = NEXRADLevel2ChunkFile()
+
+    @property
+    def nsweeps(self):
+        """ Number of completed sweeps. """
+        return self.nfile.nscans_complete
+
+    def add_chunk(self, chunk):
+        """
+        Add a chunk of the volume.
+
+        Parameters
+        ----------
+        chunk : str or file-like
+            Name of or file like object containing the next chunk of the
+            volume.  The first chunk added must be the start of volume chunk.
+
+        Returns
+        -------
+        sweeps : list
+            Sweeps (0 based) completed by the chunk.
+
+        """
+        sweeps = self.nfile.add_chunk(prepare_for_read(chunk))
+        if len(sweeps):
+            self._radar = None
+        return sweeps
+
+    def get_sweeps(self, sweeps):
+        """
+        Return a Radar containing completed sweeps.
+
+        Parameters
+        ----------
+        sweeps : list
+            Completed sweeps (0 based) to include in the radar.
+
+        Returns
+        -------
+        radar : Radar
+            Radar object containing the requested sweeps.
+
+        """
+        sweeps = list(sweeps)
+        if len(sweeps) == 0 or max(sweeps) >= self.nsweeps:
+            raise ValueError('sweeps must be completed sweeps')
+        return _radar_from_level2_file(
+            self.nfile, sweeps, self._filemetadata, False, self._station,
+            self._linear_interp)
+
+    @property
+    def radar(self):
+        """
+        Radar containing all completed sweeps, None when no sweeps have been
+        completed.  The radar is created from the decoded records when first
+        accessed after a sweep is completed.
+        """
+        if self._radar is None and self.nsweeps:
+            self._radar = self.get_sweeps(range(self.nsweeps))
+        return self._radar
+
+
+def _radar_from_level2_file(nfile, scans, filemetadata,
+                            delay_field_loading=False, station=None,
+                            linear_interp=True):
+    """ Create a Radar from the scans in a NEXRADLevel2File. """
     scan_info = nfile.scan_info(scans)
 
     # time
@@ -225,7 +346,6 @@ def read_nexrad_archive(filename, field_names=None, additional_metadata=None,
     instrument_parameters = {'unambiguous_range': unambiguous_range,
                              'nyquist_velocity': nyquist_velocity, }
 
-    nfile.close()
     return Radar(
         time, _range, fields, metadata, scan_type,
         latitude, longitude, altitude,
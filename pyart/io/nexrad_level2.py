@@ -7,14 +7,22 @@ pyart.io.nexrad_level2
     :template: dev_template.rst
 
     NEXRADLevel2File
+    NEXRADLevel2ChunkFile
 
 .. autosummary::
     :toctree: generated/
 
     _decompress_records
+    _decompress_block
+    _find_ldm_blocks
+    _index_records
+    _gather
+    _gather_structure
+    _as_native
     _get_record_from_buf
     _get_msg31_data_block
     _structure_size
+    _structure_dtype
     _unpack_from_buf
     _unpack_structure
 
@@ -77,6 +85,7 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import bz2
 import struct
 from datetime import datetime, timedelta
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -95,11 +104,26 @@ class NEXRADLevel2File(object):
     ----------
     filename : str
         Filename of Archive II file to read.
+    scans : list or None
+        Scans (0 based) to decode.  When specified only the radial records
+        belonging to these scans are decoded and the compressed records
+        following the last requested scan are not decompressed.  Other
+        scans will appear to contain no rays and should not be requested
+        from the methods of this class.  None (the default) decodes all
+        scans in the file.
+    nthreads : int
+        Number of threads used to decompress the LDM blocks of a BZ2
+        compressed file.  The blocks are independent and are decompressed
+        concurrently when this is larger than 1.  Decompressed blocks are
+        held in memory until decoded, which may be all blocks in the file
+        when decompression outpaces decoding.
 
     Attributes
     ----------
     radial_records : list
-        Radial (1 or 31) messages in the file.
+        Radial (1 or 31) messages in the file.  Message 31 records are
+        unpacked when this attribute is first accessed, the methods of this
+        class unpack only the headers and data needed.
     nscans : int
         Number of scans in the file.
     scan_msgs : list of arrays
@@ -110,7 +134,13 @@ class NEXRADLevel2File(object):
     vcp : dict
         VCP information dictionary.
     _records : list
-        A list of all records (message) in the file.
+        A list of all records (message) in the file other than message 31
+        records.
+    _buffers : list
+        Decompressed data containing the message 31 records.
+    _msg31_buf_nums, _msg31_positions : arrays
+        Buffer number and position within this buffer of each message 31
+        record.
     _fh : file-like
         File like object from which data is read.
     _msg_type : '31' or '1':
@@ -123,7 +153,7 @@ class NEXRADLevel2File(object):
     .. [3] http://thredds.ucar.edu/thredds/catalog.html
 
     """
-    def __init__(self, filename):
+    def __init__(self, filename, scans=None, nthreads=1):
         """ initalize the object. """
         # read in the volume header and compression_record
         if hasattr(filename, 'read'):
@@ -134,42 +164,106 @@ class NEXRADLevel2File(object):
         self.volume_header = _unpack_structure(fh.read(size), VOLUME_HEADER)
         compression_record = fh.read(COMPRESSION_RECORD_SIZE)
 
+        # elevation numbers (1 based) of the radial records to decode
+        if scans is None:
+            elevation_numbers = None
+        else:
+            elevation_numbers = set(scan + 1 for scan in scans)
+
         # read the records in the file, decompressing as needed
         compression_slice = slice(CONTROL_WORD_SIZE, CONTROL_WORD_SIZE + 2)
         compression_or_ctm_info = compression_record[compression_slice]
         if compression_or_ctm_info == b'BZ':
-            buf = _decompress_records(fh)
+            # each LDM block is decompressed in turn, stopping after the
+            # first block which contains records beyond the requested scans.
+            bufs = _decompress_records(fh, nthreads)
+            start = COMPRESSION_RECORD_SIZE
         # The 12-byte compression record previously held the Channel Terminal
         # Manager (CTM) information. Bytes 4 through 6 contain the size of the
         # record (2432) as a big endian unsigned short, which is encoded as
         # b'\t\x80' == struct.pack('>H', 2432).
         # Newer files zero out this section.
         elif compression_or_ctm_info in (b'\x00\x00', b'\t\x80'):
-            buf = fh.read()
+            bufs = [fh.read()]
+            start = 0
         else:
             raise IOError('unknown compression record')
         self._fh = fh
 
-        # read the records from the buffer
+        # unpack all records except for message 31 records, only the
+        # location of these are stored, their contents are unpacked as needed.
+        self._init_records()
+        for buf in bufs:
+            last_elevation_number = self._add_records(
+                buf, start, elevation_numbers)
+            if (elevation_numbers is not None and
+                    last_elevation_number > max(elevation_numbers)):
+                break
+        if hasattr(bufs, 'close'):
+            bufs.close()    # stop decompressing blocks which are not needed
+        self._find_scans()
+        return
+
+    def _init_records(self):
+        """ Initialize the record attributes with no records. """
         self._records = []
-        buf_length = len(buf)
-        pos = 0
-        while pos < buf_length:
-            pos, dic = _get_record_from_buf(buf, pos)
-            self._records.append(dic)
+        self._buffers = []
+        self._msg31_buf_nums = np.zeros((0, ), dtype='int64')
+        self._msg31_positions = np.zeros((0, ), dtype='int64')
+        self._msg31_elev_nums = np.zeros((0, ), dtype='int64')
+        self._radial_records = None
+        self._scan_columns = {}
+        self.scan_msgs = []
+        self.nscans = 0
+        self.vcp = None
+
+    def _add_records(self, buf, start, elevation_numbers=None):
+        """
+        Add the records in a buffer starting at start.
 
+        Radial records whose elevation number is not in elevation_numbers are
+        skipped, None adds all records.  Returns the largest radial elevation
+        number in the buffer.
+        """
+        positions, types, elev_nums = _index_records(buf, start)
+        wanted = np.ones(len(positions), dtype='bool')
+        if elevation_numbers is not None:
+            is_radial = (types == 1) | (types == 31)
+            wanted[is_radial] = np.in1d(
+                elev_nums[is_radial], list(elevation_numbers))
+        for pos in positions[wanted & (types != 31)]:
+            self._records.append(_get_record_from_buf(buf, int(pos))[1])
+        is_msg31 = wanted & (types == 31)
+        if is_msg31.any():
+            buf_nums = np.full(is_msg31.sum(), len(self._buffers), 'int64')
+            self._msg31_buf_nums = np.append(self._msg31_buf_nums, buf_nums)
+            self._msg31_positions = np.append(
+                self._msg31_positions, positions[is_msg31])
+            self._msg31_elev_nums = np.append(
+                self._msg31_elev_nums, elev_nums[is_msg31])
+            self._buffers.append(buf)
+            # cached records and headers no longer include all rays
+            self._radial_records = None
+            for elevation_number in np.unique(elev_nums[is_msg31]):
+                self._scan_columns.pop(elevation_number - 1, None)
+        if len(elev_nums) == 0:
+            return 0
+        return elev_nums.max()
+
+    def _find_scans(self):
+        """ Find the radial records in each scan and the VCP record. """
         # pull out radial records (1 or 31) which contain the moment data.
-        self.radial_records = [r for r in self._records
-                               if r['header']['type'] == 31]
-        self._msg_type = '31'
-        if len(self.radial_records) == 0:
-            self.radial_records = [r for r in self._records
-                                   if r['header']['type'] == 1]
+        if len(self._msg31_positions):
+            self._msg_type = '31'
+            elev_nums = self._msg31_elev_nums
+        else:
             self._msg_type = '1'
-        if len(self.radial_records) == 0:
-            raise ValueError('No MSG31 records found, cannot read file')
-        elev_nums = np.array([m['msg_header']['elevation_number']
-                              for m in self.radial_records])
+            self._radial_records = [r for r in self._records
+                                    if r['header']['type'] == 1]
+            if len(self._radial_records) == 0:
+                raise ValueError('No MSG31 records found, cannot read file')
+            elev_nums = np.array([m['msg_header']['elevation_number']
+                                  for m in self._radial_records])
         self.scan_msgs = [np.where(elev_nums == i + 1)[0]
                           for i in range(elev_nums.max())]
         self.nscans = len(self.scan_msgs)
@@ -180,7 +274,15 @@ class NEXRADLevel2File(object):
             self.vcp = msg_5[0]
         else:
             self.vcp = None
-        return
+
+    @property
+    def radial_records(self):
+        """ Radial (1 or 31) messages in the file. """
+        if self._radial_records is None:
+            self._radial_records = [
+                self._radial_record(i)
+                for i in range(len(self._msg31_positions))]
+        return self._radial_records
 
     def close(self):
         """ Close the file. """
@@ -203,7 +305,7 @@ class NEXRADLevel2File(object):
 
         """
         if self._msg_type == '31':
-            dic = self.radial_records[0]['VOL']
+            dic = self._radial_record(0)['VOL']
             height = dic['height'] + dic['feedhorn_height']
             return dic['lat'], dic['lon'], height
         else:
@@ -239,7 +341,7 @@ class NEXRADLevel2File(object):
             nrays = self.get_nrays(scan)
 
             msg31_number = self.scan_msgs[scan][0]
-            msg = self.radial_records[msg31_number]
+            msg = self._radial_record(msg31_number)
 
             nexrad_moments = ['REF', 'VEL', 'SW', 'ZDR', 'PHI', 'RHO']
             moments = [f for f in nexrad_moments if f in msg]
@@ -297,7 +399,7 @@ class NEXRADLevel2File(object):
             Range in meters from the antenna to the center of gate (bin).
 
         """
-        dic = self.radial_records[self.scan_msgs[scan_num][0]][moment]
+        dic = self._radial_record(self.scan_msgs[scan_num][0])[moment]
         ngates = dic['ngates']
         first_gate = dic['first_gate']
         gate_spacing = dic['gate_spacing']
@@ -308,10 +410,70 @@ class NEXRADLevel2File(object):
         """ Find the all message number for a list of scans. """
         return np.concatenate([self.scan_msgs[i] for i in scans])
 
+    def _radial_record(self, msg_num):
+        """ Return a radial record, unpacking it from the buffer if needed. """
+        if self._radial_records is not None:
+            return self._radial_records[msg_num]
+        buf = self._buffers[self._msg31_buf_nums[msg_num]]
+        pos = int(self._msg31_positions[msg_num])
+        return _get_record_from_buf(buf, pos)[1]
+
+    def _get_scan_columns(self, scan):
+        """
+        Return the unpacked message 31 headers for all rays in a scan.
+
+        The headers are unpacked together into structured arrays, a dictionary
+        with the message header array under the 'msg_header' key and the
+        buffer number of each ray under the 'buf_nums' key is returned.  Each
+        data block is stored under its name as a tuple of the rays (within the
+        scan) which contain the block, the location of the block in the
+        buffer and, for the RAD and moment blocks, the unpacked block
+        headers.  Results are cached.
+        """
+        if scan in self._scan_columns:
+            return self._scan_columns[scan]
+        msg_nums = self.scan_msgs[scan]
+        buf_nums = self._msg31_buf_nums[msg_nums]
+        starts = self._msg31_positions[msg_nums] + _structure_size(MSG_HEADER)
+        msg_header = _gather_structure(self._buffers, buf_nums, starts, MSG_31)
+        columns = {'msg_header': msg_header, 'buf_nums': buf_nums}
+
+        # find the name of the block referenced by each pointer
+        pointers = np.column_stack(
+            [msg_header['block_pointer_%d' % i].astype('int64')
+             for i in range(1, 10)])
+        has_block = pointers > 0
+        locations = starts[:, np.newaxis] + pointers
+        names = np.zeros(pointers.shape, dtype='S3')
+        block_buf_nums = np.repeat(buf_nums, pointers.shape[1])
+        names[has_block] = _gather(
+            self._buffers, block_buf_nums[has_block.ravel()],
+            locations[has_block] + 1, 3).view('S3')[:, 0]
+
+        for name in np.unique(names[has_block]):
+            rays, cols = np.nonzero(names == name)
+            block_name = name.decode('ascii').strip()
+            block_locations = locations[rays, cols]
+            if block_name == 'RAD':
+                structure = RADIAL_DATA_BLOCK
+            elif block_name in ['REF', 'VEL', 'SW', 'ZDR', 'PHI', 'RHO']:
+                structure = GENERIC_DATA_BLOCK
+            else:
+                columns[block_name] = (rays, block_locations, None)
+                continue
+            headers = _gather_structure(
+                self._buffers, buf_nums[rays], block_locations, structure)
+            columns[block_name] = (rays, block_locations, headers)
+        self._scan_columns[scan] = columns
+        return columns
+
     def _radial_array(self, scans, key):
         """
         Return an array of radial header elements for all rays in scans.
         """
+        if self._msg_type == '31':
+            return _as_native(np.concatenate(
+                [self._get_scan_columns(i)['msg_header'][key] for i in scans]))
         msg_nums = self._msg_nums(scans)
         temp = [self.radial_records[i]['msg_header'][key] for i in msg_nums]
         return np.array(temp)
@@ -320,11 +482,11 @@ class NEXRADLevel2File(object):
         """
         Return an array of RAD or msg_header elements for all rays in scans.
         """
-        msg_nums = self._msg_nums(scans)
         if self._msg_type == '31':
-            tmp = [self.radial_records[i]['RAD'][key] for i in msg_nums]
-        else:
-            tmp = [self.radial_records[i]['msg_header'][key] for i in msg_nums]
+            return _as_native(np.concatenate(
+                [self._get_scan_columns(i)['RAD'][2][key] for i in scans]))
+        msg_nums = self._msg_nums(scans)
+        tmp = [self.radial_records[i]['msg_header'][key] for i in msg_nums]
         return np.array(tmp)
 
     def get_times(self, scans=None):
@@ -521,12 +683,15 @@ class NEXRADLevel2File(object):
             data = np.ones((nrays, max_ngates), dtype='u1')
         else:
             data = np.ones((nrays, max_ngates), dtype='u2')
-        for i, msg_num in enumerate(msg_nums):
-            msg = self.radial_records[msg_num]
-            if moment not in msg.keys():
-                continue
-            ngates = msg[moment]['ngates']
-            data[i, :ngates] = msg[moment]['data']
+        if self._msg_type == '31':
+            self._get_msg31_data(moment, scans, data)
+        else:
+            for i, msg_num in enumerate(msg_nums):
+                msg = self.radial_records[msg_num]
+                if moment not in msg.keys():
+                    continue
+                ngates = msg[moment]['ngates']
+                data[i, :ngates] = msg[moment]['data']
 
         # return raw data if requested
         if raw_data:
@@ -536,7 +701,7 @@ class NEXRADLevel2File(object):
         # are the same in all scans/gates
         for scan in scans:  # find a scan which contains the moment
             msg_num = self.scan_msgs[scan][0]
-            msg = self.radial_records[msg_num]
+            msg = self._radial_record(msg_num)
             if moment in msg.keys():
                 offset = np.float32(msg[moment]['offset'])
                 scale = np.float32(msg[moment]['scale'])
@@ -547,22 +712,267 @@ class NEXRADLevel2File(object):
         # moment is not present in any scan, mask all values
         return np.ma.masked_less_equal(data, 1)
 
+    def _get_msg31_data(self, moment, scans, data):
+        """
+        Fill data with the raw moment data from the message 31 records in
+        scans.  The gates of all rays in a scan are gathered at once.
+        """
+        max_ngates = data.shape[1]
+        if moment == 'PHI':
+            word_size, dtype = 2, '>u2'
+        else:
+            word_size, dtype = 1, '>u1'
+        header_size = _structure_size(GENERIC_DATA_BLOCK)
+        first_ray = 0
+        for scan in scans:
+            columns = self._get_scan_columns(scan)
+            if moment in columns:
+                rays, locations, headers = columns[moment]
+                ngates = np.minimum(headers['ngates'], max_ngates)
+                scan_ngates = ngates.max()
+                gates = _gather(
+                    self._buffers, columns['buf_nums'][rays],
+                    locations + header_size, scan_ngates * word_size)
+                gates = gates.view(dtype)
+                gates[np.arange(scan_ngates) >= ngates[:, np.newaxis]] = 1
+                data[first_ray + rays, :scan_ngates] = gates
+            first_ray += len(self.scan_msgs[scan])
+
+
+class NEXRADLevel2ChunkFile(NEXRADLevel2File):
+    """
+    Class for accessing data in a NEXRAD Level II volume as it arrives in
+    chunks.
+
+    Real-time NEXRAD Level II data is distributed as a series of chunks, a
+    start chunk containing the volume header and metadata records followed
+    by intermediate and end chunks each containing one or more compressed
+    LDM blocks of message 31 records.  Chunks are added in order using
+    :py:func:`add_chunk`, scans are complete once the final radial of the
+    elevation or a radial from a later elevation has been received.  The
+    methods of :py:class:`NEXRADLevel2File` should only be used with
+    completed scans.
+
+    Attributes
+    ----------
+    nscans_complete : int
+        Number of completed scans, these are always the first scans of the
+        volume.
 
-def _decompress_records(file_handler):
     """
-    Decompressed the records from an BZ2 compressed Archive 2 file.
+    def __init__(self):
+        """ initalize the object. """
+        self.volume_header = None
+        self.nscans_complete = 0
+        self._msg_type = '31'
+        self._fh = None
+        self._ended_elevation_numbers = set()
+        self._init_records()
+
+    def add_chunk(self, chunk):
+        """
+        Add a chunk of the volume.
+
+        Parameters
+        ----------
+        chunk : file-like
+            File like object from which the chunk is read.
+
+        Returns
+        -------
+        scans : list
+            Scans (0 based) completed by the chunk.
+
+        """
+        cbuf = chunk.read()
+        pos = 0
+        if cbuf[:4] == b'AR2V':
+            # start of volume chunk
+            size = _structure_size(VOLUME_HEADER)
+            self.volume_header = _unpack_structure(cbuf[:size], VOLUME_HEADER)
+            pos = size
+
+        nradials = len(self._msg31_positions)
+        for start, end in _find_ldm_blocks(cbuf, pos):
+            buf = _decompress_block(cbuf[start:end])
+            self._add_records(buf, COMPRESSION_RECORD_SIZE)
+        if len(self._msg31_positions) == nradials:
+            return []
+        self._find_scans()
+
+        # find the elevations of new radials which end an elevation or volume
+        new = slice(nradials, None)
+        offset = _structure_size(MSG_HEADER) + MSG_31_RADIAL_STATUS
+        status = _gather(
+            self._buffers, self._msg31_buf_nums[new],
+            self._msg31_positions[new] + offset, 1)[:, 0]
+        ended = np.in1d(status, [RADIAL_STATUS_END_ELEVATION,
+                                 RADIAL_STATUS_END_VOLUME])
+        self._ended_elevation_numbers.update(
+            self._msg31_elev_nums[new][ended].tolist())
+
+        # scans before the latest elevation are also complete
+        last_elevation_number = self.nscans
+        if last_elevation_number in self._ended_elevation_numbers:
+            nscans_complete = last_elevation_number
+        else:
+            nscans_complete = last_elevation_number - 1
+        scans = list(range(self.nscans_complete, nscans_complete))
+        self.nscans_complete = max(self.nscans_complete, nscans_complete)
+        return scans
+
+    def close(self):
+        """ Close the file, this does nothing as chunks are read when added.
+        """
+        pass
+
+
+def _decompress_records(file_handler, nthreads=1):
     """
+    Decompress the records from an BZ2 compressed Archive 2 file.
+
+    The records are decompressed one LDM block at a time, this generator
+    yields the decompressed data from each block in order.  The data from
+    each block begins with a 12 byte CTM header.  When nthreads is larger
+    than 1 the blocks are decompressed concurrently by a pool of threads,
+    bz2 releases the GIL while decompressing.
+    """
+    if nthreads < 1:
+        raise ValueError('nthreads must be a positive integer')
     file_handler.seek(0)
     cbuf = file_handler.read()    # read all data from the file
+    blocks = (cbuf[start:end] for start, end in _find_ldm_blocks(cbuf))
+    if nthreads == 1:
+        for block in blocks:
+            yield _decompress_block(block)
+        return
+    pool = ThreadPool(nthreads)
+    try:
+        for buf in pool.imap(_decompress_block, blocks):
+            yield buf
+    finally:
+        # blocks after the last requested scan are not needed
+        pool.terminate()
+
+
+def _decompress_block(block):
+    """ Decompress a single bzip2 compressed LDM block. """
     decompressor = bz2.BZ2Decompressor()
-    skip = _structure_size(VOLUME_HEADER) + CONTROL_WORD_SIZE
-    buf = decompressor.decompress(cbuf[skip:])
-    while len(decompressor.unused_data):
-        cbuf = decompressor.unused_data
+    return decompressor.decompress(block)
+
+
+def _find_ldm_blocks(cbuf, pos=None):
+    """
+    Find the start and end of the compressed LDM blocks in an Archive 2 file.
+
+    Each block is preceded by a control word containing the size of the
+    compressed block, the size is negative for the final block in some
+    files.  When the control words do not describe the file the blocks are
+    found by decompressing the file.  The first control word is expected at
+    pos, None for the position following the volume header.
+    """
+    if pos is None:
+        pos = _structure_size(VOLUME_HEADER)
+    first_pos = pos
+    blocks = []
+    cbuf_length = len(cbuf)
+    while pos + CONTROL_WORD_SIZE <= cbuf_length:
+        size = abs(struct.unpack(
+            '>i', cbuf[pos:pos + CONTROL_WORD_SIZE])[0])
+        start = pos + CONTROL_WORD_SIZE
+        end = start + size
+        if size == 0 or end > cbuf_length or cbuf[start:start + 2] != b'BZ':
+            break
+        blocks.append((start, end))
+        pos = end
+    else:
+        return blocks
+
+    # control words are not valid, decompress to find the block boundaries
+    blocks = []
+    start = first_pos + CONTROL_WORD_SIZE
+    while start < cbuf_length:
         decompressor = bz2.BZ2Decompressor()
-        buf += decompressor.decompress(cbuf[CONTROL_WORD_SIZE:])
+        decompressor.decompress(cbuf[start:])
+        end = cbuf_length - len(decompressor.unused_data)
+        blocks.append((start, end))
+        if not len(decompressor.unused_data):
+            break
+        start = end + CONTROL_WORD_SIZE
+    return blocks
+
+
+def _index_records(buf, pos):
+    """
+    Find the location, type and elevation number of all records in a buffer
+    starting at pos without unpacking the records.  The elevation number is
+    0 for records which are not radial (message 1 or 31) records.
+    """
+    positions = []
+    types = []
+    elevation_numbers = []
+    msg_header_size = _structure_size(MSG_HEADER)
+    buf_length = len(buf)
+    while pos < buf_length:
+        size, msg_type = struct.unpack_from('>HxB', buf, pos)
+        positions.append(pos)
+        types.append(msg_type)
+        if msg_type == 31:
+            elevation_numbers.append(struct.unpack_from(
+                '>B', buf, pos + msg_header_size + MSG_31_ELEVATION_NUMBER)[0])
+            pos = pos + msg_header_size + size * 2 - 4
+        elif msg_type == 1:
+            elevation_numbers.append(struct.unpack_from(
+                '>H', buf, pos + msg_header_size + MSG_1_ELEVATION_NUMBER)[0])
+            pos = pos + RECORD_SIZE
+        else:
+            elevation_numbers.append(0)
+            pos = pos + RECORD_SIZE
+    return (np.array(positions, dtype='int64'), np.array(types, dtype='int64'),
+            np.array(elevation_numbers, dtype='int64'))
 
-    return buf[COMPRESSION_RECORD_SIZE:]
+
+def _gather(buffers, buf_nums, starts, length):
+    """
+    Gather bytes from a list of buffers.
+
+    Returns a (len(starts), length) array where each row contains the bytes
+    from buffers[buf_nums[i]] beginning at starts[i].  Equally spaced rows
+    are copied from a strided view of the buffer, others are gathered using
+    an index array.
+    """
+    out = np.empty((len(starts), length), dtype='u1')
+    for buf_num in np.unique(buf_nums):
+        rows = np.nonzero(buf_nums == buf_num)[0]
+        raw = np.frombuffer(buffers[buf_num], dtype='u1')
+        row_starts = starts[rows]
+        steps = np.diff(row_starts)
+        if (len(rows) > 1 and steps[0] > 0 and np.all(steps == steps[0]) and
+                row_starts[-1] + length <= len(raw)):
+            out[rows] = np.lib.stride_tricks.as_strided(
+                raw[row_starts[0]:], shape=(len(rows), length),
+                strides=(steps[0], 1), writeable=False)
+        else:
+            index = row_starts[:, np.newaxis] + np.arange(length)
+            out[rows] = raw.take(index, mode='clip')
+    return out
+
+
+def _gather_structure(buffers, buf_nums, starts, structure):
+    """ Gather and unpack structures into a structured array. """
+    size = _structure_size(structure)
+    raw = _gather(buffers, buf_nums, starts, size)
+    return raw.view(_structure_dtype(structure))[:, 0]
+
+
+def _as_native(array):
+    """
+    Convert an array from a structured array field to a native integer or
+    float array, matching the type of an array created from unpacked values.
+    """
+    if array.dtype.kind == 'f':
+        return array.astype('float64')
+    return array.astype(int)
 
 
 def _get_record_from_buf(buf, pos):
@@ -698,6 +1108,13 @@ def _structure_size(structure):
     return struct.calcsize('>' + ''.join([i[1] for i in structure]))
 
 
+def _structure_dtype(structure):
+    """ Find the NumPy dtype equivalent to a structure. """
+    return np.dtype([
+        (name, 'S' + fmt[:-1] if fmt.endswith('s') else '>' + fmt)
+        for name, fmt in structure])
+
+
 def _unpack_from_buf(buf, pos, structure):
     """ Unpack a structure from a buffer. """
     size = _structure_size(structure)
@@ -790,6 +1207,14 @@ MSG_31 = (
     ('block_pointer_9', INT4),      # 64-67  Moment "RHO"
 )
 
+MSG_31_ELEVATION_NUMBER = 22    # offset of elevation_number in MSG_31
+
+# byte 21 of MSG_31 (radial_spacing) holds the radial status
+# Table XVII-A
+MSG_31_RADIAL_STATUS = 21
+RADIAL_STATUS_END_ELEVATION = 2
+RADIAL_STATUS_END_VOLUME = 4
+
 
 # Table III Digital Radar Data (Message Type 1)
 # pages 3-7 to
@@ -826,6 +1251,7 @@ MSG_1 = (
     ('spare_5', '32s'),             # 68-99
     # 100+  reflectivity, velocity and/or spectral width data, CODE1
 )
+MSG_1_ELEVATION_NUMBER = 16     # offset of elevation_number in MSG_1
 
 # Table XI Volume Coverage Pattern Data (Message Type 5 & 7)
 # pages 3-51 to 3-54
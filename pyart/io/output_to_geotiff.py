@@ -15,8 +15,6 @@ Write a Py-ART Grid object to a GeoTIFF file.
 
 from __future__ import division
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as colors
 import os
 import shutil
 from ..exceptions import MissingOptionalDependency
@@ -211,6 +209,8 @@ def _get_rgb_values(data, vmin, vmax, color_levels, cmap):
     rarr = []
     garr = []
     barr = []
+    # matplotlib is imported here to avoid importing it with pyart.io
+    import matplotlib.pyplot as plt
     cmap = plt.cm.get_cmap(cmap)
     for val in index:
         if not np.isnan(val):
@@ -256,6 +256,8 @@ def _create_sld(cmap, vmin, vmax, filename, color_levels=None):
         with steps << 255 (e.g., hydrometeor ID).
 
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as colors
     cmap = plt.cm.get_cmap(cmap)
     if color_levels is None:
         color_levels = 255
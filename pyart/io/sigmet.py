@@ -12,9 +12,11 @@ Reading and writing of Sigmet (raw format) files
     _is_time_ordered_by_reversal
     _is_time_ordered_by_roll
     _is_time_ordered_by_reverse_roll
-    _time_order_data_and_metadata_roll
-    _time_order_data_and_metadata_reverse
-    _time_order_data_and_metadata_full
+    _time_order_index_roll
+    _time_order_index_reverse
+    _time_order_index_full
+    _sweep_orders
+    _permute_sweeps
 
 """
 
@@ -38,7 +40,7 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
                 file_field_names=False, exclude_fields=None,
                 time_ordered='none', full_xhdr=None, noaa_hh_hdr=None,
                 debug=False, ignore_xhdr=False, ignore_sweep_start_ms=None,
-                **kwargs):
+                sweeps=None, **kwargs):
     """
     Read a Sigmet (IRIS) product file.
 
@@ -66,7 +68,8 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         `additional_metadata`.
     exclude_fields : list or None, optional
         List of fields to exclude from the radar object. This is applied
-        after the `file_field_names` and `field_names` parameters.
+        after the `file_field_names` and `field_names` parameters.  The data
+        of excluded fields is not decoded.
     time_ordered : 'none', 'sequential', 'full', ...,  optional
         Parameter controlling if and how the rays are re-ordered by time.
         The default, 'none' keeps the rays ordered in the same manner as
@@ -106,6 +109,10 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         When there are not extended headers ignoring the millisecond sweep
         times provides time data which is always prior to the actual
         collection time with an error from 0 to 2 seconds.
+    sweeps : list of int or None, optional
+        Sweeps (0-based) to read from the file.  The records of all other
+        sweeps are skipped without being decoded.  None, the default, reads
+        all sweeps.
     debug : bool, optional
         Print debug information during read.
 
@@ -137,22 +144,29 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         else:
             full_xhdr = False
 
-    # read data
-    sigmet_data, sigmet_metadata = sigmetfile.read_data(full_xhdr=full_xhdr)
+    # read data, only the data types of fields in the radar and the extended
+    # headers, if not ignored, are decoded.
+    data_type_names = [name for name in sigmetfile.data_type_names
+                       if filemetadata.get_field_name(name) is not None]
+    if 'XHDR' in sigmetfile.data_type_names and not ignore_xhdr:
+        data_type_names.append('XHDR')
+    sigmet_data, sigmet_metadata = sigmetfile.read_data(
+        full_xhdr=full_xhdr, sweeps=sweeps, data_type_names=data_type_names)
     first_data_type = sigmetfile.data_type_names[0]
     if first_data_type == 'XHDR':   # don't use XHDR as the first data type
         first_data_type = sigmetfile.data_type_names[1]
     sigmetfile.close()
-    nsweeps, nrays, nbins = sigmet_data[first_data_type].shape
+    nsweeps, nrays = sigmet_metadata[first_data_type]['nbins'].shape
+    nbins = sigmetfile.product_hdr['product_end']['number_bins']
 
     if nsweeps == 0:
         raise IOError('File contains no readable sweep data.')
 
-    # ignore extended header if user requested
-    if ignore_xhdr:
-        if 'XHDR' in sigmet_data:
-            sigmet_data.pop('XHDR')
-            sigmet_metadata.pop('XHDR')
+    # the metadata of data types which were not read is not needed except
+    # for that of the first data type.
+    for name in list(sigmet_metadata.keys()):
+        if name not in sigmet_data and name != first_data_type:
+            sigmet_metadata.pop(name)
 
     # parse the extended headers for time
     if full_xhdr and 'XHDR' in sigmet_data:
@@ -162,20 +176,22 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         xhdr = sigmet_data.pop('XHDR')
         sigmet_data['XHDR'] = xhdr[:, :, :2].copy().view('i4')
         sigmet_data['XHDR_FULL'] = xhdr
-        xhdr_metadata = {}
-        for key in sigmet_metadata['XHDR'].keys():
-            xhdr_metadata[key] = sigmet_metadata['XHDR'][key].copy()
-        sigmet_metadata['XHDR_FULL'] = xhdr_metadata
 
-    # remove missing rays from the data
+    # Missing rays are removed and the rays are time ordered using a single
+    # permutation of the rays which is applied to each data and metadata
+    # array.  When no rays are missing the rays of each sweep are permuted
+    # in place, otherwise the permutation creates a copy of the arrays.
     good_rays = (sigmet_metadata[first_data_type]['nbins'] != -1)
     rays_missing = (sigmet_metadata[first_data_type]['nbins'] == -1).sum()
-    for field_name in sigmet_data.keys():
-        sigmet_data[field_name] = sigmet_data[field_name][good_rays]
-        field_metadata = sigmet_metadata[field_name]
-        for key in field_metadata.keys():
-            field_metadata[key] = field_metadata[key][good_rays]
     rays_per_sweep = good_rays.sum(axis=1)
+    ray_index = np.flatnonzero(good_rays)
+
+    # reference times of the rays used to determine the time ordering
+    if 'XHDR' in sigmet_data:
+        ref_time = sigmet_data['XHDR'].reshape(-1)[ray_index]
+    else:
+        ref_time = sigmet_metadata[first_data_type]['time'].reshape(-1)
+        ref_time = ref_time[ray_index].astype('int32')
 
     # time order
     if time_ordered == 'sequential':
@@ -184,42 +200,63 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         # If it does not issue a warning and perform no time ordering
         if task_config['task_scan_info']['antenna_scan_mode'] == 2:
             # RHI scan
-            if _is_time_ordered_by_reversal(
-                    sigmet_data, sigmet_metadata, rays_per_sweep):
+            if _is_time_ordered_by_reversal(ref_time, rays_per_sweep):
                 time_ordered = 'reverse'
             else:
                 warnings.warn('Rays not collected sequentially in time.')
                 time_ordered = 'none'
         else:
             # PPI scan
-            if _is_time_ordered_by_roll(
-                    sigmet_data, sigmet_metadata, rays_per_sweep):
+            if _is_time_ordered_by_roll(ref_time, rays_per_sweep):
                 time_ordered = 'roll'
-            elif _is_time_ordered_by_reverse_roll(
-                    sigmet_data, sigmet_metadata, rays_per_sweep):
+            elif _is_time_ordered_by_reverse_roll(ref_time, rays_per_sweep):
                 time_ordered = 'reverse_and_roll'
             else:
                 warnings.warn('Rays not collected sequentially in time.')
                 time_ordered = 'none'
 
     if time_ordered == 'full':
-        _time_order_data_and_metadata_full(
-            sigmet_data, sigmet_metadata, rays_per_sweep)
+        ray_index = ray_index[_time_order_index_full(
+            ref_time, rays_per_sweep)]
     if time_ordered == 'reverse':
-        _time_order_data_and_metadata_reverse(
-            sigmet_data, sigmet_metadata, rays_per_sweep)
+        ray_index = ray_index[_time_order_index_reverse(
+            ref_time, rays_per_sweep)]
     if time_ordered == 'roll':
-        _time_order_data_and_metadata_roll(
-            sigmet_data, sigmet_metadata, rays_per_sweep)
+        ray_index = ray_index[_time_order_index_roll(
+            ref_time, rays_per_sweep)]
     if time_ordered == 'reverse_and_roll':
         # reverse followed by roll
-        _time_order_data_and_metadata_reverse(
-            sigmet_data, sigmet_metadata, rays_per_sweep)
-        _time_order_data_and_metadata_roll(
-            sigmet_data, sigmet_metadata, rays_per_sweep)
+        order = _time_order_index_reverse(ref_time, rays_per_sweep)
+        order = order[_time_order_index_roll(ref_time[order], rays_per_sweep)]
+        ray_index = ray_index[order]
+
+    # apply the permutation
+    reorder = not np.array_equal(ray_index, np.arange(nsweeps * nrays))
+    in_place = reorder and rays_missing == 0
+    if in_place:
+        sweep_orders = _sweep_orders(ray_index, nsweeps, nrays)
+    for field_name in list(sigmet_data.keys()):
+        fdata = sigmet_data[field_name]
+        if in_place:
+            _permute_sweeps(fdata, sweep_orders)
+        fdata = fdata.reshape((nsweeps * nrays, ) + fdata.shape[2:])
+        if reorder and not in_place:
+            fdata = fdata[ray_index]
+        sigmet_data[field_name] = fdata
+    for field_metadata in sigmet_metadata.values():
+        for key, value in list(field_metadata.items()):
+            if in_place:
+                _permute_sweeps(value, sweep_orders)
+            value = value.reshape(-1)
+            if reorder and not in_place:
+                value = value[ray_index]
+            field_metadata[key] = value
+    if 'XHDR_FULL' in sigmet_data:
+        # the arrays are not modified further and can be shared
+        sigmet_metadata['XHDR_FULL'] = dict(sigmet_metadata['XHDR'])
 
     # sweep_start_ray_index and sweep_end_ray_index
-    ray_count = good_rays.sum(axis=1)
+    ray_count = rays_per_sweep
     total_rays = ray_count.sum()
     sweep_start_ray_index = filemetadata('sweep_start_ray_index')
     sweep_end_ray_index = filemetadata('sweep_end_ray_index')
@@ -348,7 +385,11 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
 
     # sweep_number
     sweep_number = filemetadata('sweep_number')
-    sweep_number['data'] = np.arange(nsweeps, dtype='int32')
+    if sweeps is None:
+        sweep_number['data'] = np.arange(nsweeps, dtype='int32')
+    else:
+        sweep_number['data'] = np.array(
+            sorted(set(sweeps))[:nsweeps], dtype='int32')
 
     # fixed_angle
     fixed_angle = filemetadata('fixed_angle')
@@ -464,22 +505,17 @@ def read_sigmet(filename, field_names=None, additional_metadata=None,
         **extended_header_params)
 
 
-def _is_time_ordered_by_reversal(data, metadata, rays_per_sweep):
+def _is_time_ordered_by_reversal(ref_time, rays_per_sweep):
     """
     Returns if volume can be time ordered by reversing some or all sweeps.
     True if the volume can be time ordered, False if not.
     """
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
     start = 0
     for nrays in rays_per_sweep:
-        if nrays == 0 or nrays == 1:
-            continue    # Do not attempt to order sweeps with no rays
         s = slice(start, start + nrays)     # slice which selects sweep
         start += nrays
+        if nrays == 0 or nrays == 1:
+            continue    # Do not attempt to order sweeps with no rays
         sweep_time_diff = np.diff(ref_time[s])
         if np.all(sweep_time_diff >= 0) or np.all(sweep_time_diff <= 0):
             continue
@@ -488,24 +524,19 @@ def _is_time_ordered_by_reversal(data, metadata, rays_per_sweep):
     return True
 
 
-def _is_time_ordered_by_roll(data, metadata, rays_per_sweep):
+def _is_time_ordered_by_roll(ref_time, rays_per_sweep):
     """
     Returns if volume can be time ordered by rolling some or all sweeps.
     True if the volume can be time ordered, False if not.
     """
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
     start = 0
     for nrays in rays_per_sweep:
-        if nrays == 0 or nrays == 1:
-            continue    # Do not attempt to order sweeps with no rays
         s = slice(start, start + nrays)     # slice which selects sweep
-        first = ref_time[start]
-        last = ref_time[start + nrays - 1]
         start += nrays
+        if nrays == 0 or nrays == 1:
+            continue    # Do not attempt to order sweeps with no rays
+        first = ref_time[s][0]
+        last = ref_time[s][-1]
         sweep_time_diff = np.diff(ref_time[s])
         count = np.count_nonzero(sweep_time_diff < 0)
         # compare the first and last times for continuity
@@ -516,24 +547,19 @@ def _is_time_ordered_by_roll(data, metadata, rays_per_sweep):
     return True
 
 
-def _is_time_ordered_by_reverse_roll(data, metadata, rays_per_sweep):
+def _is_time_ordered_by_reverse_roll(ref_time, rays_per_sweep):
     """
     Returns if volume can be time ordered by reversing and rolling some or all
     sweeps.  True if the volume can be time ordered, False if not.
     """
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
     start = 0
     for nrays in rays_per_sweep:
-        if nrays == 0 or nrays == 1:
-            continue    # Do not attempt to order sweeps with no rays
         s = slice(start, start + nrays)     # slice which selects sweep
-        first = ref_time[start]
-        last = ref_time[start + nrays - 1]
         start += nrays
+        if nrays == 0 or nrays == 1:
+            continue    # Do not attempt to order sweeps with no rays
+        first = ref_time[s][0]
+        last = ref_time[s][-1]
         sweep_time_diff = np.diff(ref_time[s])
         if sweep_time_diff.min() < 0:   # optional reverse
             sweep_time_diff = np.diff(ref_time[s][::-1])
@@ -547,10 +573,10 @@ def _is_time_ordered_by_reverse_roll(data, metadata, rays_per_sweep):
     return True
 
 
-def _time_order_data_and_metadata_roll(data, metadata, rays_per_sweep):
+def _time_order_index_roll(ref_time, rays_per_sweep):
     """
-    Put Sigmet data and metadata in time increasing order using a roll
-    operation.
+    Return the indices which put the rays in time increasing order using a
+    roll operation.
     """
     # Sigmet data is stored by sweep in azimuth or elevation increasing order.
     # Time ordering PPI scans can typically be achieved by rolling the
@@ -558,76 +584,52 @@ def _time_order_data_and_metadata_roll(data, metadata, rays_per_sweep):
     # here.  Perfect time ordering is achieved if the rays within the sweep
     # were collected sequentially in a clockwise manner from 0 to 360 degrees
     # regardless of the first azimuth collected.
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
-
+    index = np.arange(len(ref_time))
     start = 0
     for nrays in rays_per_sweep:
+        s = slice(start, start + nrays)     # slice which selects sweep
+        start += nrays
         if nrays == 0 or nrays == 1:
             continue    # Do not attempt to order sweeps with no rays
 
-        s = slice(start, start + nrays)     # slice which selects sweep
-        start += nrays
         # determine the number of place by which elements should be shifted.
-        sweep_time = ref_time[s]
-        sweep_time_diff = np.diff(sweep_time)
+        sweep_time_diff = np.diff(ref_time[s])
         if sweep_time_diff.min() >= 0:
             continue    # already time ordered
         shift = -(sweep_time_diff.argmin() + 1)
-
-        # roll the data and metadata for each field
-        for field in data.keys():
-            data[field][s] = np.roll(data[field][s], shift, axis=0)
-            field_metadata = metadata[field]
-            for key in field_metadata.keys():
-                field_metadata[key][s] = np.roll(field_metadata[key][s], shift)
-    return
+        index[s] = np.roll(index[s], shift)
+    return index
 
 
-def _time_order_data_and_metadata_reverse(data, metadata, rays_per_sweep):
+def _time_order_index_reverse(ref_time, rays_per_sweep):
     """
-    Put Sigmet data and metadata in time increasing order by reverse sweep in
-    time reversed order.
+    Return the indices which put the rays in time increasing order by
+    reversing sweeps in time reversed order.
     """
     # Sigmet data is stored by sweep in azimuth or elevation increasing order.
     # Time ordering RHI scans can typically be achieved by reversing the
     # ray order of sweep collected in time from 180 to 0 degrees.
     # Perfect time ordering is achieved if the rays within all sweeps
     # were collected sequentially from 0 to 180 degree or 180 to 0 degrees.
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
-
+    index = np.arange(len(ref_time))
     start = 0
     for nrays in rays_per_sweep:
+        s = slice(start, start + nrays)     # slice which selects sweep
+        start += nrays
         if nrays == 0 or nrays == 1:
             continue    # Do not attempt to order sweeps with to few rays
 
-        s = slice(start, start + nrays)     # slice which selects sweep
-        start += nrays
-        # determine the number of place by which elements should be shifted.
-        sweep_time = ref_time[s]
-        sweep_time_diff = np.diff(sweep_time)
+        sweep_time_diff = np.diff(ref_time[s])
         if sweep_time_diff.min() >= 0:
             continue    # already time ordered, no reversal needed
-        # reverse the data and metadata for each field
-        for field in data.keys():
-            data[field][s] = data[field][s][::-1]
-            field_metadata = metadata[field]
-            for key in field_metadata.keys():
-                field_metadata[key][s] = field_metadata[key][s][::-1]
-    return
+        index[s] = index[s][::-1]
+    return index
 
 
-def _time_order_data_and_metadata_full(data, metadata, rays_per_sweep):
+def _time_order_index_full(ref_time, rays_per_sweep):
     """
-    Put Sigmet data and metadata in time increasing order by sorting the
-    times.
+    Return the indices which put the rays in time increasing order by
+    sorting the times.
     """
     # Sigmet data is stored by sweep in azimuth or elevation increasing order.
     # When rays within the sweeps are collected non-sequentially or in a
@@ -636,33 +638,41 @@ def _time_order_data_and_metadata_full(data, metadata, rays_per_sweep):
     # This ordering method should only be used as a last resort when perfect
     # time ordering is required in the output and other ordering operations
     # (roll, reverse, reverse-roll) will not order the rays correctly.
-    if 'XHDR' in data:
-        ref_time = data['XHDR'].copy()
-        ref_time.shape = ref_time.shape[:-1]
-    else:
-        ref_time = metadata[metadata.keys()[0]]['time'].astype('int32')
-
+    index = np.arange(len(ref_time))
     start = 0
     for nrays in rays_per_sweep:
+        s = slice(start, start + nrays)     # slice which selects sweep
+        start += nrays
         if nrays == 0 or nrays == 1:
             continue    # Do not attempt to order sweeps with no rays
 
-        s = slice(start, start + nrays)     # slice which selects sweep
-        start += nrays
         # determine the indices which sort the sweep time using a stable
         # sorting algorithm to prevent excessive azimuth scrambling.
         sweep_time = ref_time[s]
-        sweep_time_diff = np.diff(ref_time[s])
-        if sweep_time_diff.min() >= 0:
+        if np.diff(sweep_time).min() >= 0:
             continue    # already time ordered
-        sort_idx = np.argsort(sweep_time, kind='mergesort')
-
-        # sort the data and metadata for each field
-        for field in data.keys():
-            data[field][s] = data[field][s][sort_idx]
-            field_metadata = metadata[field]
-            for key in field_metadata.keys():
-                field_metadata[key][s] = field_metadata[key][s][sort_idx]
+        index[s] = index[s][np.argsort(sweep_time, kind='mergesort')]
+    return index
+
+
+def _sweep_orders(ray_index, nsweeps, nrays):
+    """
+    Return a list of (sweep, order) tuples for each sweep whose rays are
+    reordered by a permutation of the rays which keeps them in their sweep.
+    """
+    sweep_index = ray_index.reshape(nsweeps, nrays)
+    sweep_index = sweep_index - np.arange(0, nsweeps * nrays, nrays)[:, None]
+    return [(i, order) for i, order in enumerate(sweep_index)
+            if np.any(order != np.arange(nrays))]
+
+
+def _permute_sweeps(data, sweep_orders):
+    """
+    Reorder the rays of the sweeps of an array in place, only a single sweep
+    is copied at a time.
+    """
+    for i, order in sweep_orders:
+        data[i] = data[i][order]
     return
 
 
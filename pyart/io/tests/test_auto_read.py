@@ -98,3 +98,34 @@ def test_determine_filetype():
 def check_filetype(string, filetype):
     f = BytesIO(string)
     assert pyart.io.auto_read.determine_filetype(f) == filetype
+
+
+def test_read_batch():
+    filenames = [pyart.testing.NEXRAD_ARCHIVE_MSG31_COMPRESSED_FILE,
+                 pyart.testing.SIGMET_PPI_FILE,
+                 pyart.testing.CFRADIAL_PPI_FILE]
+    results = list(pyart.io.read_batch(
+        filenames, nprocesses=2, max_in_flight=1,
+        exclude_fields=['reflectivity']))
+    assert [r[0] for r in results] == filenames
+    assert results[0][1].metadata['original_container'] == 'NEXRAD Level II'
+    assert results[1][1].metadata['original_container'] == 'sigmet'
+    assert 'reflectivity' not in results[0][1].fields
+
+    # unordered, errors are returned in place of the radar
+    filenames.append(pyart.testing.INTERP_SOUNDE_FILE)
+    results = dict(pyart.io.read_batch(filenames, nprocesses=2,
+                                       ordered=False))
+    assert len(results) == 4
+    assert isinstance(results[pyart.testing.INTERP_SOUNDE_FILE], Exception)
+    assert results[pyart.testing.SIGMET_PPI_FILE].nrays == 20
+
+    assert_raises(ValueError, pyart.io.read_batch, filenames, nprocesses=0)
+
+
+def test_read_batch_delay_field_loading():
+    results = list(pyart.io.read_batch(
+        [pyart.testing.NEXRAD_ARCHIVE_MSG31_COMPRESSED_FILE],
+        nprocesses=1, delay_field_loading=True))
+    radar = results[0][1]
+    assert radar.fields['reflectivity']['data'].shape == (120, 1832)
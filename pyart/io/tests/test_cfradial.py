@@ -337,6 +337,114 @@ def test_write_rhi():
         dset.close()
 
 
+def test_write_n_gates_vary():
+    radar = pyart.testing.make_empty_ppi_radar(10, 36, 2)
+    data = np.ma.arange(720.).reshape(72, 10)
+    data[np.arange(10) >= np.arange(72)[:, np.newaxis] % 11] = np.ma.masked
+    data[4, 1] = np.ma.masked
+    radar.add_field('reflectivity', {'data': data})
+    radar.add_field('velocity', {'data': data[:, ::-1].copy()})
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_n_gates_vary.nc'
+        pyart.io.write_cfradial(tmpfile, radar, n_gates_vary=True)
+        dset = netCDF4.Dataset(tmpfile)
+        assert dset.n_gates_vary == 'true'
+        assert dset.variables['reflectivity'].dimensions == ('n_points', )
+        ray_n_gates = dset.variables['ray_n_gates'][:]
+        assert_array_equal(ray_n_gates[:12], [0] + [10] * 10 + [0])
+        assert_array_equal(dset.variables['ray_start_index'][:3], [0, 0, 10])
+        dset.close()
+
+        radar2 = pyart.io.read_cfradial(tmpfile)
+        for field_name in ['reflectivity', 'velocity']:
+            data = radar.fields[field_name]['data']
+            data2 = radar2.fields[field_name]['data']
+            assert_array_equal(data2.mask, data.mask)
+            assert_array_equal(data2.filled(-1), data.filled(-1))
+
+
+def test_write_n_gates_vary_all_masked():
+    radar = pyart.testing.make_empty_ppi_radar(10, 36, 2)
+    data = np.ma.masked_all((72, 10))
+    radar.add_field('reflectivity', {'data': data})
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_n_gates_vary_all_masked.nc'
+        pyart.io.write_cfradial(tmpfile, radar, n_gates_vary=True)
+        dset = netCDF4.Dataset(tmpfile)
+        assert len(dset.dimensions['n_points']) == 1
+        assert not dset.dimensions['n_points'].isunlimited()
+        assert_array_equal(dset.variables['ray_n_gates'][:3], [1, 0, 0])
+        dset.close()
+
+        radar2 = pyart.io.read_cfradial(tmpfile)
+        data2 = radar2.fields['reflectivity']['data']
+        assert data2.shape == (72, 10)
+        assert np.all(data2.mask)
+
+
+def test_write_n_gates_vary_empty_sweep():
+    radar = pyart.testing.make_empty_ppi_radar(10, 36, 2)
+    data = np.ma.ones((72, 10))
+    data[:36, 2:] = np.ma.masked
+    radar.add_field('reflectivity', {'data': data})
+    # trailing sweep with no rays
+    radar.nsweeps = 3
+    for attr in ['sweep_number', 'fixed_angle', 'sweep_mode']:
+        dic = getattr(radar, attr)
+        dic['data'] = np.append(dic['data'], dic['data'][-1:])
+    radar.sweep_start_ray_index['data'] = np.array([0, 36, 72])
+    radar.sweep_end_ray_index['data'] = np.array([35, 71, 71])
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_n_gates_vary_empty_sweep.nc'
+        pyart.io.write_cfradial(
+            tmpfile, radar, n_gates_vary=True, profile='fast')
+        dset = netCDF4.Dataset(tmpfile)
+        assert dset.variables['reflectivity'].chunking() == [360]
+        dset.close()
+
+def test_write_profile():
+    radar = pyart.testing.make_empty_ppi_radar(10, 36, 2)
+    data = np.ma.arange(720.).reshape(72, 10) / 10.
+    data[0, :5] = np.ma.masked
+    data[1, 0] = np.nan
+    radar.add_field('reflectivity', {'data': data})
+    radar.add_field('counts', {'data': np.ones((72, 10), dtype='int32')})
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_profile.nc'
+        for profile, dtype in [('fast', np.float64), ('archive', np.int16),
+                               ('compact', np.int8)]:
+            pyart.io.write_cfradial(tmpfile, radar, profile=profile)
+            dset = netCDF4.Dataset(tmpfile)
+            ncvar = dset.variables['reflectivity']
+            assert ncvar.dtype == dtype
+            assert ncvar.chunking() == [36, 10]
+            assert dset.variables['counts'].dtype == np.int32
+            dset.close()
+
+            radar2 = pyart.io.read_cfradial(tmpfile)
+            data2 = radar2.fields['reflectivity']['data']
+            # non-finite values are masked when packing into integers
+            assert data2.mask[1, 0] == (profile != 'fast')
+            assert_array_equal(data2.mask[0], [True] * 5 + [False] * 5)
+            assert np.ma.max(np.abs(data2 - np.ma.masked_invalid(data))) < 0.2
+        assert '_Write_as_dtype' not in radar.fields['reflectivity']
+
+        assert_raises(ValueError, pyart.io.write_cfradial, tmpfile, radar,
+                      profile='foo')
+
+
+def test_unpack_variable_gate_data():
+    fdata = np.ma.arange(6.)
+    fdata[2] = np.ma.masked
+    data = pyart.io.cfradial._unpack_variable_gate_data(
+        fdata, (4, 3), np.array([1, 3, 0, 2]), np.array([0, 1, 4, 4]))
+    assert_array_equal(data.filled(-1), [[0, -1, -1], [1, -1, 3],
+                                         [-1, -1, -1], [4, 5, -1]])
+    packed = pyart.io.cfradial._pack_variable_gate_data(
+        data, np.array([1, 3, 0, 2]))
+    assert_array_equal(packed.filled(-1), fdata.filled(-1))
+
+
 def test_write_ppi_arm_time_vars():
     # CF/Radial example file -> Radar object -> netCDF file
     with pyart.testing.InTemporaryDirectory():
@@ -488,6 +596,65 @@ def test_delay_field_loading():
     assert_almost_equal(data[0, 0], -6.0, 0)
 
 
+def test_delay_field_loading_sweeps():
+    radar = pyart.testing.make_empty_ppi_radar(10, 36, 3)
+    data = np.ma.arange(1080.).reshape(108, 10)
+    radar.add_field('reflectivity', {'data': data})
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_delay_field_loading_sweeps.nc'
+        pyart.io.write_cfradial(tmpfile, radar)
+        lradar = pyart.io.read_cfradial(tmpfile, delay_field_loading=True)
+        field = lradar.fields['reflectivity']
+
+        # only the selected sweeps are read, the field is not loaded
+        assert_array_equal(lradar.get_field(1, 'reflectivity'), data[36:72])
+        eradar = lradar.extract_sweeps([0, 2])
+        assert_array_equal(eradar.fields['reflectivity']['data'],
+                           np.ma.concatenate([data[:36], data[72:]]))
+        assert field.get_lazy('data') is not None
+
+        assert_array_equal(field['data'], data)
+        assert field.get_lazy('data') is None
+        assert_array_equal(lradar.get_field(2, 'reflectivity'), data[72:])
+
+
+def test_netcdf_variable_data_extractor_get_rays():
+    with pyart.testing.InTemporaryDirectory():
+        dset = netCDF4.Dataset('tmp_get_rays.nc', 'w', diskless=True)
+        dset.createDimension('time', 4)
+        dset.createDimension('range', 2)
+        ncvar = dset.createVariable('field', 'f4', ('time', 'range'))
+        ncvar[:] = np.arange(8.).reshape(4, 2)
+
+        extractor = pyart.io.cfradial._NetCDFVariableDataExtractor(
+            ncvar, cache_size=1)
+        rays = extractor.get_rays(1, 3)
+        assert_array_equal(rays, [[2, 3], [4, 5]])
+        assert extractor.get_rays(1, 3) is rays
+        # least recently used rays are discarded from the cache
+        assert_array_equal(extractor.get_rays(0, 1), [[0, 1]])
+        assert extractor.get_rays(1, 3) is not rays
+        dset.close()
+
+
+def test_netcdf_variable_gate_data_extractor():
+    with pyart.testing.InTemporaryDirectory():
+        dset = netCDF4.Dataset('tmp_n_points.nc', 'w', diskless=True)
+        dset.createDimension('n_points', 6)
+        ncvar = dset.createVariable('field', 'f4', ('n_points', ))
+        ncvar[:] = np.arange(6.)
+
+        extractor = pyart.io.cfradial._NetCDFVariableGateDataExtractor(
+            ncvar, (3, 3), np.array([1, 3, 2]), np.array([0, 1, 4]))
+        data = extractor()
+        assert_array_equal(data.filled(-1), [[0, -1, -1], [1, 2, 3],
+                                             [4, 5, -1]])
+        rays = extractor.get_rays(1, 3)
+        assert_array_equal(rays.filled(-1), data[1:3].filled(-1))
+        assert_array_equal(rays.mask, data.mask[1:3])
+        dset.close()
+
+
 def test_create_ncvar_different_dtype():
     # test _Write_as_dtype key handling in _create_ncvar
     with pyart.testing.InTemporaryDirectory():
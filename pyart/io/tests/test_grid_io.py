@@ -4,7 +4,7 @@ from __future__ import print_function
 
 import netCDF4
 import numpy as np
-from numpy.testing import assert_almost_equal, assert_warns
+from numpy.testing import assert_almost_equal, assert_warns, assert_raises
 
 import pyart
 from pyart.io.common import stringarray_to_chararray
@@ -109,6 +109,29 @@ def test_grid_write_point_vars():
         dset.close()
 
 
+def test_grid_write_profile():
+    grid1 = pyart.testing.make_target_grid()
+    data = grid1.fields['reflectivity']['data']
+
+    with pyart.testing.InTemporaryDirectory():
+        tmpfile = 'tmp_grid.nc'
+        pyart.io.write_grid(tmpfile, grid1, profile='archive')
+        dset = netCDF4.Dataset(tmpfile, 'r')
+        ncvar = dset.variables['reflectivity']
+        assert ncvar.dtype == np.int16
+        assert ncvar.chunking() == [1, 1, 400, 320]
+        assert ncvar.filters()['zlib']
+        assert ncvar.filters()['shuffle']
+        dset.close()
+
+        grid2 = pyart.io.read_grid(tmpfile)
+        assert_almost_equal(grid2.fields['reflectivity']['data'], data, 2)
+        assert '_Write_as_dtype' not in grid1.fields['reflectivity']
+
+        assert_raises(ValueError, pyart.io.write_grid, tmpfile, grid1,
+                      profile='foo')
+
+
 def test_grid_write_arm_time_vars():
     grid1 = pyart.testing.make_target_grid()
 
@@ -1,7 +1,9 @@
 """ Unit Tests for Py-ART's io/nexrad_archive.py module using a MSG31 file. """
 
+from io import BytesIO
+
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_raises
 from numpy.ma.core import MaskedArray
 
 import pyart
@@ -283,3 +285,32 @@ def test_compressed_archive():
     assert_almost_equal(rdata[2, 0], 9.5, 1)
     assert 'velocity' not in radar.fields.keys()
     assert 'spectrum_width' not in radar.fields.keys()
+
+
+def test_chunk_reader():
+    # split the first two scans of the file into real-time chunks
+    chunks = pyart.testing.make_nexrad_archive_chunks(1440, 240)
+
+    reader = pyart.io.NEXRADArchiveChunkReader()
+    assert reader.add_chunk(BytesIO(chunks[0])) == []
+    assert reader.radar is None
+    completed = [reader.add_chunk(BytesIO(chunk)) for chunk in chunks[1:]]
+    assert completed == [[], [], [0], [], [], [1]]
+    assert reader.nsweeps == 2
+    assert_raises(ValueError, reader.get_sweeps, [2])
+
+    sweep = reader.get_sweeps([1])
+    assert sweep.nrays == 720
+    assert 'velocity' in sweep.fields
+
+    # radar of completed sweeps matches one read from the full file
+    ref = pyart.io.read_nexrad_archive(
+        pyart.testing.NEXRAD_ARCHIVE_MSG31_FILE, scans=[0, 1])
+    assert reader.radar.nsweeps == 2
+    assert reader.radar.time['units'] == ref.time['units']
+    assert_almost_equal(reader.radar.time['data'], ref.time['data'])
+    assert_almost_equal(reader.radar.azimuth['data'], ref.azimuth['data'])
+    for field in ref.fields:
+        data = reader.radar.fields[field]['data']
+        assert np.ma.allequal(data, ref.fields[field]['data'])
+        assert np.all(data.mask == ref.fields[field]['data'].mask)
@@ -388,3 +388,107 @@ def test_1ms_vel_message():
     # check the velocity scale
     new_pos, dic = nexrad_level2._get_record_from_buf(fake_buf, 0)
     assert dic['VEL']['scale'] == 1.0
+
+
+def test_scans():
+    uncompressed_file = bz2.BZ2File(
+        pyart.testing.NEXRAD_ARCHIVE_MSG31_FILE, 'rb')
+    sfile = nexrad_level2.NEXRADLevel2File(uncompressed_file, scans=[0, 10])
+    sfile.close()
+
+    # only the radials in the requested scans are decoded
+    assert len(sfile.radial_records) == 1080
+    assert sfile.nscans == 11
+    assert len(sfile.scan_msgs[1]) == 0
+    assert sfile.scan_msgs[10][10] == 730
+
+    # the requested scans match those from a full decode
+    for scan in [0, 10]:
+        assert_array_equal(sfile.get_azimuth_angles([scan]),
+                           nfile.get_azimuth_angles([scan]))
+        assert_array_equal(sfile.get_data('REF', 1832, [scan]),
+                           nfile.get_data('REF', 1832, [scan]))
+    time_start, time = sfile.get_times([10])
+    assert time_start == nfile.get_times([10])[0]
+    assert_array_equal(time, nfile.get_times([10])[1])
+
+
+def test_compressed_scans():
+    sfile = nexrad_level2.NEXRADLevel2File(COMPRESSED_FILE, scans=[0])
+    assert len(sfile.radial_records) == 120
+    assert_array_equal(sfile.get_data('REF', 1832, [0]),
+                       cfile.get_data('REF', 1832, [0]))
+    sfile.close()
+
+    # no radials from later scans in the compressed archive
+    assert_raises(ValueError, nexrad_level2.NEXRADLevel2File,
+                  COMPRESSED_FILE, scans=[1])
+
+
+def test_find_ldm_blocks():
+    with open(COMPRESSED_FILE, 'rb') as f:
+        cbuf = f.read()
+    blocks = nexrad_level2._find_ldm_blocks(cbuf)
+    assert blocks == [(28, 12555), (12559, 118286)]
+
+    # blocks are found by decompression when the control words are invalid
+    bad_cbuf = cbuf[:12555] + b'\x00\x00\x00\x01' + cbuf[12559:]
+    assert nexrad_level2._find_ldm_blocks(bad_cbuf) == blocks
+
+
+def test_columns_match_records():
+    # data gathered from all rays at once matches the unpacked records
+    data = cfile.get_data('PHI', 1192, [0], True)
+    for i, record in enumerate(cfile.radial_records):
+        assert_array_equal(data[i], record['PHI']['data'])
+    azimuths = [r['msg_header']['azimuth_angle'] for r in cfile.radial_records]
+    assert_array_equal(cfile.get_azimuth_angles([0]), azimuths)
+    nyquist = [r['RAD']['nyquist_vel'] * 0.01 for r in cfile.radial_records]
+    assert_array_equal(cfile.get_nyquist_vel([0]), nyquist)
+
+
+def test_gather():
+    buffers = [bytes(bytearray(range(20))), bytes(bytearray(range(100, 120)))]
+    buf_nums = np.array([0, 0, 0, 1, 1])
+    starts = np.array([0, 5, 10, 2, 3])
+    out = nexrad_level2._gather(buffers, buf_nums, starts, 4)
+    assert_array_equal(out[:, 0], [0, 5, 10, 102, 103])
+    assert_array_equal(out[2], [10, 11, 12, 13])
+
+    # rows which are not equally spaced
+    starts = np.array([0, 1, 10, 2, 9])
+    out = nexrad_level2._gather(buffers, buf_nums, starts, 4)
+    assert_array_equal(out[:, 0], [0, 1, 10, 102, 109])
+    assert_array_equal(out[4], [109, 110, 111, 112])
+
+
+def test_compressed_nthreads():
+    tfile = nexrad_level2.NEXRADLevel2File(COMPRESSED_FILE, nthreads=2)
+    assert len(tfile.radial_records) == 120
+    assert_array_equal(tfile.get_data('REF', 1832, [0]),
+                       cfile.get_data('REF', 1832, [0]))
+    tfile.close()
+
+    sfile = nexrad_level2.NEXRADLevel2File(
+        COMPRESSED_FILE, scans=[0], nthreads=3)
+    assert_array_equal(sfile.get_azimuth_angles([0]),
+                       cfile.get_azimuth_angles([0]))
+    sfile.close()
+
+    assert_raises(ValueError, nexrad_level2.NEXRADLevel2File,
+                  COMPRESSED_FILE, nthreads=0)
+
+
+def test_chunk_file():
+    chunks = pyart.testing.make_nexrad_archive_chunks(1560, 120)
+    chunk_file = nexrad_level2.NEXRADLevel2ChunkFile()
+    completed = [chunk_file.add_chunk(BytesIO(chunk)) for chunk in chunks]
+    # start of volume, 720 radials in each of the first two scans
+    assert completed == [[]] * 6 + [[0]] + [[]] * 5 + [[1], []]
+    assert chunk_file.nscans_complete == 2
+    assert chunk_file.nscans == 3
+    assert chunk_file.volume_header == nfile.volume_header
+    assert chunk_file.get_vcp_pattern() == nfile.get_vcp_pattern()
+    assert_array_equal(chunk_file.get_data('REF', 1832, [0, 1]),
+                       nfile.get_data('REF', 1832, [0, 1]))
+    assert_array_equal(chunk_file.get_times([1])[1], nfile.get_times([1])[1])
@@ -1,7 +1,11 @@
 """ Unit Tests for Py-ART's io/sigmet.py module. """
 
+import io
+import struct
+
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_array_equal
+from numpy.testing import assert_raises
 from numpy.ma.core import MaskedArray
 
 import pyart
@@ -369,3 +373,147 @@ def test_1byte_datatype():
     result = pyart.io._sigmetfile.convert_sigmet_data(data_type, data, nbins)
     assert np.all(result == -31.5)
     assert result.shape == (2, 2)
+
+
+####################
+# selective reads #
+####################
+
+def _make_multi_sweep_sigmet_file(nsweeps, ray_times=None,
+                                  missing_rays=()):
+    """
+    Return a file-like object containing a Sigmet file with nsweeps sweeps of
+    DBT2, DBZ2, VEL2, WIDTH2 and ZDR2 data created from the example PPI file.
+    The rays of each sweep span two records.  ray_times sets the times of the
+    20 rays in each sweep, rays in missing_rays are not collected.
+    """
+    if ray_times is None:
+        ray_times = range(20)
+    data_types = [8, 9, 10, 11, 12]
+    with open(pyart.testing.SIGMET_PPI_FILE, 'rb') as f:
+        headers = bytearray(f.read(2 * 6144))
+        ingest_data_header = bytearray(f.read(6144)[12:88])
+    # current_data_type_mask and number_sweeps in the ingest_header
+    struct.pack_into('<I', headers, 6772, sum(2 ** i for i in data_types))
+    struct.pack_into('<h', headers, 7574, nsweeps)
+
+    records = [bytes(headers)]
+    for sweep in range(nsweeps):
+        words = [np.zeros(6, dtype='int16')]   # raw_prod_bhdr
+        struct.pack_into('<h', ingest_data_header, 24, sweep + 1)
+        for data_type in data_types:
+            struct.pack_into('<H', ingest_data_header, 38, data_type)
+            words.append(np.frombuffer(bytes(ingest_data_header), 'int16'))
+        for ray in range(20):
+            for i, data_type in enumerate(data_types):
+                if ray in missing_rays:
+                    words.append(np.ones((1), dtype='int16'))
+                    continue
+                code = np.ones((33), dtype='int16')
+                code[0] = -32737    # 31 values follow
+                code.view('uint16')[1] = 182 * 18 * ray    # az0
+                code[2] = 91        # el0
+                code.view('uint16')[3] = 182 * 18 * ray    # az1
+                code[4] = 91        # el1
+                code[5] = 25        # nbins
+                code[6] = ray_times[ray]   # time
+                code[7:-1] = 1000 * sweep + 100 * i + ray
+                words.append(code)
+        words = np.concatenate(words)
+
+        # split the sweep into records each starting with a raw_prod_bhdr
+        start = 6
+        while start < len(words):
+            record = np.zeros(3072, dtype='int16')
+            record[:6] = [len(records), sweep + 1, 0, 0, 0, 0]
+            record_words = words[start:start + 3066]
+            record[6:6 + len(record_words)] = record_words
+            records.append(record.tostring())
+            start += 3066
+    return io.BytesIO(b''.join(records))
+
+
+def test_read_sigmet_sweeps():
+    full_radar = pyart.io.read_sigmet(
+        _make_multi_sweep_sigmet_file(3), file_field_names=True)
+    assert full_radar.nsweeps == 3
+    assert len(full_radar.fields) == 5
+
+    for sweeps in [[1], [0, 2], [2]]:
+        radar = pyart.io.read_sigmet(
+            _make_multi_sweep_sigmet_file(3), file_field_names=True,
+            sweeps=sweeps)
+        ref_radar = full_radar.extract_sweeps(sweeps)
+        assert_array_equal(radar.sweep_number['data'], sweeps)
+        assert_array_equal(radar.azimuth['data'], ref_radar.azimuth['data'])
+        assert_array_equal(radar.time['data'], ref_radar.time['data'])
+        for field_name in full_radar.fields:
+            assert_array_equal(radar.fields[field_name]['data'],
+                               ref_radar.fields[field_name]['data'])
+
+    assert_raises(ValueError, pyart.io.read_sigmet,
+                  _make_multi_sweep_sigmet_file(3), sweeps=[3])
+
+
+def test_read_sigmet_exclude_fields():
+    full_radar = pyart.io.read_sigmet(
+        _make_multi_sweep_sigmet_file(2), file_field_names=True)
+    radar = pyart.io.read_sigmet(
+        _make_multi_sweep_sigmet_file(2), file_field_names=True,
+        exclude_fields=['DBT2', 'VEL2', 'WIDTH2', 'ZDR2'], sweeps=[1])
+    assert list(radar.fields.keys()) == ['DBZ2']
+    assert_array_equal(radar.fields['DBZ2']['data'],
+                       full_radar.get_field(1, 'DBZ2'))
+    assert_array_equal(radar.azimuth['data'], full_radar.get_azimuth(1))
+
+
+def test_sigmetfile_read_data_data_type_names():
+    sigmetfile = pyart.io._sigmetfile.SigmetFile(
+        _make_multi_sweep_sigmet_file(2))
+    data, metadata = sigmetfile.read_data(data_type_names=['VEL2'])
+    sigmetfile.close()
+    assert list(data.keys()) == ['VEL2']
+    assert data['VEL2'].shape == (2, 20, 25)
+    assert len(metadata) == 5
+    assert_array_equal(metadata['DBT2']['nbins'], 25)
+
+
+def test_time_order_index():
+    ref_time = np.array([2, 3, 0, 1, 5, 4, 3, 7, 6, 8])
+    rays_per_sweep = [4, 1, 2, 3]
+    index = pyart.io.sigmet._time_order_index_roll(ref_time, rays_per_sweep)
+    assert_array_equal(index, [2, 3, 0, 1, 4, 6, 5, 8, 9, 7])
+    index = pyart.io.sigmet._time_order_index_reverse(
+        ref_time, rays_per_sweep)
+    assert_array_equal(index, [3, 2, 1, 0, 4, 6, 5, 9, 8, 7])
+    index = pyart.io.sigmet._time_order_index_full(ref_time, rays_per_sweep)
+    assert_array_equal(index, [2, 3, 0, 1, 4, 6, 5, 8, 7, 9])
+
+
+def test_read_sigmet_time_ordered():
+    # with missing rays the rays are permuted into new arrays, without them
+    # the rays of each sweep are permuted in place.
+    for missing_rays in [[3], []]:
+        yield check_read_sigmet_time_ordered, missing_rays
+
+
+def check_read_sigmet_time_ordered(missing_rays):
+    ray_times = np.roll(np.arange(20), 5)
+    radar = pyart.io.read_sigmet(
+        _make_multi_sweep_sigmet_file(2, ray_times, missing_rays),
+        file_field_names=True)
+    assert radar.nrays == 40 - 2 * len(missing_rays)
+    for time_ordered in ['sequential', 'roll', 'full']:
+        ordered_radar = pyart.io.read_sigmet(
+            _make_multi_sweep_sigmet_file(2, ray_times, missing_rays),
+            file_field_names=True, time_ordered=time_ordered)
+        for sweep in range(2):
+            time = ordered_radar.time['data'][ordered_radar.get_slice(sweep)]
+            assert np.all(np.diff(time) >= 0)
+            order = np.argsort(radar.time['data'][radar.get_slice(sweep)])
+            assert_array_equal(ordered_radar.get_azimuth(sweep),
+                               radar.get_azimuth(sweep)[order])
+            for field_name in radar.fields:
+                assert_array_equal(
+                    ordered_radar.get_field(sweep, field_name),
+                    radar.get_field(sweep, field_name)[order])
@@ -127,3 +127,11 @@ class LazyLoadDict(collections.MutableMapping):
         if key in self._dic:
             del self._dic[key]
         self._lazyload[key] = value_callable
+
+    def get_lazy(self, key, default=None):
+        """
+        Return the callable object of a lazy key without evaluating it.
+
+        default is returned if the key is not lazy or has been loaded.
+        """
+        return self._lazyload.get(key, default)
@@ -17,6 +17,9 @@ coordinates to Cartesian coordinates.
     example_roi_func_constant
     example_roi_func_dist
     example_roi_func_dist_beam
+    build_gate_to_grid_weights
+    read_gate_to_grid_weights
+    GateToGridWeights
 
 """
 
@@ -25,5 +28,8 @@ from .grid_mapper import example_roi_func_constant
 from .grid_mapper import example_roi_func_dist
 from .grid_mapper import example_roi_func_dist_beam
 from .gates_to_grid import map_gates_to_grid
+from .gate_to_grid_weights import GateToGridWeights
+from .gate_to_grid_weights import build_gate_to_grid_weights
+from .gate_to_grid_weights import read_gate_to_grid_weights
 
 __all__ = [s for s in dir() if not s.startswith('_')]
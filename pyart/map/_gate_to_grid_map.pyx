@@ -14,6 +14,7 @@ a uniform grid.
     ConstantRoI
     DistRoI
     DistBeamRoI
+    find_roi_for_gates
 
 """
 
@@ -241,7 +242,9 @@ cdef class GateToGridMapper:
         Map radar gates unto the regular grid.
 
         The grid_sum and grid_wsum arrays used to initalize the class
-        are update with the mapped gate data.
+        are update with the mapped gate data.  The GIL is released while
+        the gates are mapped so multiple instances, each with their own
+        grid_sum and grid_wsum arrays, can map gates in separate threads.
 
         Parameters
         ----------
@@ -270,26 +273,32 @@ cdef class GateToGridMapper:
 
         """
 
-        cdef float roi
-        cdef float[:] values
-        cdef char[:] masks
-        cdef float x, y, z
+        cdef float[:, ::1] gate_roi
+        cdef int nray, ngate
 
-        for nray in range(nrays):
-            for ngate in range(ngates):
+        if nrays == 0 or ngates == 0:
+            return
 
-                # continue if gate excluded
-                if excluded_gates[nray, ngate]:
-                    continue
+        # the radius of influence of every gate is found before mapping as
+        # RoIFunction objects may be implemented in Python.
+        gate_roi = cvarray(
+            shape=(nrays, ngates), itemsize=sizeof(float), format='f')
+        find_roi_for_gates(
+            gate_roi, gate_z, gate_y, gate_x, excluded_gates, roi_func)
 
-                x = gate_x[nray, ngate]
-                y = gate_y[nray, ngate]
-                z = gate_z[nray, ngate]
-                roi = roi_func.get_roi(z, y, x)
-                values = field_data[nray, ngate]
-                masks = field_mask[nray, ngate]
+        with nogil:
+            for nray in range(nrays):
+                for ngate in range(ngates):
 
-                self.map_gate(x, y, z, roi, values, masks, weighting_function)
+                    # continue if gate excluded
+                    if excluded_gates[nray, ngate]:
+                        continue
+
+                    self.map_gate(
+                        gate_x[nray, ngate], gate_y[nray, ngate],
+                        gate_z[nray, ngate], gate_roi[nray, ngate],
+                        field_data[nray, ngate], field_mask[nray, ngate],
+                        weighting_function)
 
     @cython.initializedcheck(False)
     @cython.cdivision(True)
@@ -297,12 +306,12 @@ cdef class GateToGridMapper:
     @cython.wraparound(False)
     cdef int map_gate(self, float x, float y, float z, float roi,
                       float[:] values, char[:] masks,
-                      int weighting_function):
+                      int weighting_function) nogil:
         """ Map a single gate to the grid. """
 
         cdef float xg, yg, zg, dist, weight, roi2, dist2
         cdef int x_min, x_max, y_min, y_max, z_min, z_max
-        cdef int xi, yi, zi
+        cdef int xi, yi, zi, i
 
         # shift positions so that grid starts at 0
         x -= self.x_start
@@ -354,8 +363,42 @@ cdef class GateToGridMapper:
         return 1
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def find_roi_for_gates(
+        float[:, ::1] roi_array, float[:, ::1] gate_z, float[:, ::1] gate_y,
+        float[:, ::1] gate_x, char[:, ::1] excluded_gates,
+        RoIFunction roi_func):
+    """
+    Fill in the radius of influence for each radar gate.
+
+    Parameters
+    ----------
+    roi_array : 2D float32 array
+        Array which will be filled by the radius of influence for each
+        gate.  Elements for excluded gates are not modified.
+    gate_z, gate_y, gate_x : 2D float32 array
+        Cartesian locations of the gates in meters.
+    excluded_gates : 2D uint8 array
+        Array containing gate masking information.  The radius of influence
+        is not found for gates with non-zero values.
+    roi_func : RoIFunction
+        Object whose get_roi method returns the radius of influence.
+
+    """
+    cdef int nray, ngate
+    for nray in range(roi_array.shape[0]):
+        for ngate in range(roi_array.shape[1]):
+            if excluded_gates[nray, ngate]:
+                continue
+            roi_array[nray, ngate] = roi_func.get_roi(
+                gate_z[nray, ngate], gate_y[nray, ngate],
+                gate_x[nray, ngate])
+    return
+
+
 @cython.cdivision(True)
-cdef int find_min(float a, float roi, float step):
+cdef int find_min(float a, float roi, float step) nogil:
     """ Find the mimumum gate index for a dimension. """
     cdef int a_min
     if step == 0:
@@ -367,7 +410,7 @@ cdef int find_min(float a, float roi, float step):
 
 
 @cython.cdivision(True)
-cdef int find_max(float a, float roi, float step, int na):
+cdef int find_max(float a, float roi, float step, int na) nogil:
     """ Find the maximum gate index for a dimension. """
     cdef int a_max
     if step == 0:
@@ -1377,7 +1377,7 @@ cdef class cKDTree:
         return results
 
 
-    def query_ball_point(cKDTree self, object x, np.float64_t r,
+    def query_ball_point(cKDTree self, object x, object r,
                          np.float64_t p=2., np.float64_t eps=0):
         """query_ball_point(self, x, r, p, eps)
         
@@ -1387,8 +1387,9 @@ cdef class cKDTree:
         ----------
         x : array_like, shape tuple + (self.m,)
             The point or points to search for neighbors of.
-        r : positive float
-            The radius of points to return.
+        r : array_like, float
+            The radius of points to return, shall broadcast to the length of
+            x.
         p : float, optional
             Which Minkowski p-norm to use.  Should be in the range [1, inf].
         eps : nonnegative float, optional
@@ -1421,6 +1422,8 @@ cdef class cKDTree:
 
         """
         cdef np.ndarray[np.float64_t, ndim=1, mode="c"] xx
+        cdef np.ndarray[np.float64_t, ndim=1, mode="c"] rr
+        cdef np.intp_t i
         
         x = np.asarray(x).astype(np.float64)
         if x.shape[-1] != self.m:
@@ -1428,14 +1431,18 @@ cdef class cKDTree:
                              "%d-dimensional KDTree" % (int(x.shape[-1]), int(self.m)))
         if len(x.shape) == 1:
             xx = np.ascontiguousarray(x, dtype=np.float64)
-            return self.__query_ball_point(&xx[0], r, p, eps)
+            return self.__query_ball_point(&xx[0], float(r), p, eps)
         else:
             retshape = x.shape[:-1]
-            result = np.empty(retshape, dtype=np.object)
-            for c in np.ndindex(retshape):
-                xx = np.ascontiguousarray(x[c], dtype=np.float64)
-                result[c] = self.__query_ball_point(&xx[0], r, p, eps)
-            return result
+            xx = np.ascontiguousarray(
+                x.reshape(-1, self.m), dtype=np.float64).ravel()
+            rr = np.ascontiguousarray(
+                np.broadcast_to(r, retshape), dtype=np.float64).ravel()
+            result = np.empty(rr.shape[0], dtype=np.object)
+            for i in range(rr.shape[0]):
+                result[i] = self.__query_ball_point(
+                    &xx[i * self.m], rr[i], p, eps)
+            return result.reshape(retshape)
 
     # ---------------
     # query_ball_tree
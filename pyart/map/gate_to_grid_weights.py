@@ -0,0 +1,387 @@
+"""
+pyart.map.gate_to_grid_weights
+==============================
+
+Precomputed gate to grid weights for repeatedly mapping radar volumes which
+share a scan strategy onto the same Cartesian grid.
+
+.. autosummary::
+    :toctree: generated/
+
+    build_gate_to_grid_weights
+    read_gate_to_grid_weights
+    _weights_for_gates
+
+.. autosummary::
+    :toctree: generated/
+    :template: dev_template.rst
+
+    GateToGridWeights
+
+"""
+
+import numpy as np
+import scipy.sparse
+
+from ..core.radar import Radar
+from ..filters import GateFilter, moment_based_gate_filter
+from ._gate_to_grid_map import GateToGridMapper, find_roi_for_gates
+from .ckdtree import cKDTree
+from .gates_to_grid import _detemine_cy_weighting_func, _find_projparams
+from .gates_to_grid import _parse_gatefilters, _determine_fields
+from .gates_to_grid import _find_offsets, _find_grid_params
+from .gates_to_grid import _find_gate_locations, _parse_roi_func
+
+
+class GateToGridWeights(object):
+    """
+    Sparse weights which map radar gates onto a Cartesian grid.
+
+    The weights are stored as a sparse matrix with one row for each grid
+    point and one column for each radar gate.  Mapping a field is a sparse
+    matrix-vector product, the gates included in the mapping can change
+    from volume to volume.  Instances should be created using
+    :py:func:`build_gate_to_grid_weights` or
+    :py:func:`read_gate_to_grid_weights`.
+
+    Attributes
+    ----------
+    weights : scipy.sparse.csr_matrix
+        Weight of each gate (columns) for each grid point (rows).  Gates are
+        ordered by radar then flattened (ray, gate) index, grid points by
+        their flattened (z, y, x) index.
+    grid_shape : tuple of ints
+        Number of points in the grid (z, y, x).
+    roi : 3D float32 array
+        Radius of influence at each grid point, in meters.
+    azimuths, elevations, ranges : list of arrays
+        Azimuth and elevation angles of each ray and range to each gate for
+        the radars used to build the weights.
+    angle_tol : float
+        Largest difference, in degrees, in the azimuth or elevation of a ray
+        for which a volume is considered to have the same geometry.
+    range_tol : float
+        Largest difference, in meters, in the range to a gate for which a
+        volume is considered to have the same geometry.
+
+    """
+
+    def __init__(self, weights, grid_shape, roi, azimuths, elevations,
+                 ranges, angle_tol=0.5, range_tol=1.0):
+        """ initialize the object. """
+        self.weights = weights.tocsr()
+        self.grid_shape = tuple(int(i) for i in grid_shape)
+        self.roi = roi
+        self.azimuths = [np.asarray(a) for a in azimuths]
+        self.elevations = [np.asarray(e) for e in elevations]
+        self.ranges = [np.asarray(r) for r in ranges]
+        self.angle_tol = angle_tol
+        self.range_tol = range_tol
+
+    def check_geometry(self, radars):
+        """
+        Check that radars have the geometry used to build the weights.
+
+        Parameters
+        ----------
+        radars : Radar or tuple of Radar objects.
+            Radar objects to check.
+
+        Raises
+        ------
+        ValueError
+            When the number of radars, rays or gates differ or when the
+            azimuth, elevation or range of any ray or gate differs by more
+            than the tolerances.
+
+        """
+        if isinstance(radars, Radar):
+            radars = (radars, )
+        if len(radars) != len(self.ranges):
+            raise ValueError(
+                'Weights built for %d radars, %d given' %
+                (len(self.ranges), len(radars)))
+        for i, radar in enumerate(radars):
+            if (radar.nrays != len(self.azimuths[i]) or
+                    radar.ngates != len(self.ranges[i])):
+                raise ValueError(
+                    'Radar %d shape (%d, %d) does not match the weights '
+                    'shape (%d, %d)' % (
+                        i, radar.nrays, radar.ngates,
+                        len(self.azimuths[i]), len(self.ranges[i])))
+            # azimuth differences are wrapped into [-180, 180)
+            az_diff = radar.azimuth['data'] - self.azimuths[i]
+            az_diff = (az_diff + 180.) % 360. - 180.
+            if np.any(np.abs(az_diff) > self.angle_tol):
+                raise ValueError(
+                    'Radar %d azimuth angles do not match the weights' % (i))
+            el_diff = radar.elevation['data'] - self.elevations[i]
+            if np.any(np.abs(el_diff) > self.angle_tol):
+                raise ValueError(
+                    'Radar %d elevation angles do not match the weights' %
+                    (i))
+            rng_diff = radar.range['data'] - self.ranges[i]
+            if np.any(np.abs(rng_diff) > self.range_tol):
+                raise ValueError(
+                    'Radar %d gate ranges do not match the weights' % (i))
+        return
+
+    def map_gates_to_grid(self, radars, fields=None, gatefilters=False,
+                          map_roi=True, check_geometry=True, **kwargs):
+        """
+        Map gates from one or more radars to the grid using the weights.
+
+        The result is equivalent to :py:func:`map_gates_to_grid` with the
+        parameters used to build the weights.
+
+        Parameters
+        ----------
+        radars : Radar or tuple of Radar objects.
+            Radar objects which will be mapped to the Cartesian grid.  These
+            must have the geometry used to build the weights.
+        fields, gatefilters, map_roi :
+            See :py:func:`map_to_grid`.
+        check_geometry : bool
+            True to check that the radars have the geometry used to build
+            the weights, see :py:func:`GateToGridWeights.check_geometry`.
+            False skips this check.
+
+        Returns
+        -------
+        grids : dict
+            Dictionary of mapped fields.  The keys of the dictionary are
+            given by parameter fields.  Each element is a `grid_shape`
+            float32 masked array containing the interpolated grid for that
+            field.
+
+        """
+        if isinstance(radars, Radar):
+            radars = (radars, )
+        if check_geometry:
+            self.check_geometry(radars)
+        gatefilters = _parse_gatefilters(gatefilters, radars)
+        fields = _determine_fields(fields, radars)
+
+        # included gates for all radars, in the order of the weight columns
+        included = []
+        for radar, gatefilter in zip(radars, gatefilters):
+            if gatefilter is False:
+                gatefilter = GateFilter(radar)  # include all gates
+            elif gatefilter is None:
+                gatefilter = moment_based_gate_filter(radar, **kwargs)
+            included.append(gatefilter.gate_included.ravel())
+        included = np.concatenate(included)
+
+        grids = {}
+        for field in fields:
+            fdata = [radar.fields[field]['data'] for radar in radars]
+            valid = np.logical_and(
+                included,
+                np.concatenate([~np.ma.getmaskarray(f).ravel()
+                                for f in fdata]))
+            values = np.concatenate(
+                [np.ma.getdata(f).ravel() for f in fdata]).astype('float64')
+            values[~valid] = 0.
+            wsum = self.weights.dot(valid.astype('float64'))
+            vsum = self.weights.dot(values)
+            mweight = np.ma.masked_equal(wsum, 0)
+            msum = np.ma.masked_array(vsum, mweight.mask)
+            grids[field] = (msum / mweight).astype('float32').reshape(
+                self.grid_shape)
+        if map_roi:
+            grids['ROI'] = self.roi.copy()
+        return grids
+
+    def write(self, filename):
+        """
+        Write the weights to a NumPy .npz file.
+
+        Parameters
+        ----------
+        filename : str
+            Filename of the file to write.  The .npz extension is appended
+            if not present.
+
+        """
+        weights = self.weights
+        arrays = {
+            'data': weights.data, 'indices': weights.indices,
+            'indptr': weights.indptr, 'shape': np.array(weights.shape),
+            'grid_shape': np.array(self.grid_shape), 'roi': self.roi,
+            'nradars': np.array(len(self.ranges)),
+            'angle_tol': np.array(self.angle_tol),
+            'range_tol': np.array(self.range_tol)}
+        for i in range(len(self.ranges)):
+            arrays['azimuth_%d' % (i)] = self.azimuths[i]
+            arrays['elevation_%d' % (i)] = self.elevations[i]
+            arrays['range_%d' % (i)] = self.ranges[i]
+        np.savez_compressed(filename, **arrays)
+        return
+
+
+def read_gate_to_grid_weights(filename):
+    """
+    Read gate to grid weights written by :py:func:`GateToGridWeights.write`.
+
+    Parameters
+    ----------
+    filename : str
+        Filename of the .npz file containing the weights.
+
+    Returns
+    -------
+    weights : GateToGridWeights
+        Gate to grid weights read from the file.
+
+    """
+    with np.load(filename) as npz:
+        weights = scipy.sparse.csr_matrix(
+            (npz['data'], npz['indices'], npz['indptr']),
+            shape=tuple(npz['shape']))
+        nradars = int(npz['nradars'])
+        return GateToGridWeights(
+            weights, tuple(npz['grid_shape']), npz['roi'],
+            [npz['azimuth_%d' % (i)] for i in range(nradars)],
+            [npz['elevation_%d' % (i)] for i in range(nradars)],
+            [npz['range_%d' % (i)] for i in range(nradars)],
+            float(npz['angle_tol']), float(npz['range_tol']))
+
+
+def build_gate_to_grid_weights(
+        radars, grid_shape, grid_limits, grid_origin=None,
+        grid_origin_alt=None, grid_projection=None,
+        weighting_function='Barnes', roi_func='dist_beam',
+        constant_roi=500., z_factor=0.05, xy_factor=0.02, min_radius=500.0,
+        h_factor=1.0, nb=1.5, bsp=1.0, angle_tol=0.5, range_tol=1.0,
+        gates_per_chunk=100000):
+    """
+    Build the weights which map gates from one or more radars onto a grid.
+
+    The gate locations, radius of influence of each gate and the weight of
+    every gate for all grid points within that radius are found once.  The
+    returned object can map the fields of any volume with the same
+    geometry onto the grid, see :py:func:`GateToGridWeights.map_gates_to_grid`,
+    and can be written to disk for later use.
+
+    Parameters not defined below are identical to those in
+    :py:func:`map_gates_to_grid`.  The field data and gate filters of the
+    radars are not used, all gates are included in the weights.
+
+    Parameters
+    ----------
+    angle_tol : float
+        Largest difference, in degrees, in the azimuth or elevation of a ray
+        for which a volume is considered to have the same geometry.
+    range_tol : float
+        Largest difference, in meters, in the range to a gate for which a
+        volume is considered to have the same geometry.
+    gates_per_chunk : int
+        Number of gates whose neighboring grid points are found at once.
+        Larger values are faster but use more memory.
+
+    Returns
+    -------
+    weights : GateToGridWeights
+        Gate to grid weights.
+
+    """
+    # make a tuple if passed a radar object as the first argument
+    if isinstance(radars, Radar):
+        radars = (radars, )
+
+    skip_transform = False
+    if len(radars) == 1 and grid_origin_alt is None and grid_origin is None:
+        skip_transform = True
+
+    if grid_origin_alt is None:
+        grid_origin_alt = float(radars[0].altitude['data'])
+
+    cy_weighting_function = _detemine_cy_weighting_func(weighting_function)
+    projparams = _find_projparams(grid_origin, radars, grid_projection)
+    grid_starts, grid_steps = _find_grid_params(grid_shape, grid_limits)
+    offsets = _find_offsets(radars, projparams, grid_origin_alt)
+    roi_func = _parse_roi_func(roi_func, constant_roi, z_factor, xy_factor,
+                               min_radius, h_factor, nb, bsp, offsets)
+
+    # locations of the grid points in meters
+    nz, ny, nx = grid_shape
+    z_start, y_start, x_start = grid_starts
+    z_step, y_step, x_step = grid_steps
+    zg, yg, xg = np.meshgrid(
+        z_start + z_step * np.arange(nz), y_start + y_step * np.arange(ny),
+        x_start + x_step * np.arange(nx), indexing='ij')
+    grid_tree = cKDTree(np.column_stack(
+        (zg.ravel(), yg.ravel(), xg.ravel())))
+    del zg, yg, xg
+
+    # find the weights from each radar's gates
+    blocks = []
+    gate_offset = 0
+    for radar in radars:
+        gate_z, gate_y, gate_x = _find_gate_locations(
+            radar, skip_transform, projparams, grid_origin_alt)
+        gate_z = np.ascontiguousarray(gate_z, dtype='float32')
+        gate_y = np.ascontiguousarray(gate_y, dtype='float32')
+        gate_x = np.ascontiguousarray(gate_x, dtype='float32')
+        gate_roi = np.empty(gate_z.shape, dtype='float32')
+        find_roi_for_gates(
+            gate_roi, gate_z, gate_y, gate_x,
+            np.zeros(gate_z.shape, dtype='uint8'), roi_func)
+
+        gate_locations = np.column_stack(
+            (gate_z.ravel(), gate_y.ravel(), gate_x.ravel()))
+        gate_roi = gate_roi.ravel()
+        for start in range(0, len(gate_roi), gates_per_chunk):
+            end = start + gates_per_chunk
+            grid_idx, gate_idx, weights = _weights_for_gates(
+                grid_tree, gate_locations[start:end], gate_roi[start:end],
+                cy_weighting_function)
+            blocks.append((grid_idx, gate_idx + gate_offset + start,
+                           weights))
+        gate_offset += len(gate_roi)
+
+    grid_idx, gate_idx, weights = [np.concatenate(i) for i in zip(*blocks)]
+    weights = scipy.sparse.csr_matrix(
+        (weights, (grid_idx, gate_idx)), shape=(nz * ny * nx, gate_offset))
+
+    # radius of influence at each grid point
+    roi = np.empty(grid_shape, dtype=np.float32)
+    gatemapper = GateToGridMapper(
+        grid_shape, grid_starts, grid_steps,
+        np.zeros(grid_shape + (0, ), dtype=np.float32),
+        np.zeros(grid_shape + (0, ), dtype=np.float32))
+    gatemapper.find_roi_for_grid(roi, roi_func)
+
+    return GateToGridWeights(
+        weights, grid_shape, roi,
+        [radar.azimuth['data'].copy() for radar in radars],
+        [radar.elevation['data'].copy() for radar in radars],
+        [radar.range['data'].copy() for radar in radars],
+        angle_tol, range_tol)
+
+
+def _weights_for_gates(grid_tree, gate_locations, gate_roi,
+                       cy_weighting_function):
+    """
+    Find the grid points within the radius of influence of gates and the
+    weights of the gates at these points.
+
+    Returns the grid point index, gate index (relative to the first gate
+    passed) and weight of each (grid point, gate) pair.
+    """
+    neighbors = grid_tree.query_ball_point(gate_locations, gate_roi)
+    counts = np.array([len(i) for i in neighbors], dtype=np.intp)
+    gate_idx = np.repeat(np.arange(len(gate_roi)), counts)
+    if len(gate_idx) == 0:
+        grid_idx = np.zeros((0, ), dtype=np.intp)
+    else:
+        grid_idx = np.concatenate(neighbors).astype(np.intp)
+
+    diff = grid_tree.data[grid_idx] - gate_locations[gate_idx]
+    dist2 = np.sum(diff * diff, axis=1)
+    roi2 = gate_roi[gate_idx].astype('float64') ** 2
+    if cy_weighting_function == 1:  # Cressman
+        weights = (roi2 - dist2) / (roi2 + dist2)
+    else:   # Barnes
+        weights = np.exp(-dist2 / (2 * roi2)) + 1e-5
+    return grid_idx, gate_idx, weights
@@ -13,11 +13,15 @@ Generate a Cartesian grid by mapping from radar gates onto the grid.
     _parse_gatefilters
     _determine_fields
     _find_offsets
+    _find_gate_locations
     _find_grid_params
     _parse_roi_func
+    _map_gates_threaded
 
 """
 
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
 from ..core.radar import Radar
 from ..core.transforms import geographic_to_cartesian
@@ -33,7 +37,7 @@ def map_gates_to_grid(
         fields=None, gatefilters=False, map_roi=True,
         weighting_function='Barnes', toa=17000.0, roi_func='dist_beam',
         constant_roi=500., z_factor=0.05, xy_factor=0.02, min_radius=500.0,
-        h_factor=1.0, nb=1.5, bsp=1.0, **kwargs):
+        h_factor=1.0, nb=1.5, bsp=1.0, nthreads=1, **kwargs):
     """
     Map gates from one or more radars to a Cartesian grid.
 
@@ -65,6 +69,13 @@ def map_gates_to_grid(
         A custom RoIFunction can be defined using the RoIFunction class
         and defining a get_roi method which returns the radius.  For efficient
         mapping this class should be implemented in Cython.
+    nthreads : int
+        Number of threads used to map the gates onto the grid.  The rays of
+        each radar are divided between the threads, each of which collects
+        weighted values into a private copy of the grid; these copies are
+        summed once all gates are mapped.  Memory use therefore grows with
+        the number of threads.  Results may differ from single threaded
+        mapping by float32 rounding.
 
     Returns
     -------
@@ -107,43 +118,69 @@ def map_gates_to_grid(
     gatemapper = GateToGridMapper(
         grid_shape, grid_starts, grid_steps, grid_sum, grid_wsum)
 
-    # project gates from each radar onto the grid
-    for radar, gatefilter in zip(radars, gatefilters):
-
-        # Copy the field data and masks.
-        # TODO method that does not copy field data into new array
-        shape = (radar.nrays, radar.ngates, nfields)
-        field_data = np.empty(shape, dtype='float32')
-        field_mask = np.empty(shape, dtype='uint8')
-        for i, field in enumerate(fields):
-            fdata = radar.fields[field]['data']
-            field_data[:, :, i] = np.ma.getdata(fdata)
-            field_mask[:, :, i] = np.ma.getmaskarray(fdata)
-
-        # find excluded gates from the gatefilter
-        if gatefilter is False:
-            gatefilter = GateFilter(radar)  # include all gates
-        elif gatefilter is None:
-            gatefilter = moment_based_gate_filter(radar, **kwargs)
-        excluded_gates = gatefilter.gate_excluded.astype('uint8')
-
-        # calculate gate locations relative to the grid origin
-        if skip_transform:
-            # single radar, grid centered at radar location
-            gate_x = radar.gate_x['data']
-            gate_y = radar.gate_y['data']
-        else:
-            gate_x, gate_y = geographic_to_cartesian(
-                radar.gate_longitude['data'], radar.gate_latitude['data'],
-                projparams)
-        gate_z = radar.gate_altitude['data'] - grid_origin_alt
-
-        # map the gates onto the grid
-        gatemapper.map_gates_to_grid(
-            radar.ngates, radar.nrays, gate_z.astype('float32'),
-            gate_y.astype('float32'), gate_x.astype('float32'),
-            field_data, field_mask, excluded_gates,
-            toa, roi_func, cy_weighting_function)
+    # additional threads map gates into private grid storage arrays
+    if nthreads < 1:
+        raise ValueError('nthreads must be a positive integer')
+    thread_sums = []
+    gatemappers = [gatemapper]
+    for _ in range(nthreads - 1):
+        thread_sum = np.zeros_like(grid_sum)
+        thread_wsum = np.zeros_like(grid_wsum)
+        thread_sums.append((thread_sum, thread_wsum))
+        gatemappers.append(GateToGridMapper(
+            grid_shape, grid_starts, grid_steps, thread_sum, thread_wsum))
+    pool = None
+    if nthreads > 1:
+        pool = ThreadPool(nthreads)
+
+    # project gates from each radar onto the grid, the pool is shut down
+    # even when mapping fails
+    try:
+        for radar, gatefilter in zip(radars, gatefilters):
+
+            # Copy the field data and masks.
+            # TODO method that does not copy field data into new array
+            shape = (radar.nrays, radar.ngates, nfields)
+            field_data = np.empty(shape, dtype='float32')
+            field_mask = np.empty(shape, dtype='uint8')
+            for i, field in enumerate(fields):
+                fdata = radar.fields[field]['data']
+                field_data[:, :, i] = np.ma.getdata(fdata)
+                field_mask[:, :, i] = np.ma.getmaskarray(fdata)
+
+            # find excluded gates from the gatefilter
+            if gatefilter is False:
+                gatefilter = GateFilter(radar)  # include all gates
+            elif gatefilter is None:
+                gatefilter = moment_based_gate_filter(radar, **kwargs)
+            excluded_gates = gatefilter.gate_excluded.astype('uint8')
+
+            # calculate gate locations relative to the grid origin
+            gate_z, gate_y, gate_x = _find_gate_locations(
+                radar, skip_transform, projparams, grid_origin_alt)
+
+            # map the gates onto the grid
+            if pool is None:
+                gatemapper.map_gates_to_grid(
+                    radar.ngates, radar.nrays, gate_z.astype('float32'),
+                    gate_y.astype('float32'), gate_x.astype('float32'),
+                    field_data, field_mask, excluded_gates,
+                    toa, roi_func, cy_weighting_function)
+            else:
+                _map_gates_threaded(
+                    pool, gatemappers, gate_z.astype('float32'),
+                    gate_y.astype('float32'), gate_x.astype('float32'),
+                    field_data, field_mask, excluded_gates,
+                    toa, roi_func, cy_weighting_function)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # combine the grid storage arrays from all threads
+    for thread_sum, thread_wsum in thread_sums:
+        grid_sum += thread_sum
+        grid_wsum += thread_wsum
 
     # create and return the grid dictionary
     mweight = np.ma.masked_equal(grid_wsum, 0)
@@ -157,6 +194,30 @@ def map_gates_to_grid(
     return grids
 
 
+def _map_gates_threaded(pool, gatemappers, gate_z, gate_y, gate_x,
+                        field_data, field_mask, excluded_gates, toa,
+                        roi_func, cy_weighting_function):
+    """
+    Map gates onto the grid dividing the rays between threads.
+
+    Each block of rays is mapped by a different GateToGridMapper, these
+    release the GIL while mapping so blocks are mapped concurrently.
+    """
+    nrays, ngates = excluded_gates.shape
+    bounds = np.linspace(0, nrays, len(gatemappers) + 1).astype('int')
+
+    def map_block(i):
+        """ Map the i-th block of rays using the i-th gate mapper. """
+        start, end = bounds[i], bounds[i + 1]
+        gatemappers[i].map_gates_to_grid(
+            ngates, end - start, gate_z[start:end], gate_y[start:end],
+            gate_x[start:end], field_data[start:end], field_mask[start:end],
+            excluded_gates[start:end], toa, roi_func, cy_weighting_function)
+
+    pool.map(map_block, range(len(gatemappers)))
+    return
+
+
 def _detemine_cy_weighting_func(weighting_function):
     """ Determine cython weight function value. """
     if weighting_function.upper() == 'CRESSMAN':
@@ -225,6 +286,21 @@ def _find_offsets(radars, projparams, grid_origin_alt):
     return offsets
 
 
+def _find_gate_locations(radar, skip_transform, projparams,
+                         grid_origin_alt):
+    """ Find the Cartesian locations of gates relative to the grid origin. """
+    if skip_transform:
+        # single radar, grid centered at radar location
+        gate_x = radar.gate_x['data']
+        gate_y = radar.gate_y['data']
+    else:
+        gate_x, gate_y = geographic_to_cartesian(
+            radar.gate_longitude['data'], radar.gate_latitude['data'],
+            projparams)
+    gate_z = radar.gate_altitude['data'] - grid_origin_alt
+    return gate_z, gate_y, gate_x
+
+
 def _find_grid_params(grid_shape, grid_limits):
     """ Find the starting points and step size of the grid. """
     nz, ny, nx = grid_shape
@@ -13,6 +13,7 @@ Utilities for mapping radar objects to Cartesian grids.
     example_roi_func_dist
     _unify_times_for_radars
     _load_nn_field_data
+    _weighted_average_csr
     _gen_roi_func_constant
     _gen_roi_func_dist
     _gen_roi_func_dist_beam
@@ -25,6 +26,8 @@ Utilities for mapping radar objects to Cartesian grids.
 
 """
 
+import itertools
+
 import numpy as np
 import scipy.spatial
 import netCDF4
@@ -247,6 +250,44 @@ class NNLocator:
 
             return ind, dist
 
+    def find_neighbors_and_dists_batch(self, q, r):
+        """
+        Find all neighbors and distances within given distances of many
+        points.
+
+        Parameters
+        ----------
+        q : array_like, (n_points, n_dimensions)
+            Points to query.
+        r : array_like, (n_points, ) or float
+            Distance within which neighbors are returned for each point.
+
+        Returns
+        -------
+        ind : array of integers
+            Indices of the neighbors of all points, concatenated.
+        dist : array of floats
+            Distances to the neighbors, concatenated.
+        indptr : array of integers
+            Offsets into ind and dist, the neighbors of point i are
+            ind[indptr[i]:indptr[i + 1]].  This is the compressed sparse
+            row (CSR) layout used by scipy.sparse.
+
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self._algorithm == 'kd_tree':
+            neighbors = self.tree.query_ball_point(q, r)
+            counts = np.fromiter(
+                (len(i) for i in neighbors), dtype=np.intp, count=len(q))
+            indptr = np.zeros(len(q) + 1, dtype=np.intp)
+            np.cumsum(counts, out=indptr[1:])
+            ind = np.fromiter(
+                itertools.chain.from_iterable(neighbors), dtype=np.intp,
+                count=indptr[-1])
+            dist = scipy.spatial.minkowski_distance(
+                np.repeat(q, counts, axis=0), self.tree.data[ind])
+            return ind, dist, indptr
+
 
 def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
                 grid_origin_alt=None, grid_projection=None,
@@ -265,7 +306,9 @@ def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
     radius of influence and weighting these nearby points according to their
     distance from the grid points. Collected points are filtered
     according to a number of criteria so that undesired points are not
-    included in the interpolation.
+    included in the interpolation.  The radius of influence, neighbor
+    search and weighting are performed for all points in a z level of the
+    grid at once.
 
     Parameters
     ----------
@@ -570,7 +613,11 @@ def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
     else:
         x_step = (x_stop - x_start) / (nx - 1.)
 
+    # the built in RoI functions accept arrays of grid locations, user
+    # provided functions are evaluated one grid point at a time.
+    vectorized_roi = False
     if not hasattr(roi_func, '__call__'):
+        vectorized_roi = True
         if roi_func == 'constant':
             roi_func = _gen_roi_func_constant(constant_roi)
         elif roi_func == 'dist':
@@ -589,25 +636,34 @@ def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
     if map_roi:
         roi = np.empty((nz, ny, nx), dtype=np.float64)
 
-    # interpolate field values for each point in the grid
-    for iz, iy, ix in np.ndindex(nz, ny, nx):
+    # y and x locations of the grid points in a single z level
+    yg, xg = np.meshgrid(y_start + y_step * np.arange(ny),
+                         x_start + x_step * np.arange(nx), indexing='ij')
+    yg = yg.ravel()
+    xg = xg.ravel()
+    npoints = ny * nx
+
+    # interpolate field values for all grid points in a z level at once
+    for iz in range(nz):
 
-        # calculate the grid point
-        x = x_start + x_step * ix
-        y = y_start + y_step * iy
+        # calculate the grid points and radius of influence
         z = z_start + z_step * iz
-        r = roi_func(z, y, x)
+        zg = np.full(npoints, z, dtype=np.float64)
+        if vectorized_roi:
+            r = np.broadcast_to(roi_func(zg, yg, xg), (npoints, ))
+        else:
+            r = np.fromiter(
+                (roi_func(z, y, x) for y, x in zip(yg, xg)),
+                dtype=np.float64, count=npoints)
         if map_roi:
-            roi[iz, iy, ix] = r
+            roi[iz] = r.reshape(ny, nx)
 
-        # find neighbors and distances
-        ind, dist = nnlocator.find_neighbors_and_dists((z, y, x), r)
-
-        if len(ind) == 0:
-            # when there are no neighbors, mark the grid point as bad
-            grid_data[iz, iy, ix] = np.ma.masked
-            grid_data.data[iz, iy, ix] = badval
-            continue
+        # find the neighbors and distances of all grid points, neighbors
+        # of grid point i are ind[indptr[i]:indptr[i + 1]]
+        ind, dist, indptr = nnlocator.find_neighbors_and_dists_batch(
+            np.column_stack((zg, yg, xg)), r)
+        counts = np.diff(indptr)
+        owner = np.repeat(np.arange(npoints), counts)
 
         # find the field values for all neighbors
         if copy_field_data:
@@ -619,27 +675,37 @@ def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
             # use the _load_nn_field_data function to load this data from
             # the field data object array.  This is done in Cython for speed.
             r_nums, e_nums = divmod(lookup[ind], total_gates)
-            npoints = r_nums.size
+            nn_points = r_nums.size
             r_nums = r_nums.astype(np.intc)
             e_nums = e_nums.astype(np.intc)
-            nn_field_data = np.empty((npoints, nfields), np.float64)
-            _load_nn_field_data(field_data_objs, nfields, npoints, r_nums,
+            nn_field_data = np.empty((nn_points, nfields), np.float64)
+            _load_nn_field_data(field_data_objs, nfields, nn_points, r_nums,
                                 e_nums, nn_field_data)
 
         # preforms weighting of neighbors.
         dist2 = dist * dist
-        r2 = r * r
+        r2 = (r * r)[owner]
 
         if weighting_function.upper() == 'NEAREST':
-            value = nn_field_data[np.argmin(dist2)] 
+            # the first occurrence of the smallest distance for each grid
+            # point, lexsort is stable so ties are broken by neighbor order
+            order = np.lexsort((dist2, owner))
+            nearest = order[indptr[:-1][counts > 0]]
+            values = np.ma.empty((npoints, nfields), dtype=np.float64)
+            values[counts > 0] = nn_field_data[nearest]
         else:
             if weighting_function.upper() == 'CRESSMAN':
                 weights = (r2 - dist2) / (r2 + dist2)
             elif weighting_function.upper() == 'BARNES':
                 weights = np.exp(-dist2 / (2.0 * r2)) + 1e-5
-            value = np.ma.average(nn_field_data, weights=weights, axis=0)
+            values = _weighted_average_csr(
+                nn_field_data, weights, owner, npoints, badval)
+
+        # when there are no neighbors, mark the grid point as bad
+        values[counts == 0] = np.ma.masked
+        values.data[counts == 0] = badval
 
-        grid_data[iz, iy, ix] = value
+        grid_data[iz] = values.reshape(ny, nx, nfields)
 
     # create and return the grid dictionary
     grids = dict([(f, grid_data[..., i]) for i, f in enumerate(fields)])
@@ -648,6 +714,55 @@ def map_to_grid(radars, grid_shape, grid_limits, grid_origin=None,
     return grids
 
 
+def _weighted_average_csr(nn_field_data, weights, owner, npoints, badval):
+    """
+    Weighted average of the neighbors of a number of grid points.
+
+    Equivalent to calling np.ma.average on the neighbors of each grid point,
+    masked neighbors do not contribute to the average and grid points where
+    the weights of all unmasked neighbors sum to zero or where the average
+    is not finite are masked.
+
+    Parameters
+    ----------
+    nn_field_data : array or masked array, (n_neighbors, nfields)
+        Field data for the neighbors of all grid points.
+    weights : array, (n_neighbors, )
+        Weight of each neighbor.
+    owner : array of integers, (n_neighbors, )
+        Index of the grid point each neighbor belongs to.
+    npoints : int
+        Number of grid points.
+    badval : float
+        Value placed under masked grid points.
+
+    Returns
+    -------
+    values : masked array, (npoints, nfields)
+        Weighted average of the field data at each grid point.
+
+    """
+    nfields = nn_field_data.shape[1]
+    valid = ~np.ma.getmaskarray(nn_field_data)
+    fdata = np.ma.getdata(nn_field_data)
+    values = np.ma.empty((npoints, nfields), dtype=np.float64)
+    for i in range(nfields):
+        wgt = np.where(valid[:, i], weights, 0.)
+        wsum = np.bincount(owner, weights=wgt, minlength=npoints)
+        vsum = np.bincount(
+            owner, weights=np.where(valid[:, i], fdata[:, i] * wgt, 0.),
+            minlength=npoints)
+        no_weight = wsum == 0
+        wsum[no_weight] = 1.
+        avg = vsum / wsum
+        # np.ma.average masks non-finite results, this includes averages
+        # with unmasked NaN neighbors.
+        bad = np.logical_or(no_weight, ~np.isfinite(avg))
+        values[:, i] = np.ma.masked_where(bad, avg)
+        values.data[bad, i] = badval
+    return values
+
+
 # Radius of Influence (RoI) functions
 
 
@@ -727,11 +842,14 @@ def _gen_roi_func_dist(z_factor, xy_factor, min_radius, offsets):
 
     def roi(zg, yg, xg):
         """ dist radius of influence function. """
+        zg = np.asarray(zg)[..., np.newaxis]
+        yg = np.asarray(yg)[..., np.newaxis]
+        xg = np.asarray(xg)[..., np.newaxis]
         r = np.maximum(
             z_factor * (zg - zg_off) +
             xy_factor * np.sqrt((xg - xg_off)**2 + (yg - yg_off)**2),
             min_radius)
-        return min(r)
+        return r.min(axis=-1)
 
     return roi
 
@@ -783,10 +901,13 @@ def _gen_roi_func_dist_beam(h_factor, nb, bsp, min_radius, offsets):
 
     def roi(zg, yg, xg):
         """ dist_beam radius of influence function. """
+        zg = np.asarray(zg)[..., np.newaxis]
+        yg = np.asarray(yg)[..., np.newaxis]
+        xg = np.asarray(xg)[..., np.newaxis]
         r = np.maximum(
                 h_factor * ((zg - zg_off) / 20.0) +
                 np.sqrt((yg - yg_off)**2 + (xg - xg_off)**2) *
                 np.tan(nb * bsp * np.pi / 180.0), min_radius)
-        return min(r)
+        return r.min(axis=-1)
 
     return roi
@@ -0,0 +1,94 @@
+""" Unit Tests for Py-ART's map/gate_to_grid_weights.py module. """
+
+from __future__ import print_function
+
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_raises
+
+import pyart
+
+EXPECTED_CENTER_SLICE = [40, 30, 20, 10, 0, 0, 10, 20, 30, 40]
+
+COMMON_MAP_TO_GRID_ARGS = {
+    'grid_shape': (3, 9, 10),
+    'grid_limits': ((-400.0, 400.0), (-900.0, 900.0), (-900, 900)),
+    'roi_func': 'constant',
+    'constant_roi': 30., }
+
+
+def test_weights_map_gates_to_grid():
+    radar = pyart.testing.make_target_radar()
+    weights = pyart.map.build_gate_to_grid_weights(
+        radar, **COMMON_MAP_TO_GRID_ARGS)
+    grids = weights.map_gates_to_grid(radar)
+    center_slice = grids['reflectivity'][1, 4, :]
+    assert_almost_equal(np.round(center_slice), EXPECTED_CENTER_SLICE)
+    assert np.all(grids['ROI'] == 30.)
+
+
+def test_weights_match_map_gates_to_grid():
+    radar = pyart.testing.make_target_radar()
+    fdata = np.ma.array(radar.fields['reflectivity']['data'])
+    fdata[::5, ::3] = np.ma.masked
+    radar.fields['reflectivity']['data'] = fdata
+    gatefilter = pyart.filters.GateFilter(radar)
+    gatefilter.exclude_above('reflectivity', 35.)
+
+    for weighting_function in ['Barnes', 'Cressman']:
+        grids = pyart.map.map_gates_to_grid(
+            (radar, radar), gatefilters=(gatefilter, False),
+            weighting_function=weighting_function,
+            **COMMON_MAP_TO_GRID_ARGS)
+        weights = pyart.map.build_gate_to_grid_weights(
+            (radar, radar), weighting_function=weighting_function,
+            **COMMON_MAP_TO_GRID_ARGS)
+        wgrids = weights.map_gates_to_grid(
+            (radar, radar), gatefilters=(gatefilter, False))
+        assert_almost_equal(
+            wgrids['reflectivity'], grids['reflectivity'], 4)
+        assert np.all(wgrids['reflectivity'].mask ==
+                      grids['reflectivity'].mask)
+
+
+def test_weights_write_read():
+    radar = pyart.testing.make_target_radar()
+    weights = pyart.map.build_gate_to_grid_weights(
+        radar, **COMMON_MAP_TO_GRID_ARGS)
+    with pyart.testing.InTemporaryDirectory():
+        weights.write('weights.npz')
+        weights2 = pyart.map.read_gate_to_grid_weights('weights.npz')
+    assert weights2.grid_shape == (3, 9, 10)
+    assert (weights2.weights != weights.weights).nnz == 0
+    grids = weights2.map_gates_to_grid(radar)
+    center_slice = grids['reflectivity'][1, 4, :]
+    assert_almost_equal(np.round(center_slice), EXPECTED_CENTER_SLICE)
+
+
+def test_weights_check_geometry():
+    radar = pyart.testing.make_target_radar()
+    weights = pyart.map.build_gate_to_grid_weights(
+        radar, **COMMON_MAP_TO_GRID_ARGS)
+
+    # small changes within the tolerance are accepted
+    radar.azimuth['data'] = radar.azimuth['data'] + 0.1
+    weights.check_geometry(radar)
+
+    # wrong number of radars
+    assert_raises(ValueError, weights.check_geometry, (radar, radar))
+
+    # azimuth, elevation and range outside of the tolerance
+    radar.azimuth['data'] = radar.azimuth['data'] + 1.0
+    assert_raises(ValueError, weights.map_gates_to_grid, radar)
+    weights.map_gates_to_grid(radar, check_geometry=False)
+
+    radar = pyart.testing.make_target_radar()
+    radar.elevation['data'] = radar.elevation['data'] + 1.0
+    assert_raises(ValueError, weights.check_geometry, radar)
+
+    radar = pyart.testing.make_target_radar()
+    radar.range['data'] = radar.range['data'] * 2.
+    assert_raises(ValueError, weights.check_geometry, radar)
+
+    # different number of rays
+    radar = pyart.testing.make_empty_ppi_radar(101, 10, 1)
+    assert_raises(ValueError, weights.check_geometry, radar)
@@ -2,6 +2,8 @@
 
 from __future__ import print_function
 
+import threading
+
 import numpy as np
 from numpy.testing import assert_almost_equal, assert_raises
 
@@ -71,6 +73,34 @@ def test_map_to_grid_constant_roi():
     assert_almost_equal(np.round(center_slice), EXPECTED_CENTER_SLICE)
 
 
+def test_map_to_grid_nthreads():
+    radar = pyart.testing.make_target_radar()
+    grids = pyart.map.map_gates_to_grid(
+        (radar, radar), nthreads=3, **COMMON_MAP_TO_GRID_ARGS)
+    center_slice = grids['reflectivity'][1, 4, :]
+    assert_almost_equal(np.round(center_slice), EXPECTED_CENTER_SLICE)
+
+    # threaded mapping matches single threaded mapping
+    single = pyart.map.map_gates_to_grid(
+        (radar, radar), nthreads=1, **COMMON_MAP_TO_GRID_ARGS)
+    assert_almost_equal(grids['reflectivity'], single['reflectivity'], 4)
+
+    assert_raises(ValueError, pyart.map.map_gates_to_grid, (radar, ),
+                  nthreads=0, **COMMON_MAP_TO_GRID_ARGS)
+
+
+def test_map_to_grid_nthreads_error():
+    # worker threads are shut down when mapping fails
+    radar = pyart.testing.make_target_radar()
+    radar2 = pyart.testing.make_target_radar()
+    radar2.fields = {'velocity': radar2.fields['reflectivity']}
+    kwargs = dict(COMMON_MAP_TO_GRID_ARGS, fields=['reflectivity'])
+    nthreads = threading.active_count()
+    assert_raises(KeyError, pyart.map.map_gates_to_grid, (radar, radar2),
+                  nthreads=3, **kwargs)
+    assert threading.active_count() == nthreads
+
+
 def test_map_to_grid_dist_roi():
     radar = pyart.testing.make_target_radar()
     grids = pyart.map.map_gates_to_grid(
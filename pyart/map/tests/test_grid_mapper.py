@@ -148,6 +148,42 @@ def test_map_to_grid_no_copy_two_radars():
     assert_almost_equal(center_slice, EXPECTED_CENTER_SLICE)
 
 
+def test_map_to_grid_nearest():
+    radar = pyart.testing.make_target_radar()
+    grids = pyart.map.map_to_grid(
+        (radar,), (3, 9, 10), ((-400.0, 400.0), (-900.0, 900.0), (-900, 900)),
+        roi_func='constant', constant_roi=30., weighting_function='NEAREST')
+    center_slice = grids['reflectivity'][1, 4, :]
+    assert_almost_equal(center_slice, EXPECTED_CENTER_SLICE)
+
+
+def test_map_to_grid_no_neighbors():
+    radar = pyart.testing.make_target_radar()
+    grids = pyart.map.map_to_grid(
+        (radar,), (2, 2, 2), ((20000.0, 21000.0), (-900.0, 900.0),
+                              (-900, 900)),
+        roi_func='constant', constant_roi=30.)
+    assert np.all(grids['reflectivity'].mask)
+
+
+def test_nnlocator_batch():
+    radar = pyart.testing.make_target_radar()
+    points = np.column_stack((radar.gate_z['data'].ravel(),
+                              radar.gate_y['data'].ravel(),
+                              radar.gate_x['data'].ravel()))
+    nnlocator = pyart.map.grid_mapper.NNLocator(points)
+    query = np.array([[0., 0., 0.], [0., 100., -200.], [1e6, 0., 0.]])
+    radii = np.array([30., 50., 30.])
+    ind, dist, indptr = nnlocator.find_neighbors_and_dists_batch(
+        query, radii)
+    assert len(indptr) == 4
+    for i in range(3):
+        pt_ind, pt_dist = nnlocator.find_neighbors_and_dists(
+            query[i], radii[i])
+        assert list(ind[indptr[i]:indptr[i + 1]]) == list(pt_ind)
+        assert_almost_equal(dist[indptr[i]:indptr[i + 1]], pt_dist)
+
+
 def test_map_to_grid_tiny_grid():
     radar = pyart.testing.make_target_radar()
     grids = pyart.map.map_to_grid(
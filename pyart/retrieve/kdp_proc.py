@@ -16,11 +16,17 @@ of propagation differential phase (PHIDP), backscatter differential phase
     filter_psidp
     boundary_conditions_maesaka
     
-    _kdp_estimation_backward_fixed
+    _kdp_estimation_fixed
+    _cho_solve_3x3
+    _kdp_kalman_prepare
     _kdp_kalman_profile
+    _kdp_kalman_profiles
+    _kdp_kalman_compile
     _kdp_vulpiani_profile
+    _kdp_vulpiani_profiles
     _cost_maesaka
     _jac_maesaka
+    _minimize_maesaka_block
     _forward_reverse_phidp
     _parse_range_resolution
 
@@ -48,7 +54,8 @@ SHIFT = 13  # Shifting of the final signal
 
 def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
                    kdp_field=None, phidp_field=None, band='C', rcov=0, pcov=0,
-                   prefilter_psidp=False, filter_opt=None, parallel=True):
+                   prefilter_psidp=False, filter_opt=None, parallel=True,
+                   pool=None, rays_per_batch=128):
     """
     Estimates Kdp with the Kalman filter method by Schneebeli and al. (2014)
     for a set of psidp measurements.
@@ -88,7 +95,16 @@ def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
         The arguments for the prefilter_psidp method, if empty, the defaults
         arguments of this method will be used
     parallel : bool, optional
-        Flag to enable parallel computation (one core for every psidp profile)
+        Flag to enable parallel computation, the batches of psidp profiles
+        are processed by a pool of worker processes.
+    pool : multiprocessing.Pool or concurrent.futures.Executor, optional
+        Pool of worker processes used when parallel is True. Providing a
+        pool allows it to be reused between calls, if None a pool with one
+        process per core is created for each call when more than one core
+        is available.
+    rays_per_batch : int, optional
+        Number of psidp profiles whose Kalman filters are advanced
+        simultaneously. The results do not depend on this value.
 
     Returns
     -------
@@ -108,12 +124,6 @@ def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
 
     """
 
-    # create parallel computing instance
-    if parallel:
-        import multiprocessing as mp
-
-        pool = mp.Pool(processes=mp.cpu_count(), maxtasksperchild=1)
-
     # parse fill value
     if fill_value is None:
         fill_value = get_fillvalue()
@@ -145,15 +155,29 @@ def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
     if gatefilter is not None:
         psidp_o = np.ma.masked_where(gatefilter.gate_excluded, psidp_o)
 
-    func = partial(_kdp_kalman_profile, dr=dr, band=band, rcov=rcov,
+    # the noise padding of the profiles is drawn here, in ray order, so that
+    # the results do not depend on how the batches are processed
+    profiles = [_kdp_kalman_prepare(prof) for prof in psidp_o]
+    batches = [profiles[i:i + rays_per_batch]
+               for i in range(0, len(profiles), rays_per_batch)]
+    func = partial(_kdp_kalman_profiles, dr=dr, band=band, rcov=rcov,
                    pcov=pcov)
 
-    all_psidp_prof = list(psidp_o)
-
-    if parallel:
-        list_est = pool.map(func, all_psidp_prof)
+    if parallel and pool is None and len(batches) > 1:
+        import multiprocessing as mp
+        nprocesses = min(mp.cpu_count(), len(batches))
+        if nprocesses > 1:
+            own_pool = mp.Pool(processes=nprocesses)
+            try:
+                list_est = own_pool.map(func, batches)
+            finally:
+                own_pool.terminate()
+        else:
+            list_est = [func(batch) for batch in batches]
+    elif parallel and pool is not None:
+        list_est = list(pool.map(func, batches))
     else:
-        list_est = map(func, all_psidp_prof)
+        list_est = [func(batch) for batch in batches]
 
     kdp = np.zeros(psidp_o.shape) * np.nan
     kdp = np.ma.masked_array(kdp, fill_value=fill_value)
@@ -164,7 +188,7 @@ def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
     phidp_rec = np.zeros(psidp_o.shape) * np.nan
     phidp_rec = np.ma.masked_array(phidp_rec, fill_value=fill_value)
 
-    for i, l in enumerate(list_est):
+    for i, l in enumerate(est for batch in list_est for est in batch):
         kdp[i, 0:len(l[0])] = l[0]
         kdp_stdev[i, 0:len(l[1])] = l[1]
         phidp_rec[i, 0:len(l[2])] = l[2]
@@ -196,31 +220,30 @@ def kdp_schneebeli(radar, gatefilter=None, fill_value=None, psidp_field=None,
     kdp_stdev_dict['data'] = kdp_stdev
     kdp_stdev_dict['valid_min'] = 0.0
 
-    if parallel:
-        pool.close()
-
     return kdp_dict, kdp_stdev_dict, phidpr_dict
 
 
-def _kdp_estimation_backward_fixed(
-        psidp_in, rcov, pcov_scale, f, f_transposed, h_plus,
-        c1, c2, b1, b2, kdp_th, mpsidp):
+def _kdp_estimation_fixed(psidp, nrg, rcov, pcov_scale, f, f_transposed,
+                          h_plus, c1, c2, b1, b2, kdp_th):
     """
-    Processing one profile of Psidp and estimating Kdp and Phidp
-    with the KFE algorithm described in Schneebeli et al, 2014
-    IEEE_TGRS. This routine estimates Kdp in the backward
-    direction given a set of matrices that define the Kalman
-    filter.
+    Processing a set of profiles of Psidp and estimating Kdp with the
+    KFE algorithm described in Schneebeli et al, 2014 IEEE_TGRS. The
+    Kalman filters of all profiles are advanced simultaneously given a
+    set of matrices that define each filter.
 
     Parameters
     ----------
-    psidp_in : ndarray
-        one-dimensional vector of length -nrg- containining the input psidp
-        [degrees]
-    rcov : 3x3 float array##
+    psidp : ndarray
+        two-dimensional array of shape -nfilt x ngates- containing the input
+        psidp [degrees]. Each profile starts at the first gate, gates past
+        the length of the profile are ignored.
+    nrg : ndarray
+        one-dimensional vector of length -nfilt- containing the number of
+        gates in each profile.
+    rcov : 3x3 float array
         Measurement error covariance matrix
-    pcov_scale  : 4x4 float array
-        Scaled state transition error covariance matrix
+    pcov_scale  : nfiltx4x4 float array
+        Scaled state transition error covariance matrix of each filter
     f : 4x4 float array
         Forward state prediction matrix [4x4]
     f_transposed: 4x4 float array
@@ -230,201 +253,175 @@ def _kdp_estimation_backward_fixed(
     c1, c2,b1,b2: floats
         the values of the intercept of the relation c  = b*Kdp - delta.
         This relation uses b1, c1 IF kdp is lower than a kdp_th and b2, c2
-        otherwise kdp_th
+        otherwise kdp_th.
     kdp_th: float
         the kdp threshold which separates the two Kdp - delta regime
         i.e. the power law relating delta to Kdp will be different if Kdp is
         larger or smaller than kdp_th
-    mpsidp: float
-        final observed value of psidp along the radial (usually also
-        the max value), needed for inverting the psidp vector
-
 
     Returns
     -------
     kdp: ndarray
-        filtered Kdp [degrees/km]. Same length as Psidp
-    error_kdp: ndarray
-        estimated error on Kdp values
+        filtered Kdp [degrees/km] before shifting, the last gate of each
+        profile and the gates past its length are zero.
 
     """
-
-    # Define the input
-    psidp = psidp_in
-
-    # invert Psidp (backward estimation)
-    psidp = mpsidp - psidp[::-1]
-    nrg_new = len(psidp)
+    nfilt, ngates = psidp.shape
 
     # Initialize the state vector to 0
-    s = np.zeros([4, 1])  # first state estimate
+    s = np.zeros([nfilt, 4, 1])  # first state estimate
 
     # define measurement vector
-    z = np.zeros([3, 1])
+    z = np.zeros([nfilt, 3, 1])
 
     # Define the identity matrix
     identity_i = np.eye(4)
-    p = identity_i * 4.
-
-    kdp = np.zeros([nrg_new])
-    kdp_error = np.zeros([nrg_new])
+    p = np.tile(identity_i * 4., (nfilt, 1, 1))
 
-    # Loop on all the gates and apply the filter
+    h_plus = np.tile(h_plus, (nfilt, 1, 1))
+    kdp = np.zeros([nfilt, ngates])
 
-    for ii in range(0, nrg_new - 1):
-        z[0] = psidp[ii]
-        z[1] = psidp[ii + 1]
+    # Loop on all the gates and apply the filters
+    for ii in range(0, ngates - 1):
+        z[:, 0, 0] = psidp[:, ii]
+        z[:, 1, 0] = psidp[:, ii + 1]
 
-        s_pred = np.dot(f, s)  # state prediciton
+        s_pred = np.matmul(f, s)  # state prediction
 
-        p_pred = np.dot(f, np.dot(p, f_transposed)) + \
+        p_pred = np.matmul(f, np.matmul(p, f_transposed)) + \
             pcov_scale  # error prediction
 
-        if (s_pred[0] > kdp_th):
-            h_plus[2, 0] = b2
-            z[2] = c2
-        else:
-            h_plus[2, 0] = b1
-            z[2] = c1
+        above_th = s_pred[:, 0, 0] > kdp_th
+        h_plus[:, 2, 0] = np.where(above_th, b2, b1)
+        z[:, 2, 0] = np.where(above_th, c2, c1)
 
-        # as far as i see aludc is symmetrical, so i do not transpose it
-        aludc = (np.dot(h_plus, (np.dot(p_pred, h_plus.T))) + rcov)
+        h_plus_transposed = h_plus.transpose(0, 2, 1)
+        aludc = np.matmul(h_plus, np.matmul(p_pred, h_plus_transposed)) + rcov
 
         # below we get the transposed of B_mat directly
-        b_mat = np.dot(h_plus, p_pred)
-
-        # Cholesky decomposition
-        cho = linalg.cho_factor(aludc)
-        k = linalg.cho_solve(cho, b_mat, check_finite=False,
-                             overwrite_b=True).T
+        b_mat = np.matmul(h_plus, p_pred)
+        k = _cho_solve_3x3(aludc, b_mat).transpose(0, 2, 1)
 
         # Update state and error
-        s = np.dot(k, (np.dot(-h_plus, s_pred) + z)) + s_pred
-        p = np.dot((identity_i - np.dot(k, h_plus)), p_pred)
+        s = np.matmul(k, np.matmul(-h_plus, s_pred) + z) + s_pred
+        p = np.matmul(identity_i - np.matmul(k, h_plus), p_pred)
 
         # Fill the output
-        kdp[ii] = s[0]
-        kdp_error[ii] = p[0, 0]
+        kdp[:, ii] = s[:, 0, 0]
 
-    # Shift
-    n = len(kdp)
-    dummy = np.copy(kdp)
-    kdp[np.arange(SHIFT) + len(kdp) - SHIFT] = 0
-    kdp[np.arange(n - 1 - SHIFT)] = dummy[np.arange(n - 1 - SHIFT) + SHIFT]
+    kdp[np.arange(ngates) >= nrg[:, np.newaxis] - 1] = 0
+    return kdp
 
-    # Reverse the estimates (backward direction)
-    kdp = kdp[::-1]
 
-    kdp_error = kdp_error[::-1]
-    return kdp, kdp_error
+def _cho_solve_3x3(a, b):
+    """
+    Solve a stack of 3x3 symmetric positive-definite linear systems using
+    the Cholesky decomposition of a, in the same order of operations as
+    the LAPACK routines used by scipy.linalg.cho_factor and cho_solve.
 
+    Parameters
+    ----------
+    a : ndarray
+        Stack of coefficient matrices, shape (n, 3, 3).
+    b : ndarray
+        Stack of right-hand sides, shape (n, 3, m).
+
+    Returns
+    -------
+    x : ndarray
+        Solutions of the linear systems, shape (n, 3, m), each solution is
+        stored in Fortran order.
 
-def _kdp_estimation_forward_fixed(
-        psidp_in, rcov, pcov_scale, f, f_transposed, h_plus,
-        c1, c2, b1, b2, kdp_th):
     """
-    Processing one profile of Psidp and estimating Kdp and Phidp
-    with the KFE algorithm described in Schneebeli et al, 2014
-    IEEE_TGRS. This routine estimates Kdp in the forward
-    direction given a set of matrices that define the Kalman
-    filter.
+    # upper triangular factor, a = u.T * u
+    r00 = 1. / np.sqrt(a[:, 0, 0])
+    u01 = a[:, 0, 1] * r00
+    u02 = a[:, 0, 2] * r00
+    r11 = 1. / np.sqrt(a[:, 1, 1] - u01 * u01)
+    u12 = (a[:, 1, 2] - u01 * u02) * r11
+    r22 = 1. / np.sqrt(a[:, 2, 2] - (u02 * u02 + u12 * u12))
+    r00, r11, r22 = r00[:, None], r11[:, None], r22[:, None]
+    u01, u02, u12 = u01[:, None], u02[:, None], u12[:, None]
+
+    # solve u.T * y = b then u * x = y
+    y0 = b[:, 0] * r00
+    y1 = (b[:, 1] - u01 * y0) * r11
+    y2 = (b[:, 2] - (u02 * y0 + u12 * y1)) * r22
+    # each solution is stored in Fortran order like the LAPACK output
+    x = np.empty((b.shape[0], b.shape[2], 3)).transpose(0, 2, 1)
+    x[:, 2] = y2 * r22
+    x[:, 1] = (y1 - u12 * x[:, 2]) * r11
+    x[:, 0] = (y0 - u02 * x[:, 2] - u01 * x[:, 1]) * r00
+    return x
+
+
+def _kdp_kalman_prepare(psidp_in):
+    """
+    Prepare one profile of psidp for the Kalman filter estimation of Kdp.
 
     Parameters
     ----------
     psidp_in : ndarray
         one-dimensional vector of length -nrg- containining the input psidp
         [degrees]
-    rcov : 3x3 float array
-        Measurement error covariance matrix
-    pcov_scale  : 4x4 float array
-        Scaled state transition error covariance matrix
-    f : 4x4 float array
-        Forward state prediction matrix [4x4]
-    f_transposed: 4x4 float array
-        Transpose of F
-    h_plus : 4x3 float array*np.nan
-        Measurement prediction matrix [4x3]
-    c1, c2,b1,b2: floats
-        the values of the intercept of the relation c  = b*Kdp - delta.
-        This relation uses b1, c1 IF kdp is lower than a kdp_th and b2, c2
-        otherwise kdp_th.
 
     Returns
     -------
-    kdp: ndarray
-        filtered Kdp [degrees/km]. Same length as Psidp
-    phidp: ndarray
-        estimated phidp (smooth psidp)
-    error_kdp: ndarray
-        estimated error on Kdp values
+    profile : tuple or ndarray
+        Tuple of the psidp profile padded with noise, the number of gates
+        in the profile without padding, the offset of the first finite gate
+        and the final psidp value. When psidp has no finite values the input
+        with NaNs for the missing values is returned instead.
 
     """
+    # Replace missing values with nans
+    psidp_in = np.ma.filled(psidp_in, np.nan)
+    # Check if psidp has at least one finite value
+    if not np.isfinite(psidp_in).any():
+        return psidp_in
 
     # Define the input
-    psidp = np.ma.filled(psidp_in)
-    nrg_new = len(psidp)
-
-    # Initialize the state vector to 0
-    s = np.zeros([4, 1])  # first state estimate
-
-    # define measurement vector
-    z = np.zeros([3, 1])
-
-    # Define the identity matrix
-    identity_i = np.eye(4)
-    p = identity_i * 4.
-
-    phidp = np.zeros([nrg_new])
-    kdp = np.zeros([nrg_new])
-    kdp_error = np.zeros([nrg_new])
+    psidp = psidp_in
+    # Get indices of finite data
+    real_data_ind = np.where(np.isfinite(psidp.ravel()))[0]
+    offset = real_data_ind[0]
+    mpsidp = psidp.ravel()[real_data_ind[-1]]
 
-    # Loop on all the gates and apply the filter
-    for ii in range(0, nrg_new - 1):
-        z[0] = psidp[ii]
-        z[1] = psidp[ii + 1]
+    psidp = psidp[offset:real_data_ind[-1] + 1]
 
-        s_pred = np.dot(f, s)  # state prediciton
+    nrg = len(psidp)
 
-        p_pred = np.dot(f, np.dot(p, f_transposed)) + \
-            pcov_scale  # error prediction
+    '''
+    Prepare a longer array with some extra gates on each side
+    '''
+    # add  values at the beginning and at the end of the profile
+    psidp_long = np.zeros([nrg + PADDING * 2, ]) * np.nan
 
-        if (s_pred[0] > kdp_th):
-            h_plus[2, 0] = b2
-            z[2] = c2
-        else:
-            h_plus[2, 0] = b1
-            z[2] = c1
+    nn = nrg + PADDING * 2
 
-        # as far as i see aludc is symmetrical, so i do not transpose it
-        aludc = (np.dot(h_plus, (np.dot(p_pred, h_plus.T))) + rcov)
+    noise = 2 * np.random.randn(PADDING)
+    psidp_long[0:PADDING] = noise + psidp[0]
+    psidp_long[nrg + PADDING: nrg + 2 * PADDING] = mpsidp + noise
+    psidp_long[PADDING:nrg + PADDING] = psidp
 
-        # below we get the transposed of B_mat directly
-        b_mat = np.dot(h_plus, p_pred)
+    psidp = psidp_long
 
-        # Cholesky decomposition
-        cho = linalg.cho_factor(aludc)
-        k = linalg.cho_solve(
-            cho,
-            b_mat,
-            check_finite=False,
-            overwrite_b=True).T
+    # Get information of valid and non valid points in psidp the new psidp
+    nonan = np.where(np.isfinite(psidp))[0]
+    nan = np.where(np.isnan(psidp))[0]
 
-        # Update state and error
-        s = np.dot(k, (np.dot(-h_plus, s_pred) + z)) + s_pred
-        p = np.dot((identity_i - np.dot(k, h_plus)), p_pred)
+    ranged = np.arange(0, nn)
 
-        # Fill the output
-        kdp[ii] = s[0]
-        kdp_error[ii] = p[0, 0]
-        phidp[ii] = s[2]
+    # interpolate
+    if len(nan):
+        interp = interpolate.interp1d(ranged[nonan], psidp[nonan], kind='zero')
+        psidp[nan] = interp(ranged[nan])
 
-    # Shift
-    dummy = np.copy(kdp)
-    kdp[np.arange(SHIFT) + len(kdp) - SHIFT] = 0
-    kdp[np.arange(len(kdp) - SHIFT)
-        ] = dummy[np.arange(len(kdp) - SHIFT) + SHIFT]
+    # add noise
+    if len(nan):
+        psidp[nan] = psidp[nan] + 2 * np.random.randn(len(nan))
 
-    return kdp, phidp, kdp_error
+    return psidp, nrg, offset, mpsidp
 
 
 def _kdp_kalman_profile(psidp_in, dr, band='X', rcov=0, pcov=0):
@@ -464,18 +461,46 @@ def _kdp_kalman_profile(psidp_in, dr, band='X', rcov=0, pcov=0):
     Kalman Filter Ensembles, IEEE T. Geosci. Remote Sens., 52,
     5137-5149, doi:10.1109/TGRS.2013.2287017, 2014.
 
+    """
+    return _kdp_kalman_profiles(
+        [_kdp_kalman_prepare(psidp_in)], dr, band, rcov, pcov)[0]
+
+
+def _kdp_kalman_profiles(profiles, dr, band='X', rcov=0, pcov=0):
+    """
+    Estimates Kdp with the Kalman filter method by Schneebeli and al. (2014)
+    for a batch of psidp profiles.
+
+    The forward and backward Kalman filter ensembles of all the profiles are
+    advanced simultaneously.
+
+    Parameters
+    ----------
+    profiles : list
+        Psidp profiles prepared by :py:func:`_kdp_kalman_prepare`.
+    dr : float
+        Range resolution in meters.
+    band : char, optional
+       Radar frequency band string. Accepted "X", "C", "S" (capital
+       or not). The band is used to compute intercepts -c and slope b of the
+       delta = b*Kdp+c relation
+    rcov : 3x3 float array, optional
+        Measurement error covariance matrix
+    pcov  : 4x4 float array, optional
+        Scaled state transition error covariance matrix
+
+    Returns
+    -------
+    list_est : list
+        Retrieved specific differential phase, its estimated standard
+        deviation and the retrieved differential phase for each profile.
+
     """
 
     dr = dr / 1000.  # Convert rad. res. to km
 
     # NOTE! Parameters are not checked to save as much time as possible
 
-    # Replace missing values with nans
-    psidp_in = np.ma.filled(psidp_in, np.nan)
-    # Check if psidp has at least one finite value
-    if not np.isfinite(psidp_in).any():
-        return psidp_in, psidp_in, psidp_in  # Return the NaNs...
-
     # Set default of the error covariance matrices
     if not isinstance(pcov, np.ndarray):
         pcov = np.array([[(0.11 + 1.56 * dr)**2,
@@ -524,14 +549,6 @@ def _kdp_kalman_profile(psidp_in, dr, band='X', rcov=0, pcov=0):
         b2 = 0.019
         kdp_th = 1.1
 
-    # Parameters for the final selection from the KF ensemble members
-    fac1 = 1.2
-    fac2 = 3.
-
-    th1_comp = -0.15
-    th2_comp = 0.15
-    th1_final = -0.25
-
     # Kalman matrices
     # State matrix
     f = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1],
@@ -543,105 +560,106 @@ def _kdp_kalman_profile(psidp_in, dr, band='X', rcov=0, pcov=0):
     h_plus = np.array(
         [[-2 * dr, 1, 0, 1], [2 * dr, 1, 1, 0], [0, -1, 0, 0]], dtype=float)
 
-    # Define the input
-    psidp = psidp_in
-    # Get indices of finite data
-    real_data_ind = np.where(np.isfinite(psidp.ravel()))[0]
-    offset = real_data_ind[0]
-
-    if len(real_data_ind):
-        mpsidp = psidp.ravel()[real_data_ind[-1]]
-    else:
-        mpsidp = np.nan
-
-    psidp = psidp[offset:real_data_ind[-1] + 1]
-
-    nrg = len(psidp)
-
-    # Define the output
-    kdp_filter_out = np.zeros([nrg, ])
-
-    kdp_mat = np.zeros([nrg, 2 * len(SCALERS)])
-    kdp_sim = np.zeros([nrg, len(SCALERS)])
-    phidp_filter_out = np.zeros([nrg])
+    list_est = [None] * len(profiles)
+    valid = [i for i, profile in enumerate(profiles)
+             if isinstance(profile, tuple)]
+    for i, profile in enumerate(profiles):
+        if i not in valid:
+            # psidp without finite values, return the NaNs...
+            list_est[i] = (profile, profile, profile)
+    if not valid:
+        return list_est
 
     '''
-    Prepare a longer array with some extra gates on each side
+    Generate the ensemble of Kalman filters estimates in backward and
+    Forward directions for all profiles, the first filter of each direction
+    uses the smallest scaler
     '''
-    # add  values at the beginning and at the end of the profile
-    psidp_long = np.zeros([nrg + PADDING * 2, ]) * np.nan
-
-    nn = nrg + PADDING * 2
-
-    noise = 2 * np.random.randn(PADDING)
-    psidp_long[0:PADDING] = noise + psidp[0]
-    psidp_long[nrg + PADDING: nrg + 2 * PADDING] = mpsidp + noise
-    psidp_long[PADDING:nrg + PADDING] = psidp
-
-    psidp = psidp_long
-
-    # Get information of valid and non valid points in psidp the new psidp
-    nonan = np.where(np.isfinite(psidp))[0]
-    nan = np.where(np.isnan(psidp))[0]
-
-    ranged = np.arange(0, nn)
-
-    psidp_interp = psidp
+    scalers = np.array([10 ** (-2.)] + SCALERS)
+    nscalers = len(scalers)
+    nn = np.array([len(profiles[i][0]) for i in valid])
+    psidp_filt = np.zeros([len(valid), 2, nscalers, nn.max()])
+    for j, i in enumerate(valid):
+        psidp, nrg, offset, mpsidp = profiles[i]
+        # forward
+        psidp_filt[j, 0, :, :nn[j]] = psidp
+        # invert Psidp (backward estimation)
+        psidp_filt[j, 1, :, :nn[j]] = mpsidp - psidp[::-1]
+    nrg_filt = np.repeat(nn, 2 * nscalers)
+    pcov_filt = np.tile(
+        pcov * scalers[:, np.newaxis, np.newaxis], (2 * len(valid), 1, 1))
+    kdp_filt = _kdp_estimation_fixed(
+        psidp_filt.reshape(-1, nn.max()), nrg_filt, rcov, pcov_filt, f,
+        f_transposed, h_plus, c1, c2, b1, b2, kdp_th)
+    kdp_filt = kdp_filt.reshape(psidp_filt.shape)
+
+    for j, i in enumerate(valid):
+        psidp, nrg, offset, mpsidp = profiles[i]
+        n = nn[j]
+
+        # Shift the forward estimates
+        kdp_f = np.zeros([nscalers, n])
+        kdp_f[:, :n - SHIFT] = kdp_filt[j, 0, :, SHIFT:n]
+
+        # Shift and reverse the backward estimates
+        kdp_b = np.array(kdp_filt[j, 1, :, :n])
+        kdp_b[:, :n - 1 - SHIFT] = kdp_filt[j, 1, :, SHIFT:n - 1]
+        kdp_b[:, n - SHIFT:] = 0
+        kdp_b = kdp_b[:, ::-1]
+
+        kdp_mat = np.zeros([nrg, 2 * len(SCALERS)])
+        kdp_mat[:, 0::2] = kdp_f[1:, PADDING:nrg + PADDING].T
+        kdp_mat[:, 1::2] = kdp_b[1:, PADDING:nrg + PADDING].T
+        kdp002f = kdp_f[0, PADDING:nrg + PADDING]
+        kdp002 = kdp_b[0, PADDING:nrg + PADDING]
+
+        list_est[i] = _kdp_kalman_compile(
+            kdp_mat, kdp002, kdp002f, psidp, nrg, offset, dr)
+    return list_est
+
+
+def _kdp_kalman_compile(kdp_mat, kdp002, kdp002f, psidp, nrg, offset, dr):
+    """
+    Compile the final Kdp estimate of a profile from the ensemble of Kalman
+    filter estimates.
 
-    # interpolate
-    if len(nan):
-        interp = interpolate.interp1d(ranged[nonan], psidp[nonan], kind='zero')
-        psidp_interp[nan] = interp(ranged[nan])
-    else:
-        psidp_interp = psidp
+    Parameters
+    ----------
+    kdp_mat : ndarray
+        Forward and backward Kdp estimates of the ensemble members,
+        interleaved along the second axis.
+    kdp002, kdp002f : ndarray
+        Backward and forward Kdp estimates with the smallest scaler.
+    psidp : ndarray
+        Psidp profile with padding.
+    nrg : int
+        Number of gates in the profile without padding.
+    offset : int
+        Offset of the first finite gate in the original profile.
+    dr : float
+        Range resolution in kilometers.
 
-    # add noise
-    if len(nan):
-        psidp_interp[nan] = psidp_interp[nan] + 2 * np.random.randn(len(nan))
+    Returns
+    -------
+    kdp_filter_out : ndarray
+        Retrieved specific differential phase data
+    kdp_std : ndarray
+        Estimated specific differential phase standard dev. data
+    phidp_filter_out : ndarray
+        Retrieved differential phase data
 
-    # Define the final input and output
-    psidp = psidp_interp
+    """
+    # Parameters for the final selection from the KF ensemble members
+    fac1 = 1.2
+    fac2 = 3.
 
-    '''
-    Smallest scaler
-    '''
-    scaler = 10 ** (-2.)
-
-    # Backward
-    kdp_dummy_b2, _ = _kdp_estimation_backward_fixed(psidp, rcov,
-                                                     pcov * scaler, f,
-                                                     f_transposed, h_plus,
-                                                     c1, c2, b1, b2,
-                                                     kdp_th, mpsidp)
-    kdp002 = kdp_dummy_b2[PADDING:nrg + PADDING]
-
-    # Forward
-    kdp_dummy_b2, _, _ = _kdp_estimation_forward_fixed(psidp, rcov,
-                                                       pcov * scaler, f,
-                                                       f_transposed, h_plus,
-                                                       c1, c2, b1, b2, kdp_th)
-    kdp002f = kdp_dummy_b2[PADDING:nrg + PADDING]
+    th1_comp = -0.15
+    th2_comp = 0.15
+    th1_final = -0.25
 
-    '''
-    Generate the ensemble of Kalman filters estimates in backward and
-    Forward directions
-    '''
-    for i, sc in enumerate(SCALERS):  # Loop on scalers
-        # Forward
-        kdp_dummy_f2, _, _ = _kdp_estimation_forward_fixed(psidp,
-                                                           rcov, pcov * sc,
-                                                           f, f_transposed,
-                                                           h_plus, c1, c2,
-                                                           b1, b2, kdp_th)
-        kdp_mat[:, 2 * i] = kdp_dummy_f2[PADDING:nrg + PADDING]
-
-        # Backward
-        kdp_dummy_b2, _ = _kdp_estimation_backward_fixed(psidp, rcov,
-                                                         pcov * sc, f,
-                                                         f_transposed, h_plus,
-                                                         c1, c2, b1, b2,
-                                                         kdp_th, mpsidp)
-        kdp_mat[:, 2 * i + 1] = kdp_dummy_b2[PADDING:nrg + PADDING]
+    # Define the output
+    kdp_filter_out = np.zeros([nrg, ])
+    kdp_sim = np.zeros([nrg, len(SCALERS)])
 
     '''
     Compile the final estimate
@@ -697,19 +715,21 @@ def _kdp_kalman_profile(psidp_in, dr, band='X', rcov=0, pcov=0):
     # Lower bounds
     lower_bound = np.round(kdp_mean_sim * fac1) - np.round(kdp_std_sim * fac2)
     lower_bound = np.maximum(lower_bound, 0)
-    lower_bound = np.minimum(lower_bound, len(SCALERS) - 1)
+    lower_bound = np.minimum(lower_bound, len(SCALERS) - 1).astype(int)
 
     # Upper bounds
     upper_bound = np.round(kdp_mean_sim * fac1) + np.round(kdp_std_sim * fac2)
     upper_bound = np.maximum(upper_bound, 0)
-    upper_bound = np.minimum(upper_bound, len(SCALERS) - 1)
+    upper_bound = np.minimum(upper_bound, len(SCALERS) - 1).astype(int)
 
-    # Final selection of the ensemble members
-    for uu in range(0, nrg - 1):
-        selection_vector = np.arange(
-            upper_bound[uu] - lower_bound[uu] + 1) + lower_bound[uu]
-        selection_vector = selection_vector.astype(int)
-        kdp_filter_out[uu] = np.mean(kdp_sim[uu, selection_vector])
+    # Final selection of the ensemble members, the gates sharing the same
+    # bounds are averaged together
+    bounds = lower_bound[:nrg - 1] * len(SCALERS) + upper_bound[:nrg - 1]
+    for bound in np.unique(bounds):
+        gates = np.where(bounds == bound)[0]
+        lower, upper = divmod(bound, len(SCALERS))
+        kdp_filter_out[gates] = np.mean(
+            kdp_sim[gates, lower:upper + 1], axis=1)
 
     # Final filtering of excessively negative values:
     # TO DO: It would be better to get rid of this filtering
@@ -788,7 +808,8 @@ def kdp_vulpiani(radar, gatefilter=None, fill_value=None, psidp_field=None,
         The arguments for the prefilter_psidp method, if empty, the defaults
         arguments of this method will be used
     parallel : bool, optional
-        Flag to enable parallel computation (one core for every psidp profile)
+        Flag to enable parallel computation, blocks of psidp profiles are
+        processed in a pool of threads, one for every core.
 
     Returns
     -------
@@ -811,10 +832,6 @@ def kdp_vulpiani(radar, gatefilter=None, fill_value=None, psidp_field=None,
                       '.Using default value, windsize = 10')
         windsize = 10
 
-    if parallel:
-        import multiprocessing as mp
-        pool = mp.Pool(processes=mp.cpu_count(), maxtasksperchild=1)
-
     # parse fill value
     if fill_value is None:
         fill_value = get_fillvalue()
@@ -846,31 +863,32 @@ def kdp_vulpiani(radar, gatefilter=None, fill_value=None, psidp_field=None,
     if gatefilter is not None:
         psidp_o = np.ma.masked_where(gatefilter.gate_excluded, psidp_o)
 
-    func = partial(_kdp_vulpiani_profile, dr=dr, windsize=windsize,
+    func = partial(_kdp_vulpiani_profiles, dr=dr, windsize=windsize,
                    band=band, n_iter=n_iter, interp=interp)
 
-    all_psidp_prof = list(psidp_o)
-
     if parallel:
-        list_est = pool.map(func, all_psidp_prof)
+        # the NumPy operations release the GIL, blocks of rays are processed
+        # in threads
+        import multiprocessing as mp
+        from multiprocessing.pool import ThreadPool
+        nthreads = min(mp.cpu_count(), len(psidp_o))
+        blocks = np.array_split(np.arange(len(psidp_o)), max(nthreads, 1))
+        pool = ThreadPool(nthreads)
+        try:
+            list_est = pool.map(
+                func, [psidp_o[block] for block in blocks if len(block)])
+        finally:
+            pool.terminate()
+        kdp = np.ma.concatenate([l[0] for l in list_est])
+        phidp_rec = np.ma.concatenate([l[1] for l in list_est])
     else:
-        list_est = map(func, all_psidp_prof)
-
-    kdp = np.ma.zeros(psidp_o.shape)
-    kdp[:] = np.ma.masked
+        kdp, phidp_rec = func(psidp_o)
     kdp.set_fill_value(fill_value)
-
-    phidp_rec = np.ma.zeros(psidp_o.shape)
-    phidp_rec[:] = np.ma.masked
     phidp_rec.set_fill_value(fill_value)
 
-    for i, l in enumerate(list_est):
-        kdp[i, 0:len(l[0])] = l[0]
-        phidp_rec[i, 0:len(l[1])] = l[1]
-
     # Mask the estimated Kdp and reconstructed Phidp with the mask of original
     # psidp
-    if isinstance(psidp_o, np.ma.masked_array):
+    if isinstance(psidp_o, np.ma.masked_array) and not interp:
         masked = psidp_o.mask
         kdp = np.ma.array(kdp, mask=masked, fill_value=fill_value)
         phidp_rec = np.ma.array(phidp_rec, mask=masked, fill_value=fill_value)
@@ -885,9 +903,6 @@ def kdp_vulpiani(radar, gatefilter=None, fill_value=None, psidp_field=None,
     phidpr_dict['data'] = phidp_rec
     # phidpr_dict['valid_min'] = 0.0
 
-    if parallel:
-        pool.close()
-
     return kdp_dict, phidpr_dict
 
 
@@ -925,15 +940,53 @@ def _kdp_vulpiani_profile(psidp_in, dr, windsize=10,
 
     """
 
+    kdp_calc, phidp_rec = _kdp_vulpiani_profiles(
+        psidp_in[np.newaxis], dr, windsize=windsize, band=band,
+        n_iter=n_iter, interp=interp)
+    return kdp_calc[0], phidp_rec[0]
+
+
+def _kdp_vulpiani_profiles(psidp_in, dr, windsize=10,
+                           band='X', n_iter=10, interp=False):
+    """
+    Estimates Kdp with the Vulpiani method for a 2D array of psidp
+    measurements, the range derivatives and iterations are computed for all
+    the profiles at once.
+
+    Parameters
+    ----------
+    psidp_in : 2D array
+        Total differential phase measurements, the first dimension being the
+        rays and the second the range gates.
+    dr : float
+        Range resolution in meters.
+    windsize : int, optional
+        Size in # of gates of the range derivative window.
+    band : char, optional
+        Radar frequency band string. Accepted "X", "C", "S" (capital
+        or not). It is used to set default boundaries for expected
+        values of Kdp
+    n_iter : int, optional
+        Number of iterations of the method. Default is 10.
+    interp : bool, optional
+        If set all the nans are interpolated.The advantage is that less data
+        are lost (the iterations in fact are "eating the edges") but some
+        non-linear errors may be introduced
+
+    Returns
+    -------
+    kdp_calc : 2D array
+        Retrieved specific differential phase
+    phidp_rec,: 2D array
+        Retrieved differential phase
+
+    """
+
     mask = np.ma.getmaskarray(psidp_in)
     l = windsize
     l2 = int(l/2)
     drm = dr/1000.
 
-    if mask.all() is True:
-        # Check if all elements are masked
-        return psidp_in, psidp_in, psidp_in  # Return the NaNs...
-
     # Thresholds in kdp calculation
     if band == 'X':
         th1 = -2.
@@ -948,37 +1001,34 @@ def _kdp_vulpiani_profile(psidp_in, dr, windsize=10,
         th2 = 14.
         std_th = 5.
     else:
-        print('Unexpected value set for the band keyword ')
-        print(band)
-        return None
+        raise ValueError('Unexpected value set for the band keyword: ' +
+                         str(band))
 
-    psidp = psidp_in
-    nn = len(psidp_in)
+    psidp = np.ma.filled(psidp_in, np.nan)
+    nn = psidp.shape[1]
 
-    # Get information of valid and non valid points in psidp the new psidp
-    valid = np.logical_not(mask)
     if interp:
+        # interpolate the masked gates with the previous valid value, gates
+        # before the first or after the last valid value are set to nan
         ranged = np.arange(0, nn)
-        psidp_interp = psidp
-        # interpolate
-        if np.ma.is_masked(psidp):
-            interp = interpolate.interp1d(ranged[valid], psidp[valid],
-                                          kind='zero', bounds_error=False,
-                                          fill_value=np.nan)
-            psidp_interp[mask] = interp(ranged[mask])
-
-        psidp = psidp_interp
+        valid = np.logical_not(mask)
+        previous = np.maximum.accumulate(np.where(valid, ranged, -1), axis=1)
+        last = nn - 1 - np.argmax(valid[:, ::-1], axis=1)
+        fill = mask & (previous >= 0) & (ranged <= last[:, np.newaxis])
+        rays = np.nonzero(fill)[0]
+        psidp[fill] = psidp[rays, previous[fill]]
+        # the interpolated gates are not censored
+        mask = np.zeros_like(mask)
 
-    psidp = np.ma.filled(psidp, np.nan)
-    kdp_calc = np.zeros([nn])
+    kdp_calc = np.zeros(psidp.shape)
 
     # first guess
     # In the core of the profile
-    kdp_calc[l2:nn-l2] = (psidp[l:nn]-psidp[0:nn-l])/(2.*l*drm)
+    kdp_calc[:, l2:nn-l2] = (psidp[:, l:nn]-psidp[:, 0:nn-l])/(2.*l*drm)
 
     # set ray extremes to 0
-    kdp_calc[0:l2] = 0.
-    kdp_calc[nn-l2:] = 0.
+    kdp_calc[:, 0:l2] = 0.
+    kdp_calc[:, nn-l2:] = 0.
 
     # apply thresholds
     kdp_calc[kdp_calc <= th1] = 0.
@@ -988,23 +1038,23 @@ def _kdp_vulpiani_profile(psidp_in, dr, windsize=10,
     kdp_calc[np.isnan(kdp_calc)] = 0.
 
     # Remove bins with texture higher than treshold
-    tex = np.ma.zeros(kdp_calc.shape)
+    tex = np.zeros(kdp_calc.shape)
     # compute the local standard deviation
     # (make sure that it is and odd window)
-    tex_aux = np.ma.std(rolling_window(kdp_calc, l2*2+1), -1)
-    tex[l2:-l2] = tex_aux
+    tex[:, l2:-l2] = np.std(rolling_window(kdp_calc, l2*2+1), -1)
     kdp_calc[tex > std_th] = 0.
 
     # Loop over iterations
     for i in range(0, n_iter):
-        phidp_rec = np.ma.cumsum(kdp_calc)*2.*drm
+        phidp_rec = np.cumsum(kdp_calc, axis=1)*2.*drm
 
         # In the core of the profile
-        kdp_calc[l2:nn-l2] = (phidp_rec[l:nn]-phidp_rec[0:nn-l])/(2.*l*drm)
+        kdp_calc[:, l2:nn-l2] = (
+            phidp_rec[:, l:nn]-phidp_rec[:, 0:nn-l])/(2.*l*drm)
 
         # set ray extremes to 0
-        kdp_calc[0:l2] = 0.
-        kdp_calc[nn-l2:] = 0.
+        kdp_calc[:, 0:l2] = 0.
+        kdp_calc[:, nn-l2:] = 0.
 
         # apply thresholds
         kdp_calc[kdp_calc <= th1] = 0.
@@ -1014,7 +1064,7 @@ def _kdp_vulpiani_profile(psidp_in, dr, windsize=10,
     kdp_calc = np.ma.masked_where(mask, kdp_calc)
 
     # final reconstructed PhiDP from KDP
-    phidp_rec = np.ma.cumsum(kdp_calc)*2.*drm
+    phidp_rec = np.ma.cumsum(kdp_calc, axis=1)*2.*drm
 
     return kdp_calc, phidp_rec
 
@@ -1139,6 +1189,7 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
                 Clpf=1.0, length_scale=None, first_guess=0.01,
                 finite_order='low', fill_value=None, proc=1, psidp_field=None,
                 kdp_field=None, phidp_field=None, debug=False, verbose=False,
+                decompose=None, warm_start=False, rays_per_block=32,
                 **kwargs):
     """
     Compute the specific differential phase (KDP) from corrected (e.g.,
@@ -1203,8 +1254,8 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
     fill_value : float, optional
         Value indicating missing or bad data in differential phase field.
     proc : int, optional
-        The number of parallel threads (CPUs) to use. Currently no
-        multiprocessing capability exists.
+        The number of worker processes used to solve the sub-problems when
+        `decompose` is not None.
     psidp_field : str, optional
         Total differential phase field. If None, the default field name must be
         specified in the Py-ART configuration file.
@@ -1218,11 +1269,29 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
         True to print debugging information, False to suppress.
     verbose : bool, optional
         True to print relevant information, False to suppress.
+    decompose : None, 'ray' or 'sweep', optional
+        None minimizes a single cost functional for the entire volume. As
+        rays are only coupled through the low-pass filter term along range,
+        the problem can instead be decomposed into independent sub-problems
+        for each ray or each sweep which are solved in blocks by `proc`
+        worker processes. The number of iterations, the time spent and
+        whether the minimization converged are stored for each sub-problem
+        (or the single problem) in the 'iterations', 'minimization_time' and
+        'converged' keys of the returned KDP field dictionary, and are
+        printed when debug is True.
+    warm_start : bool, optional
+        True to use the solution of the previous ray in a block as the first
+        guess when `decompose` is 'ray', False to use `first_guess` for every
+        ray.
+    rays_per_block : int, optional
+        Maximum number of rays of a sweep solved sequentially in a block when
+        `decompose` is 'ray'. The results do not depend on `proc`.
 
     Returns
     -------
     kdp_dict : dict
-        Retrieved specific differential phase data and metadata.
+        Retrieved specific differential phase data and metadata, including
+        the minimization report of each sub-problem, see `decompose`.
     phidpf_dict, phidpr_dict : dict
         Retrieved forward and reverse direction propagation differential phase
         data and metadata.
@@ -1235,6 +1304,9 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
 
     """
 
+    if decompose not in [None, 'ray', 'sweep']:
+        raise ValueError('Unknown decompose value: {}'.format(decompose))
+
     # parse fill value
     if fill_value is None:
         fill_value = get_fillvalue()
@@ -1306,34 +1378,91 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
     if debug:
         optimize.show_options(solver='minimize', method=method)
 
-    # parse initial conditions (first guess)
-    x0 = np.zeros_like(psidp_o, subok=False).flatten()
-    x0.fill(first_guess)
+    if decompose is None:
+        # parse initial conditions (first guess)
+        x0 = np.zeros_like(psidp_o, subok=False).flatten()
+        x0.fill(first_guess)
 
-    if verbose:
-        print('Cost functional size: {}'.format(x0.size))
+        if verbose:
+            print('Cost functional size: {}'.format(x0.size))
 
-    # define arguments for cost functional and its Jacobian (gradient)
-    args = (psidp_o, [phi_near, phi_far],
-            dhv, dr, Cobs, Clpf,
-            finite_order, fill_value,
-            proc, debug, verbose)
+        # define arguments for cost functional and its Jacobian (gradient)
+        args = (psidp_o, [phi_near, phi_far],
+                dhv, dr, Cobs, Clpf,
+                finite_order, fill_value,
+                proc, debug, verbose)
 
-    if debug:
         start = time.time()
 
-    # minimize the cost functional
-    xopt = optimize.minimize(
-        _cost_maesaka, x0, args=args, method=method, jac=_jac_maesaka,
-        hess=None, hessp=None, bounds=None, constraints=None, callback=None,
-        options=options)
+        # minimize the cost functional
+        xopt = optimize.minimize(
+            _cost_maesaka, x0, args=args, method=method, jac=_jac_maesaka,
+            hess=None, hessp=None, bounds=None, constraints=None,
+            callback=None, options=options)
 
-    if debug:
-        elapsed = time.time() - start
-        print('Elapsed time for minimization: {:.0f} sec'.format(elapsed))
+        nit = np.array([xopt.nit], dtype=np.int32)
+        elapsed = np.array([time.time() - start])
+        converged = np.array([xopt.success], dtype=np.int8)
+
+        if debug:
+            print('Elapsed time for minimization: {:.0f} sec'.format(
+                  elapsed[0]))
 
-    # parse control variables from optimized result
-    k = xopt.x.reshape(psidp_o.shape)
+        # parse control variables from optimized result
+        k = xopt.x.reshape(psidp_o.shape)
+
+    else:
+        # divide the volume into blocks of rays, the rays of a block are
+        # solved sequentially and the blocks in parallel
+        blocks = []
+        for start, stop in zip(radar.sweep_start_ray_index['data'],
+                               radar.sweep_end_ray_index['data'] + 1):
+            if decompose == 'sweep':
+                blocks.append((start, stop))
+            else:
+                blocks.extend(
+                    (i, min(i + rays_per_block, stop))
+                    for i in range(start, stop, rays_per_block))
+
+        if debug:
+            start_time = time.time()
+
+        tasks = [(psidp_o[start:stop], phi_near[start:stop],
+                  phi_far[start:stop], dhv[start:stop], dr,
+                  Cobs[start:stop], Clpf, finite_order, fill_value, method,
+                  options, first_guess, decompose == 'ray' and warm_start,
+                  decompose == 'sweep', verbose)
+                 for start, stop in blocks]
+        if proc > 1:
+            import multiprocessing as mp
+            pool = mp.Pool(proc)
+            try:
+                results = pool.map(_minimize_maesaka_block, tasks)
+            finally:
+                pool.terminate()
+        else:
+            results = [_minimize_maesaka_block(task) for task in tasks]
+
+        k = np.concatenate([result[0] for result in results])
+        nit = np.concatenate([result[1] for result in results])
+        elapsed = np.concatenate([result[2] for result in results])
+        converged = np.concatenate([result[3] for result in results])
+
+        if debug:
+            if decompose == 'ray':
+                for ray in range(radar.nrays):
+                    print('Ray {}: {} iterations, {:.3f} sec{}'.format(
+                          ray, nit[ray], elapsed[ray],
+                          '' if converged[ray] else ', not converged'))
+            else:
+                for sweep in range(radar.nsweeps):
+                    print('Sweep {}: {} iterations, {:.3f} sec{}'.format(
+                          sweep, nit[sweep], elapsed[sweep],
+                          '' if converged[sweep] else ', not converged'))
+            print('Mean iterations per sub-problem: {:.1f}'.format(
+                  nit.mean()))
+            print('Elapsed time for minimization: {:.0f} sec'.format(
+                  time.time() - start_time))
 
     # compute specific differential phase from control variable k in deg/km
     kdp = k**2 / (2.0 * dr) * 1000.0
@@ -1348,6 +1477,9 @@ def kdp_maesaka(radar, gatefilter=None, method='cg', backscatter=None,
     kdp_dict['data'] = kdp
     kdp_dict['valid_min'] = 0.0
     kdp_dict['Clpf'] = Clpf
+    kdp_dict['iterations'] = nit
+    kdp_dict['minimization_time'] = elapsed
+    kdp_dict['converged'] = converged
 
     # compute forward and reverse direction propagation differential phase
     phidp_f, phidp_r = _forward_reverse_phidp(
@@ -1576,6 +1708,71 @@ def boundary_conditions_maesaka(
     return phi_near, phi_far, range_near, range_far, idx_near, idx_far
 
 
+def _minimize_maesaka_block(task):
+    """
+    Minimize the cost functional for a block of rays of the Maesaka et al.
+    (2012) method.
+
+    Parameters
+    ----------
+    task : tuple
+        Total differential phase measurements, near and far range gate
+        boundary conditions, backscatter differential phase, range
+        resolution, measurement constraint weights, low-pass filter
+        constraint weight, finite difference order, fill value, minimization
+        method, solver options, first guess, warm start flag, sweep flag and
+        verbose flag. When the sweep flag is True the rays of the block are
+        solved as a single problem, otherwise each ray is solved separately
+        and, with warm starts, from the solution of the previous ray.
+
+    Returns
+    -------
+    k : ndarray
+        Control variable k for the rays of the block.
+    nit : ndarray
+        Number of iterations of each problem.
+    elapsed : ndarray
+        Time spent in seconds on each problem.
+    converged : ndarray
+        1 for each problem where the minimization converged, 0 otherwise.
+
+    """
+    (psidp_o, phi_near, phi_far, dhv, dr, Cobs, Clpf, finite_order,
+     fill_value, method, options, first_guess, warm_start, sweep,
+     verbose) = task
+
+    if sweep:
+        problems = [slice(None)]
+    else:
+        problems = [slice(ray, ray + 1) for ray in range(len(psidp_o))]
+
+    k = np.empty_like(psidp_o, subok=False)
+    nit = np.zeros(len(problems), dtype=np.int32)
+    elapsed = np.zeros(len(problems))
+    converged = np.zeros(len(problems), dtype=np.int8)
+    x0 = None
+    for i, rays in enumerate(problems):
+        start = time.time()
+        if x0 is None or not warm_start:
+            x0 = np.zeros(psidp_o[rays].size)
+            x0.fill(first_guess)
+
+        args = (psidp_o[rays], [phi_near[rays], phi_far[rays]],
+                dhv[rays], dr, Cobs[rays], Clpf,
+                finite_order, fill_value,
+                1, False, verbose)
+        xopt = optimize.minimize(
+            _cost_maesaka, x0, args=args, method=method, jac=_jac_maesaka,
+            options=options)
+
+        k[rays] = xopt.x.reshape(psidp_o[rays].shape)
+        nit[i] = xopt.nit
+        elapsed[i] = time.time() - start
+        converged[i] = xopt.success
+        x0 = xopt.x
+    return k, nit, elapsed, converged
+
+
 def _cost_maesaka(x, psidp_o, bcs, dhv, dr, Cobs, Clpf, finite_order,
                   fill_value, proc, debug=False, verbose=False):
     """
@@ -1,6 +1,9 @@
 """ Unit tests for pyart.retrieve.kdp_proc module. """
 
 import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from numpy.testing import assert_raises
+from scipy import linalg
 
 from pyart.retrieve import kdp_proc
 from pyart.filters import GateFilter
@@ -32,6 +35,159 @@ def test_kdp_maesaka_all_excluded(first_guess=0.01, maxiter=100):
     return
 
 
+def test_kdp_maesaka_decompose(maxiter=100):
+    # a single ray problem is the same for all decompositions
+    radar = _make_linear_psidp_radar()
+    kdp_dict = kdp_proc.kdp_maesaka(
+        radar, maxiter=maxiter, check_outliers=False)[0]
+    for decompose in ['ray', 'sweep']:
+        kdp_dict_dec = kdp_proc.kdp_maesaka(
+            radar, maxiter=maxiter, check_outliers=False,
+            decompose=decompose)[0]
+        assert_array_equal(kdp_dict['data'], kdp_dict_dec['data'])
+
+
+def test_kdp_maesaka_decompose_parallel(slope=0.002, maxiter=100):
+    radar = sample_objects.make_empty_ppi_radar(101, 3, 2)
+    psidp = np.linspace(0.0, slope * 1000.0, radar.ngates)
+    radar.add_field(get_field_name('differential_phase'), {
+        'data': np.tile(psidp, (radar.nrays, 1)) + np.arange(6)[:, None]})
+
+    kdp_dict = kdp_proc.kdp_maesaka(
+        radar, maxiter=maxiter, check_outliers=False, decompose='ray',
+        warm_start=True, rays_per_block=2)[0]
+    kdp_dict_par = kdp_proc.kdp_maesaka(
+        radar, maxiter=maxiter, check_outliers=False, decompose='ray',
+        warm_start=True, rays_per_block=2, proc=2)[0]
+    assert_array_equal(kdp_dict['data'], kdp_dict_par['data'])
+    assert np.allclose(kdp_dict['data'], 1000.0 * slope / 2.0, atol=0.1)
+
+    assert_raises(ValueError, kdp_proc.kdp_maesaka, radar, decompose='gate')
+
+
+def test_kdp_maesaka_report(slope=0.002):
+    radar = sample_objects.make_empty_ppi_radar(101, 3, 2)
+    psidp = np.linspace(0.0, slope * 1000.0, radar.ngates)
+    radar.add_field(get_field_name('differential_phase'), {
+        'data': np.tile(psidp, (radar.nrays, 1))})
+
+    for decompose, nproblems in [(None, 1), ('sweep', 2), ('ray', 6)]:
+        for maxiter, converged in [(100, 1), (1, 0)]:
+            kdp_dict = kdp_proc.kdp_maesaka(
+                radar, maxiter=maxiter, check_outliers=False,
+                decompose=decompose)[0]
+            assert kdp_dict['iterations'].shape == (nproblems, )
+            assert kdp_dict['minimization_time'].shape == (nproblems, )
+            assert np.all(kdp_dict['iterations'] <= maxiter)
+            assert np.all(kdp_dict['minimization_time'] >= 0)
+            assert np.all(kdp_dict['converged'] == converged)
+
+
+def test_kdp_schneebeli_batches():
+    radar = _make_noisy_psidp_radar()
+    np.random.seed(0)
+    kdp_dict, kdp_std_dict, phidpr_dict = kdp_proc.kdp_schneebeli(
+        radar, parallel=False)
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(2)
+    np.random.seed(0)
+    results = kdp_proc.kdp_schneebeli(
+        radar, parallel=True, pool=pool, rays_per_batch=2)
+    pool.terminate()
+
+    for field, batched_field in zip(
+            [kdp_dict, kdp_std_dict, phidpr_dict], results):
+        assert np.array_equal(field['data'].mask, batched_field['data'].mask)
+        assert_array_equal(field['data'].filled(0),
+                           batched_field['data'].filled(0))
+
+
+def test_kdp_schneebeli_profiles():
+    radar = _make_noisy_psidp_radar()
+    np.random.seed(0)
+    kdp_dict, kdp_std_dict, phidpr_dict = kdp_proc.kdp_schneebeli(
+        radar, parallel=False)
+
+    # all excluded ray
+    assert np.all(kdp_dict['data'].mask[1])
+
+    np.random.seed(0)
+    psidp = radar.fields[get_field_name('differential_phase')]['data']
+    for i, profile in enumerate(psidp):
+        kdp, kdp_std, phidpr = kdp_proc._kdp_kalman_profile(
+            profile, 250., band='C')
+        nrg = len(kdp)
+        kdp = np.ma.masked_array(kdp, mask=profile.mask[:nrg])
+        assert_array_equal(kdp.filled(0), kdp_dict['data'][i, :nrg].filled(0))
+
+
+def test_kdp_vulpiani_linear_psidp(slope=0.002):
+    radar = _make_linear_psidp_radar(slope=slope)
+    kdp_dict, phidpr_dict = kdp_proc.kdp_vulpiani(
+        radar, windsize=4, n_iter=1)
+
+    # ray extremes are set to zero
+    assert np.allclose(kdp_dict['data'][0, 5:-5], 1000.0 * slope / 2.0)
+
+
+def test_kdp_vulpiani_profiles():
+    radar = _make_noisy_psidp_radar()
+    psidp = radar.fields[get_field_name('differential_phase')]['data']
+    kdp_dict, phidpr_dict = kdp_proc.kdp_vulpiani(radar, windsize=4)
+    kdp_dict_par, phidpr_dict_par = kdp_proc.kdp_vulpiani(
+        radar, windsize=4, parallel=True)
+    assert np.array_equal(kdp_dict['data'].mask, psidp.mask)
+    assert_array_equal(kdp_dict['data'], kdp_dict_par['data'])
+    assert_array_equal(phidpr_dict['data'], phidpr_dict_par['data'])
+
+    for i, profile in enumerate(psidp):
+        kdp, phidpr = kdp_proc._kdp_vulpiani_profile(
+            profile, 250., windsize=4, band='C')
+        assert_array_equal(kdp, kdp_dict['data'][i])
+        assert_array_equal(phidpr, phidpr_dict['data'][i])
+
+
+def test_kdp_vulpiani_interp():
+    radar = _make_noisy_psidp_radar()
+    psidp = radar.fields[get_field_name('differential_phase')]['data']
+    psidp_orig = psidp.copy()
+    kdp_dict, phidpr_dict = kdp_proc.kdp_vulpiani(
+        radar, windsize=4, interp=True)
+
+    # the radar field is not modified and the gaps are interpolated
+    assert np.array_equal(psidp.mask, psidp_orig.mask)
+    assert not np.ma.is_masked(kdp_dict['data'])
+    assert np.all(kdp_dict['data'][1] == 0)
+    assert np.all(np.isfinite(phidpr_dict['data']))
+
+
+def test_cho_solve_3x3():
+    a = np.random.randn(5, 3, 6)
+    a = np.matmul(a, a.transpose(0, 2, 1)) + np.eye(3)
+    b = np.random.randn(5, 3, 4)
+    x = kdp_proc._cho_solve_3x3(a, b)
+    for i in range(5):
+        assert_allclose(x[i], linalg.cho_solve(linalg.cho_factor(a[i]), b[i]))
+
+
+def _make_noisy_psidp_radar(nrays=5, ngates=101):
+    """
+    Create radar with noisy increasing differential phase profiles with
+    some excluded gates and a fully excluded ray.
+    """
+    radar = sample_objects.make_empty_ppi_radar(ngates, nrays, 1)
+    radar.range['data'] = np.arange(ngates) * 250.0
+    psidp = np.linspace(0.0, 50.0, ngates) + 2.0 * np.sin(np.arange(ngates))
+    psidp = np.ma.masked_array(np.tile(psidp, (nrays, 1)))
+    psidp[1] = np.ma.masked
+    psidp[2, :10] = np.ma.masked
+    psidp[3, 40:45] = np.ma.masked
+    psidp[4, 90:] = np.ma.masked
+    radar.add_field(get_field_name('differential_phase'), {'data': psidp})
+    return radar
+
+
 def _make_linear_psidp_radar(slope=0.002):
     """
     Create single-ray radar with linear differential phase profile with
@@ -17,9 +17,11 @@ Testing functions
     make_target_radar
     make_single_ray_radar
     make_velocity_aliased_radar
+    make_multi_sweep_velocity_aliased_radar
     make_empty_grid
     make_target_grid
     make_normal_storm
+    make_nexrad_archive_chunks
 
 Testing classes
 ===============
@@ -46,7 +48,9 @@ from .sample_objects import make_empty_grid
 from .sample_objects import make_target_grid, make_storm_grid
 from .sample_objects import make_empty_rhi_radar
 from .sample_objects import make_velocity_aliased_rhi_radar
+from .sample_objects import make_multi_sweep_velocity_aliased_radar
 from .tmpdirs import InTemporaryDirectory
 from .sample_objects import make_normal_storm
+from .sample_objects import make_nexrad_archive_chunks
 
 __all__ = [s for s in dir() if not s.startswith('_')]
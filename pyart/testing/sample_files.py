@@ -54,3 +54,4 @@ UF_FILE = os.path.join(DATA_PATH, 'example_uf_ppi.uf')
 INTERP_SOUNDE_FILE = os.path.join(DATA_PATH, 'example_interpolatedsonde.cdf')
 SONDE_FILE = os.path.join(DATA_PATH, 'example_arm_sonde.cdf')
 _EXAMPLE_RAYS_FILE = os.path.join(DATA_PATH, 'example_rays.npz')
+
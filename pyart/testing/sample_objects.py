@@ -10,19 +10,25 @@ Functions for creating sample Radar and Grid objects.
     make_empty_ppi_radar
     make_target_radar
     make_velocity_aliased_radar
+    make_multi_sweep_velocity_aliased_radar
     make_single_ray_radar
     make_empty_grid
     make_target_grid
     make_normal_storm
+    make_nexrad_archive_chunks
 
 """
 
+import bz2
+import struct
+
 import numpy as np
 
-from .sample_files import _EXAMPLE_RAYS_FILE
+from .sample_files import _EXAMPLE_RAYS_FILE, NEXRAD_ARCHIVE_MSG31_FILE
 from ..config import get_metadata
 from ..core.radar import Radar
 from ..core.grid import Grid
+from ..io.nexrad_level2 import _index_records
 
 
 def make_empty_ppi_radar(ngates, rays_per_sweep, nsweeps):
@@ -175,6 +181,29 @@ def make_velocity_aliased_radar(alias=True):
     return radar
 
 
+def make_multi_sweep_velocity_aliased_radar(nsweeps=3):
+    """
+    Return a PPI radar with nsweeps sweeps of velocity aliased data.
+
+    Each sweep is the velocity field of :py:func:`make_velocity_aliased_radar`
+    rotated by 40 rays from the previous sweep.  A block of gates in the
+    second sweep is masked.
+    """
+    single_sweep_radar = make_velocity_aliased_radar()
+    vel = single_sweep_radar.fields['velocity']['data']
+    nrays, ngates = vel.shape
+    radar = make_empty_ppi_radar(ngates, nrays, nsweeps)
+    radar.range['data'] = single_sweep_radar.range['data']
+    radar.instrument_parameters = single_sweep_radar.instrument_parameters
+    radar.instrument_parameters['nyquist_velocity']['data'] = np.tile(
+        radar.instrument_parameters['nyquist_velocity']['data'], nsweeps)
+    data = np.ma.concatenate([np.roll(vel, 40 * i, axis=0)
+                              for i in range(nsweeps)])
+    data[nrays + 5:nrays + 20, 10:30] = np.ma.masked
+    radar.add_field('velocity', {'data': data})
+    return radar
+
+
 def make_velocity_aliased_rhi_radar(alias=True):
     """
     Return a RHI radar with a target like reflectivity field.
@@ -364,3 +393,38 @@ def make_normal_storm(sigma, mu):
         'units': 'dBz'}
     test_grid.fields.update({'reflectivity': rdic})
     return test_grid
+
+
+def make_nexrad_archive_chunks(nradials, radials_per_chunk):
+    """
+    Return the start of the NEXRAD_ARCHIVE_MSG31_FILE file split into
+    real-time chunks.
+
+    Parameters
+    ----------
+    nradials : int
+        Number of radials to include in the chunks.
+    radials_per_chunk : int
+        Number of radials in each chunk, the first chunk also contains the
+        volume header and the metadata records.
+
+    Returns
+    -------
+    chunks : list of bytes
+        Chunks, each a bzip2 compressed block prefixed by its size.
+
+    """
+    with bz2.BZ2File(NEXRAD_ARCHIVE_MSG31_FILE, 'rb') as f:
+        volume_header = f.read(24)
+        buf = f.read()[12:]
+    positions, types, _ = _index_records(buf, 0)
+    positions = np.append(positions, len(buf))
+    radials = np.nonzero(types == 31)[0][:nradials + 1]
+    bounds = [0] + list(radials[::radials_per_chunk])
+    chunks = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        block = bz2.compress(
+            b'\x00' * 12 + buf[positions[start]:positions[end]])
+        chunks.append(struct.pack('>i', len(block)) + block)
+    chunks[0] = volume_header + chunks[0]
+    return chunks
@@ -38,6 +38,7 @@ class DisableModules(object):
 def test_debug_info_all_disabled():
     modules = ['numpy', 'scipy', 'matplotlib', 'netCDF4', 'cylp', 'glpk',
                'cvxopt', 'mpl_toolkits', 'platform']
+    saved_modules = dict(sys.modules)
     for module in modules:
         if module in sys.modules:
             del sys.modules[module]
@@ -50,5 +51,6 @@ def test_debug_info_all_disabled():
         buf = StringIO()
         pyart._debug_info(buf)
         assert len(buf.getvalue()) > 0
-    # remove the Mocked ImportErrors
+    # remove the Mocked ImportErrors and restore the removed modules
     sys.meta_path.remove(fail_loader)
+    sys.modules.update(saved_modules)
@@ -0,0 +1,91 @@
+""" Unit Tests for the lazy importing of Py-ART's subpackages. """
+
+import os
+import subprocess
+import sys
+
+from numpy.testing.decorators import skipif
+
+import pyart
+
+LAZY_IMPORTS = sys.version_info >= (3, 7)
+
+# modules which should only be imported when a subpackage which uses them
+# is accessed.
+HEAVY_MODULES = ['pyart.io', 'pyart.correct', 'pyart.graph.radardisplay',
+                 'matplotlib.pyplot', 'scipy', 'netCDF4']
+
+
+def _run_import(statement):
+    """
+    Run statement in a new interpreter, return the imported modules and the
+    printed output.
+    """
+    code = '\n'.join([
+        'import sys',
+        statement,
+        'print(" ".join(sys.modules))'])
+    env = dict(os.environ)
+    env['PYART_QUIET'] = '1'
+    output = subprocess.check_output(
+        [sys.executable, '-W', 'ignore', '-c', code], env=env)
+    lines = output.decode('utf-8').strip().split('\n')
+    return set(lines[-1].split()), lines[:-1]
+
+
+@skipif(not LAZY_IMPORTS)
+def test_import_does_not_import_subpackages():
+    # startup guard, a plain import should not load the heavy subpackages
+    # and dependencies which importing all of the subpackages does.
+    modules, _ = _run_import('import pyart')
+    import_all = '\n'.join([
+        'import pyart',
+        '[getattr(pyart, p) for p in %r]' % (pyart._SUBPACKAGES, ),
+        'pyart.graph.RadarDisplay'])
+    all_modules, _ = _run_import(import_all)
+    for module in HEAVY_MODULES:
+        assert module not in modules
+        assert module in all_modules
+
+
+@skipif(not LAZY_IMPORTS)
+def test_io_import_is_light():
+    modules, _ = _run_import('import pyart; pyart.io.read')
+    assert 'pyart.io' in modules
+    for module in ['pyart.graph.radardisplay', 'pyart.correct',
+                   'matplotlib.pyplot', 'scipy']:
+        assert module not in modules
+
+
+def test_import_registers_colormaps():
+    _, output = _run_import('\n'.join([
+        'import pyart',
+        'import matplotlib.cm',
+        'print(matplotlib.cm.get_cmap("pyart_NWSRef").name)',
+        'print(matplotlib.cm.get_cmap("pyart_HomeyerRainbow_r").name)']))
+    assert output == ['NWSRef', 'HomeyerRainbow_r']
+
+
+def test_subpackage_access():
+    assert pyart.io.read is not None
+    assert pyart.graph.RadarDisplay is not None
+    assert pyart.graph.gridmapdisplay is not None
+    from pyart import retrieve
+    assert retrieve is pyart.retrieve
+    for subpackage in pyart._SUBPACKAGES:
+        assert subpackage in dir(pyart)
+    for display in ['RadarDisplay', 'GridMapDisplay', 'RadarMapDisplay']:
+        assert display in dir(pyart.graph)
+        assert display in pyart.graph.__all__
+    try:
+        pyart.not_a_subpackage
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('AttributeError not raised')
+    try:
+        pyart.graph.NotADisplay
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('AttributeError not raised')
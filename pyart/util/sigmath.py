@@ -7,7 +7,6 @@ Put more stuff in here
 """
 
 from __future__ import print_function
-from scipy import signal
 import numpy as np
 
 
@@ -49,7 +48,9 @@ def angular_texture_2d(image, N, interval):
     x = np.cos(im)
     y = np.sin(im)
 
-    # Calculate convolution
+    # Calculate convolution, scipy is imported here to avoid importing it
+    # with pyart.util
+    from scipy import signal
     kernel = np.ones((N, N))
     xs = signal.convolve2d(x, kernel, mode="same", boundary="symm")
     ys = signal.convolve2d(y, kernel, mode="same", boundary="symm")
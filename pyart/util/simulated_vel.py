@@ -11,7 +11,6 @@ Function for creating simulated velocity fields.
 
 """
 
-from scipy.interpolate import interp1d
 import numpy as np
 
 from ..config import get_metadata, get_field_name
@@ -53,7 +52,9 @@ def simulated_vel_from_profile(
     elevations = np.deg2rad(radar.elevation['data']).reshape(-1, 1)
     gate_altitudes = radar.gate_altitude['data']
 
-    # prepare wind profile for interpolation
+    # prepare wind profile for interpolation, scipy is imported here to
+    # avoid importing it with pyart.util
+    from scipy.interpolate import interp1d
     height = profile.height
     winds = np.empty((2, len(height)), dtype=np.float64)
     winds[0] = profile.u_wind